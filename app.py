@@ -1,47 +1,9 @@
 import os
-import logging
-import pymysql
 from flask import Flask,render_template
 from extensions import db, login_manager
-from config import Config
-
-# Configure logging
-logging.basicConfig(level=logging.DEBUG)
-
-def create_mysql_database(app):
-    """Create the MySQL database if it doesn't exist - for local MySQL setup"""
-    try:
-        full_uri = app.config['SQLALCHEMY_DATABASE_URI']
-        if 'mysql+pymysql' in full_uri:
-            uri_parts = full_uri.split('/')
-            db_name = uri_parts[-1].split('?')[0]  # Extract database name
-
-            # Connect to MySQL server (without specifying a database)
-            logging.info(f"Attempting to create database '{db_name}' if it doesn't exist")
-
-            try:
-                connection = pymysql.connect(
-                    host=app.config.get('MYSQL_HOST', 'localhost'),
-                    user=app.config.get('MYSQL_USER', 'jawo'),
-                    password=app.config.get('MYSQL_PASSWORD', 'abc_123'),
-                    charset='utf8mb4',
-                    cursorclass=pymysql.cursors.DictCursor
-                )
-
-                with connection.cursor() as cursor:
-                    cursor.execute(f"CREATE DATABASE IF NOT EXISTS `{db_name}`")
-                connection.commit()
-                logging.info(f"Database '{db_name}' created or already exists")
-                return True
-            except Exception as e:
-                logging.error(f"Error creating database: {e}")
-                return False
-            finally:
-                if 'connection' in locals() and connection:
-                    connection.close()
-    except Exception as e:
-        logging.error(f"Error attempting to create database: {e}")
-        return False
+from config import get_config
+from utils import request_metrics, user_cache
+from utils.logs import configure_logging
 
 def register_blueprints(app):
     from routes.auth import auth_bp
@@ -50,6 +12,7 @@ def register_blueprints(app):
     from routes.data_analyst import data_analyst_bp
     from routes.cash_controller import cash_controller_bp
     from routes.common import common_bp
+    from routes.metrics import metrics_bp
 
     app.register_blueprint(auth_bp)
     app.register_blueprint(admin_bp, url_prefix='/admin')
@@ -57,73 +20,45 @@ def register_blueprints(app):
     app.register_blueprint(data_analyst_bp, url_prefix='/data-analyst')
     app.register_blueprint(cash_controller_bp, url_prefix='/cash-controller')
     app.register_blueprint(common_bp)
+    app.register_blueprint(metrics_bp)
 
-def setup_database(app):
-    """Initialize database and create tables if needed."""
-    if 'mysql+pymysql' in app.config.get('SQLALCHEMY_DATABASE_URI', ''):
-        create_mysql_database(app)
-
+def register_error_handlers(app):
     @app.errorhandler(500)
     def handle_db_error(e):
         return render_template('error.html', 
                                error="Database Error", 
                                message="There was a problem connecting to the database. Please check your database configuration."), 500
 
-    with app.app_context():
-        try:
-            import models
-            db.create_all()
-
-            from models import User
-            from werkzeug.security import generate_password_hash
-
-            admin = User.query.filter_by(username='admin').first()
-            if not admin:
-                admin = User(
-                    username='admin',
-                    password_hash=generate_password_hash('admin123'),
-                    role='admin',
-                    email='admin@example.com',
-                    telephone='123-456-7890',
-                    gender='other',
-                    active=True
-                )
-                db.session.add(admin)
-                db.session.commit()
-                logging.info("Admin user created")
-        except Exception as e:
-            logging.error(f"Database connection error: {str(e)}")
-            if 'Unknown database' in str(e):
-                logging.error("Database does not exist. Ensure MySQL is running and create the database manually.")
-            elif 'Access denied' in str(e):
-                logging.error("Check MySQL username and password.")
-            elif 'Can\'t connect' in str(e) or 'Connection refused' in str(e):
-                logging.error("Ensure MySQL server is running.")
-            logging.error(f"Error details: {str(e)}")
-
 def create_app():
     """Initialize Flask app."""
     app = Flask(__name__)
-    app.config.from_object(Config)
+    app.config.from_object(get_config())
+    configure_logging(app)
 
     db.init_app(app)
+    user_cache.init_app(app)
     login_manager.init_app(app)
     login_manager.login_view = 'auth.login'
     login_manager.login_message_category = 'info'
 
+    # Before the blueprints, so its hooks wrap theirs
+    request_metrics.init_app(app)
     register_blueprints(app)
+    register_error_handlers(app)
 
-    setup_database(app)
+    # Schema creation and admin seeding are CLI commands (flask db-init,
+    # flask seed-admin) so starting a worker never touches the database.
+    # The commands, and Flask-Migrate with Alembic behind them, are only
+    # loaded when running under the flask CLI.
+    if os.environ.get('FLASK_RUN_FROM_CLI') == 'true':
+        from commands import register_commands
+        register_commands(app)
 
     return app
 
 @login_manager.user_loader
 def load_user(user_id):
-    from models import User
-    return User.query.get(int(user_id))
-
-# Create and run the app
-app = create_app()
+    return user_cache.load_user(user_id)
 
 if __name__ == '__main__':
-    app.run(host='0.0.0.0', port=5000, debug=True)
\ No newline at end of file
+    create_app().run(host='0.0.0.0', port=5000, debug=True)
\ No newline at end of file
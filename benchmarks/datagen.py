@@ -0,0 +1,258 @@
+"""
+Synthetic data generator
+
+Fills a database with a deterministic dataset: users for every role,
+flights, supervisors, reports spread over past days with realistic
+verification ratios, and team lead activation history. The same --seed and
+sizes always produce the same rows, dated relative to today. Rows are inserted in bulk, then the
+daily summary is rebuilt from them. Prints what was created as JSON.
+
+Usage:
+    python -m benchmarks.datagen --reports 100000 [--seed 42] [--database-uri URI]
+        [--team-leads 40] [--flights 200] [--supervisors 60]
+
+Without --database-uri the app configuration is used (APP_CONFIG,
+SQLALCHEMY_DATABASE_URI, SQLITE_PATH). Missing tables are created; existing
+rows are left alone, so point it at an empty database.
+
+Every generated account uses the password in PASSWORD.
+"""
+import argparse
+import json
+import math
+import os
+import random
+import time
+from datetime import date, datetime, timedelta
+
+PASSWORD = 'bench-password'
+
+# Reports per day, in line with a busy airport shift pattern
+REPORTS_PER_DAY = 400
+
+# Share of reports verified by age in days; recent days are still being worked on
+VERIFIED_RATIOS = ((1, 0.15), (3, 0.6), (7, 0.9))
+VERIFIED_RATIO_OLDER = 0.98
+
+INSERT_BATCH_SIZE = 5000
+
+COUNT_FIELDS = ('paid', 'diplomats', 'infants', 'not_paid', 'paid_card_qr', 'deportees',
+                'transit', 'waivers', 'prepaid_bank', 'round_trip', 'late_payment')
+
+def username(role, number):
+    return f'bench-{role.lower()}-{number:04d}'
+
+def flight_name(number):
+    return f'BF{number:04d}'
+
+def supervisor_name(number):
+    return f'Bench Supervisor {number:03d}'
+
+def verified_ratio(age_days):
+    for max_age, ratio in VERIFIED_RATIOS:
+        if age_days < max_age:
+            return ratio
+    return VERIFIED_RATIO_OLDER
+
+def report_rows(rng, count, team_lead_ids, analyst_ids, flights, supervisors, today):
+    """
+    Yield report column dicts, newest day first
+
+    Args:
+        rng: random.Random driving every choice
+        count: Number of reports
+        team_lead_ids: Submitter ids
+        analyst_ids: Verifier ids
+        flights: List of (id, name)
+        supervisors: List of (id, name)
+        today: Date of the newest reports
+    """
+    days = max(1, math.ceil(count / REPORTS_PER_DAY))
+    for index in range(count):
+        age_days = index * days // count
+        report_date = today - timedelta(days=age_days)
+        flight_id, flight = rng.choice(flights)
+        supervisor_id, supervisor = rng.choice(supervisors)
+
+        counts = {field: 0 for field in COUNT_FIELDS}
+        counts['paid'] = rng.randint(40, 220)
+        counts['not_paid'] = rng.randint(0, 12)
+        counts['paid_card_qr'] = rng.randint(0, 40)
+        counts['infants'] = rng.randint(0, 8)
+        counts['transit'] = rng.randint(0, 20)
+        counts['diplomats'] = rng.choice((0, 0, 0, 1, 2))
+        counts['waivers'] = rng.choice((0, 0, 1))
+        refunds = rng.choice((0, 0, 0, 0, 1, 2))
+        total_attended = sum(counts.values()) - refunds
+
+        created_at = datetime.combine(report_date, datetime.min.time()) + timedelta(minutes=rng.randint(6 * 60, 23 * 60))
+        row = {
+            'date': report_date,
+            'ref_no': f'BR{index:08d}',
+            'supervisor': supervisor,
+            'supervisor_id': supervisor_id,
+            'flight_name': flight,
+            'flight_id': flight_id,
+            'zone': rng.choice(('arrival', 'departure')),
+            **counts,
+            'refunds': refunds,
+            'total_attended': total_attended,
+            'verified': False,
+            'remarks': None,
+            'submitted_by_id': rng.choice(team_lead_ids),
+            'verified_by_id': None,
+            # Executemany needs the same keys in every row
+            **dict.fromkeys(('iics_infant', 'iics_adult', 'iics_total', 'gia_infant', 'gia_adult', 'gia_total'), 0),
+            'created_at': created_at,
+            'updated_at': created_at,
+        }
+
+        if rng.random() < verified_ratio(age_days):
+            # Counts from the immigration (IICS) and airport (GIA) systems rarely match exactly
+            iics_infant = counts['infants']
+            gia_infant = counts['infants']
+            iics_adult = total_attended - iics_infant + rng.choice((0, 0, 0, -1, 1))
+            gia_adult = total_attended - gia_infant + rng.choice((0, 0, 0, 0, -2, 2))
+            row.update({
+                'verified': True,
+                'verified_by_id': rng.choice(analyst_ids),
+                'iics_infant': iics_infant,
+                'iics_adult': iics_adult,
+                'iics_total': iics_infant + iics_adult,
+                'gia_infant': gia_infant,
+                'gia_adult': gia_adult,
+                'gia_total': gia_infant + gia_adult,
+                'updated_at': created_at + timedelta(hours=rng.randint(1, 30)),
+            })
+        yield row
+
+def activation_rows(rng, team_lead_ids, analyst_ids, days, today):
+    """Roughly one activation per team lead per fortnight, oldest first; none still open"""
+    for team_lead_id in team_lead_ids:
+        day = today - timedelta(days=days)
+        while True:
+            day += timedelta(days=rng.randint(7, 21))
+            if day >= today:
+                break
+            valid_from = datetime.combine(day, datetime.min.time())
+            yield {
+                'team_lead_id': team_lead_id,
+                'date': day,
+                'valid_from': valid_from,
+                'valid_until': valid_from + timedelta(days=1),
+                'activated_by_id': rng.choice(analyst_ids),
+                'created_at': valid_from + timedelta(hours=rng.randint(6, 12)),
+            }
+
+def insert_batches(table, rows):
+    from extensions import db
+
+    inserted = 0
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) == INSERT_BATCH_SIZE:
+            db.session.execute(table.insert(), batch)
+            inserted += len(batch)
+            batch = []
+    if batch:
+        db.session.execute(table.insert(), batch)
+        inserted += len(batch)
+    db.session.commit()
+    return inserted
+
+def generate(reports, seed=42, team_leads=40, analysts=8, cash_controllers=4, flights=200,
+             supervisors=60, today=None):
+    """
+    Insert the dataset; call inside an app context
+
+    Returns:
+        Dict with the number of rows created per table
+    """
+    from flask import current_app
+    from werkzeug.security import generate_password_hash
+    from extensions import db
+    from models import Flight, FlightSupervisor, Report, TeamLeadActivation, User
+    from utils.summary import rebuild_summary
+
+    rng = random.Random(seed)
+    today = today or date.today()
+
+    # One hash for every account, with the configured method so logins do not rehash
+    password_hash = generate_password_hash(PASSWORD, method=current_app.config['PASSWORD_HASH_METHOD'])
+
+    users = []
+    for role, count in (('teamLead', team_leads), ('dataAnalyst', analysts), ('cashController', cash_controllers)):
+        for number in range(count):
+            name = username(role, number)
+            users.append(User(username=name, password_hash=password_hash, email=f'{name}@example.com',
+                              role=role, gender=rng.choice(('male', 'female')), telephone=f'0{number:09d}',
+                              active=True))
+    flight_rows = [Flight(name=flight_name(number)) for number in range(flights)]
+    supervisor_rows = [FlightSupervisor(name=supervisor_name(number)) for number in range(supervisors)]
+    db.session.add_all(users + flight_rows + supervisor_rows)
+    db.session.commit()
+
+    team_lead_ids = [user.id for user in users if user.role == 'teamLead']
+    analyst_ids = [user.id for user in users if user.role == 'dataAnalyst']
+
+    report_count = insert_batches(Report.__table__, report_rows(
+        rng, reports, team_lead_ids, analyst_ids,
+        [(flight.id, flight.name) for flight in flight_rows],
+        [(supervisor.id, supervisor.name) for supervisor in supervisor_rows],
+        today
+    ))
+    days = max(1, math.ceil(reports / REPORTS_PER_DAY))
+    activation_count = insert_batches(TeamLeadActivation.__table__,
+                                      activation_rows(rng, team_lead_ids, analyst_ids, days, today))
+
+    return {
+        'users': len(users),
+        'flights': flights,
+        'supervisors': supervisors,
+        'reports': report_count,
+        'verified_reports': Report.query.filter_by(verified=True).count(),
+        'activations': activation_count,
+        'summary_rows': rebuild_summary(),
+        'days': days,
+    }
+
+def configure_database(database_uri=None, sqlite_path=None):
+    """Point the app config at a database; must run before the app is imported"""
+    if database_uri:
+        os.environ['SQLALCHEMY_DATABASE_URI'] = database_uri
+        os.environ.pop('APP_CONFIG', None)
+    elif sqlite_path:
+        os.environ['APP_CONFIG'] = 'sqlite'
+        os.environ['SQLITE_PATH'] = sqlite_path
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--reports', type=int, required=True)
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--team-leads', type=int, default=40)
+    parser.add_argument('--analysts', type=int, default=8)
+    parser.add_argument('--cash-controllers', type=int, default=4)
+    parser.add_argument('--flights', type=int, default=200)
+    parser.add_argument('--supervisors', type=int, default=60)
+    parser.add_argument('--database-uri', help='Database to fill (default: the app configuration)')
+    args = parser.parse_args()
+
+    configure_database(args.database_uri)
+
+    from app import create_app
+    from extensions import db
+
+    app = create_app()
+    with app.app_context():
+        db.create_all()
+        start = time.perf_counter()
+        created = generate(args.reports, seed=args.seed, team_leads=args.team_leads, analysts=args.analysts,
+                           cash_controllers=args.cash_controllers, flights=args.flights,
+                           supervisors=args.supervisors)
+
+    created['elapsed_s'] = round(time.perf_counter() - start, 2)
+    print(json.dumps(created, indent=2))
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,274 @@
+"""
+Shift-end load benchmark
+
+For each data size, generates a fresh dataset with benchmarks.datagen and
+replays a shift-end burst against the app from --concurrency threads:
+
+- team leads submitting reports
+- team leads and data analysts loading their dashboards
+- cash controllers polling /cash-controller/api/reports
+- cash controllers downloading the CSV export
+
+Each request's latency is recorded, along with the SQL statements it ran,
+read from the Server-Timing header. The output is JSON with p50/p95/p99
+latency and queries per request, per operation and data size. Save it with
+--output and compare the files across versions.
+
+Usage:
+    python -m benchmarks.load [--sizes 10000,100000] [--requests 2000]
+        [--concurrency 16] [--seed 42] [--output results.json]
+
+Uses throwaway SQLite databases. With --database-uri, the benchmark runs
+once against that database instead, which must already hold a dataset from
+benchmarks.datagen.
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import re
+import subprocess
+import sys
+import tempfile
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date
+
+from benchmarks import datagen
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Operation -> share of the burst
+MIX = {
+    'submit_report': 0.30,
+    'team_lead_dashboard': 0.15,
+    'data_analyst_dashboard': 0.15,
+    'cash_controller_reports': 0.30,
+    'download_csv': 0.10,
+}
+
+# Operation -> role of the client that runs it
+ROLES = {
+    'submit_report': 'teamLead',
+    'team_lead_dashboard': 'teamLead',
+    'data_analyst_dashboard': 'dataAnalyst',
+    'cash_controller_reports': 'cashController',
+    'download_csv': 'cashController',
+}
+
+QUERIES = re.compile(r'db;[^,]*desc="(\d+) queries"')
+
+# Runs one data size in a fresh interpreter: config is read at import time
+RUN_SIZE = """
+import argparse, json, sys
+from benchmarks.load import benchmark
+from app import create_app
+size, requests, concurrency, seed = map(int, sys.argv[1:])
+args = argparse.Namespace(requests=requests, concurrency=concurrency, seed=seed)
+print(json.dumps(benchmark(create_app(), args, size)))
+"""
+
+def percentile(values, fraction):
+    if not values:
+        return None
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(fraction * (len(ordered) - 1))))]
+
+def summarize(samples):
+    latencies = [sample['seconds'] for sample in samples]
+    queries = [sample['queries'] for sample in samples if sample['queries'] is not None]
+    return {
+        'requests': len(samples),
+        'errors': sum(1 for sample in samples if sample['status'] >= 400),
+        'p50_ms': round(percentile(latencies, 0.50) * 1000, 2),
+        'p95_ms': round(percentile(latencies, 0.95) * 1000, 2),
+        'p99_ms': round(percentile(latencies, 0.99) * 1000, 2),
+        'max_ms': round(max(latencies) * 1000, 2),
+        'queries_p50': percentile(queries, 0.50),
+        'queries_max': max(queries) if queries else None,
+    }
+
+def git_revision():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=ROOT, check=True,
+                              capture_output=True, text=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+class Worker:
+    """One logged-in test client per role, reused across the worker's requests"""
+
+    def __init__(self, app, number, seed, accounts):
+        self.app = app
+        self.number = number
+        self.rng = random.Random(seed * 1000 + number)
+        self.accounts = accounts
+        self.clients = {}
+        self.submitted = 0
+
+    def client(self, role):
+        client = self.clients.get(role)
+        if client is None:
+            client = self.app.test_client()
+            username = self.accounts[role][self.number % len(self.accounts[role])]
+            response = client.post('/login', data={'username': username, 'password': datagen.PASSWORD})
+            if response.status_code != 302 or '/login' in response.headers.get('Location', ''):
+                raise RuntimeError(f'Login failed for {username}')
+            self.clients[role] = client
+        return client
+
+    def request(self, operation):
+        client = self.client(ROLES[operation])
+        today = date.today()
+
+        if operation == 'submit_report':
+            self.submitted += 1
+            return client.post('/team-lead/reports/submit', data={
+                'date': today.isoformat(),
+                'ref_no': f'LOAD-{self.number}-{self.submitted}',
+                'supervisor': datagen.supervisor_name(self.rng.randrange(self.accounts['supervisors'])),
+                'flight': datagen.flight_name(self.rng.randrange(self.accounts['flights'])),
+                'zone': self.rng.choice(('arrival', 'departure')),
+                'paid': self.rng.randint(40, 220),
+                'not_paid': self.rng.randint(0, 12),
+                'infants': self.rng.randint(0, 8),
+            })
+        if operation == 'team_lead_dashboard':
+            return client.get('/team-lead/dashboard')
+        if operation == 'data_analyst_dashboard':
+            return client.get('/data-analyst/dashboard')
+        if operation == 'cash_controller_reports':
+            return client.get('/cash-controller/api/reports', query_string={
+                'start_date': today.replace(day=1).isoformat(),
+                'end_date': today.isoformat(),
+            })
+        # The month-to-date export, as downloaded at the end of every shift
+        return client.get('/cash-controller/download-csv', query_string={
+            'start_date': today.replace(day=1).isoformat(),
+            'end_date': today.isoformat(),
+        })
+
+    def run(self, operations):
+        samples = []
+        for operation in operations:
+            start = time.perf_counter()
+            response = self.request(operation)
+            # Read the whole body so streamed exports are timed to the last byte
+            response.get_data()
+            elapsed = time.perf_counter() - start
+            match = QUERIES.search(response.headers.get('Server-Timing', ''))
+            samples.append({
+                'operation': operation,
+                'seconds': elapsed,
+                'status': response.status_code,
+                'queries': int(match.group(1)) if match else None,
+            })
+        return samples
+
+def run_burst(app, requests, concurrency, seed, accounts):
+    """
+    Replay one burst
+
+    Returns:
+        Dict of operation -> summary, plus the overall throughput
+    """
+    rng = random.Random(seed)
+    operations = rng.choices(list(MIX), weights=list(MIX.values()), k=requests)
+    workers = [Worker(app, number, seed, accounts) for number in range(concurrency)]
+
+    # Log every client in before timing, so password hashing is not measured
+    for worker in workers:
+        for role in set(ROLES.values()):
+            worker.client(role)
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        results = pool.map(lambda worker: worker.run(operations[worker.number::concurrency]), workers)
+        samples = [sample for worker_samples in results for sample in worker_samples]
+    elapsed = time.perf_counter() - start
+
+    by_operation = defaultdict(list)
+    for sample in samples:
+        by_operation[sample['operation']].append(sample)
+
+    return {
+        'elapsed_s': round(elapsed, 3),
+        'requests_per_s': round(len(samples) / elapsed, 2),
+        'operations': {operation: summarize(by_operation[operation]) for operation in MIX if by_operation[operation]},
+    }
+
+def benchmark(app, args, size=None):
+    from extensions import db
+    from models import Report, User
+    from utils.reference_data import get_reference_data
+
+    app.config['WTF_CSRF_ENABLED'] = False
+    app.config['SERVER_TIMING'] = True
+
+    with app.app_context():
+        if size is not None:
+            db.create_all()
+            datagen.generate(size, seed=args.seed)
+        accounts = {
+            role: [user.username for user in User.query.filter(User.role == role, User.active == True,
+                                                               User.username.startswith('bench-'))]
+            for role in set(ROLES.values())
+        }
+        reference_data = get_reference_data()
+        accounts['flights'] = sum(1 for name in reference_data.flight_names if name.startswith('BF'))
+        accounts['supervisors'] = sum(1 for name in reference_data.supervisor_names if name.startswith('Bench '))
+        report_count = Report.query.count()
+
+    result = run_burst(app, args.requests, args.concurrency, args.seed, accounts)
+    return {'reports': report_count, **result}
+
+def run_size(size, args, tmp):
+    env = dict(os.environ, APP_CONFIG='sqlite', SQLITE_PATH=os.path.join(tmp, f'load-{size}.db'),
+               EXPORT_CACHE_DIR=os.path.join(tmp, f'export-cache-{size}'))
+    command = [sys.executable, '-c', RUN_SIZE, str(size), str(args.requests), str(args.concurrency), str(args.seed)]
+    output = subprocess.run(command, cwd=ROOT, env=env, check=True, capture_output=True, text=True).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sizes', default='10000,100000', help='Comma-separated report counts')
+    parser.add_argument('--requests', type=int, default=2000, help='Requests per burst')
+    parser.add_argument('--concurrency', type=int, default=16)
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--database-uri', help='Existing dataset to run against instead of generated ones')
+    parser.add_argument('--output', help='Also write the JSON report to this file')
+    args = parser.parse_args()
+
+    report = {
+        'revision': git_revision(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'requests': args.requests,
+        'concurrency': args.concurrency,
+        'seed': args.seed,
+        'mix': MIX,
+        'runs': [],
+    }
+
+    with tempfile.TemporaryDirectory() as tmp:
+        if args.database_uri:
+            datagen.configure_database(args.database_uri)
+            os.environ['EXPORT_CACHE_DIR'] = os.path.join(tmp, 'export-cache')
+            from app import create_app
+            report['database'] = 'configured'
+            report['runs'].append(benchmark(create_app(), args))
+        else:
+            report['database'] = 'sqlite'
+            for size in (int(value) for value in args.sizes.split(',')):
+                report['runs'].append(run_size(size, args, tmp))
+
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, 'w') as handle:
+            handle.write(output + '\n')
+    print(output)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,108 @@
+"""
+Logging overhead benchmark
+
+Measures request latency under different logging setups, each in a fresh
+interpreter because logging configuration is process-wide:
+
+- legacy: the old logging.basicConfig(level=logging.DEBUG). Every
+  logger runs at DEBUG and is written synchronously.
+- disabled: LOG_LEVEL=CRITICAL, so nothing is logged.
+- sync: the default levels, written synchronously (LOG_QUEUE_SIZE=0).
+- queued: the default levels, written by the background listener.
+
+Each run logs in a team lead and a cash controller, then alternates report
+submissions (which log a line) with /cash-controller/api/reports polls.
+Log output goes to a file, so real I/O is included. Prints latency
+percentiles per scenario, and the number of lines written, as JSON.
+
+Usage:
+    python -m benchmarks.logging_overhead [--requests 1000] [--reports 2000]
+"""
+import argparse
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+SCENARIOS = {
+    'legacy': {'LOG_LEVEL': 'DEBUG', 'LOG_LEVELS': '', 'LOG_FORMAT': 'text', 'LOG_QUEUE_SIZE': '0'},
+    'disabled': {'LOG_LEVEL': 'CRITICAL'},
+    'sync': {'LOG_QUEUE_SIZE': '0'},
+    'queued': {},
+}
+
+# Timed inside the child; the log file is counted after the app shuts logging down
+RUN = """
+import json, logging, sys, time
+from benchmarks import datagen
+from benchmarks.load import percentile
+from app import create_app
+from utils import logs
+
+requests = int(sys.argv[1])
+app = create_app()
+app.config['WTF_CSRF_ENABLED'] = False
+clients = {}
+for role, name in (('teamLead', datagen.username('teamLead', 0)), ('cashController', datagen.username('cashController', 0))):
+    clients[role] = app.test_client()
+    clients[role].post('/login', data={'username': name, 'password': datagen.PASSWORD})
+
+latencies = []
+for number in range(requests):
+    start = time.perf_counter()
+    if number % 2:
+        clients['cashController'].get('/cash-controller/api/reports').get_data()
+    else:
+        clients['teamLead'].post('/team-lead/reports/submit', data={
+            'date': '2026-01-01', 'ref_no': f'LOG-{number}', 'supervisor': datagen.supervisor_name(0),
+            'flight': datagen.flight_name(0), 'zone': 'arrival', 'paid': 10,
+        }).get_data()
+    latencies.append(time.perf_counter() - start)
+
+logs.shutdown()
+print(json.dumps({
+    'mean_us': round(sum(latencies) / len(latencies) * 1e6, 1),
+    'p50_us': round(percentile(latencies, 0.50) * 1e6, 1),
+    'p95_us': round(percentile(latencies, 0.95) * 1e6, 1),
+    'p99_us': round(percentile(latencies, 0.99) * 1e6, 1),
+}))
+"""
+
+def run_scenario(name, settings, args, tmp, seed_db):
+    database = os.path.join(tmp, f'{name}.db')
+    log_file = os.path.join(tmp, f'{name}.log')
+    shutil.copy(seed_db, database)
+    env = dict(os.environ, APP_CONFIG='sqlite', SQLITE_PATH=database, LOG_FILE=log_file, **settings)
+
+    output = subprocess.run([sys.executable, '-c', RUN, str(args.requests)], cwd=ROOT, env=env,
+                            check=True, capture_output=True, text=True).stdout
+    result = json.loads(output.strip().splitlines()[-1])
+    with open(log_file) as handle:
+        result['log_lines'] = sum(1 for _ in handle)
+    return result
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--requests', type=int, default=1000)
+    parser.add_argument('--reports', type=int, default=2000, help='Reports in the generated dataset')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        seed_db = os.path.join(tmp, 'seed.db')
+        env = dict(os.environ, APP_CONFIG='sqlite', SQLITE_PATH=seed_db, LOG_LEVEL='WARNING')
+        subprocess.run([sys.executable, '-m', 'benchmarks.datagen', '--reports', str(args.reports)],
+                       cwd=ROOT, env=env, check=True, capture_output=True)
+
+        results = {name: run_scenario(name, settings, args, tmp, seed_db) for name, settings in SCENARIOS.items()}
+
+    baseline = results['disabled']['mean_us']
+    for result in results.values():
+        result['overhead_us'] = round(result['mean_us'] - baseline, 1)
+    print(json.dumps({'requests': args.requests, 'reports': args.reports, 'scenarios': results}, indent=2))
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,125 @@
+"""
+Login throughput benchmark
+
+Simulates a shift change: --users accounts log in at once from --concurrency
+threads while a probe thread keeps requesting the login page, so the probe
+latency shows how much password hashing holds up unrelated requests.
+Prints logins per second and latency percentiles as JSON.
+
+Usage:
+    python -m benchmarks.login_throughput [--users 40] [--concurrency 8]
+        [--method scrypt:32768:8:1] [--workers 2] [--stored-method pbkdf2:sha256:1000000]
+
+--stored-method seeds the accounts with a different hash so the run also
+covers the rehash-on-login upgrade. Uses a throwaway SQLite database.
+"""
+import argparse
+import json
+import os
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+PASSWORD = 'shift-change-password'
+
+def percentile(values, fraction):
+    if not values:
+        return None
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(round(fraction * (len(ordered) - 1))))
+    return round(ordered[index] * 1000, 2)
+
+def latency_summary(values):
+    return {
+        'count': len(values),
+        'p50_ms': percentile(values, 0.50),
+        'p95_ms': percentile(values, 0.95),
+        'max_ms': percentile(values, 1.0),
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--users', type=int, default=40)
+    parser.add_argument('--concurrency', type=int, default=8)
+    parser.add_argument('--method', help='PASSWORD_HASH_METHOD (default: the configured one)')
+    parser.add_argument('--workers', type=int, help='PASSWORD_HASH_WORKERS (default: the configured one)')
+    parser.add_argument('--stored-method', help='Hash method of the seeded accounts (default: --method)')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        # Config is read at import time, so point it at the scratch database first
+        os.environ['APP_CONFIG'] = 'sqlite'
+        os.environ['SQLITE_PATH'] = os.path.join(tmp, 'login.db')
+        if args.method:
+            os.environ['PASSWORD_HASH_METHOD'] = args.method
+        if args.workers:
+            os.environ['PASSWORD_HASH_WORKERS'] = str(args.workers)
+
+        from werkzeug.security import generate_password_hash
+        from app import create_app
+        from extensions import db
+        from models import User
+
+        app = create_app()
+        app.config['WTF_CSRF_ENABLED'] = False
+        method = app.config['PASSWORD_HASH_METHOD']
+        stored_method = args.stored_method or method
+
+        with app.app_context():
+            db.create_all()
+            stored_hash = generate_password_hash(PASSWORD, method=stored_method)
+            db.session.add_all([
+                # Same hash for every account; the salt does not change the cost
+                User(username=f'bench{number}', password_hash=stored_hash, email=f'bench{number}@example.com',
+                     role='teamLead', gender='other', telephone='000', active=True)
+                for number in range(args.users)
+            ])
+            db.session.commit()
+
+        def log_in(number):
+            client = app.test_client()
+            start = time.perf_counter()
+            response = client.post('/login', data={'username': f'bench{number}', 'password': PASSWORD})
+            elapsed = time.perf_counter() - start
+            if response.status_code != 302 or '/login' in response.headers.get('Location', ''):
+                raise RuntimeError(f'Login failed for bench{number}')
+            return elapsed
+
+        probe_latencies = []
+        stop = threading.Event()
+
+        def probe():
+            client = app.test_client()
+            while not stop.is_set():
+                start = time.perf_counter()
+                client.get('/login')
+                probe_latencies.append(time.perf_counter() - start)
+                time.sleep(0.01)
+
+        # Warm up the hashing pool and the policy check outside the timed run
+        log_in(0)
+
+        probe_thread = threading.Thread(target=probe)
+        probe_thread.start()
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=args.concurrency) as pool:
+            login_latencies = list(pool.map(log_in, range(args.users)))
+        elapsed = time.perf_counter() - start
+        stop.set()
+        probe_thread.join()
+
+    print(json.dumps({
+        'method': method,
+        'stored_method': stored_method,
+        'hash_workers': app.config['PASSWORD_HASH_WORKERS'],
+        'concurrency': args.concurrency,
+        'logins': args.users,
+        'elapsed_s': round(elapsed, 3),
+        'logins_per_s': round(args.users / elapsed, 2),
+        'login_latency': latency_summary(login_latencies),
+        'probe_latency': latency_summary(probe_latencies),
+    }, indent=2))
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,333 @@
+"""
+Micro-benchmarks for the per-row hot paths
+
+Times the functions that run once for every report in listings and exports:
+
+- Report.to_dict
+- utils.export.report_to_row
+- one CSV export row (report_to_row plus csv.writer.writerow)
+- Report.calculate_total
+- ReportForm and VerificationForm validation
+
+Each function is timed over 1k/10k/100k rows, as in a listing or export of
+that size. The rows come from two sources:
+
+- detached: Report objects built in memory, with no session or database.
+- db: rows loaded with Report.query_with_users from a SQLite database
+  filled by benchmarks.datagen.
+
+Forms only run on detached data, because they never see database rows.
+
+Each benchmark is sampled --repeat times and reported as nanoseconds per
+row: the median, and the fastest and slowest sample as its spread. Short
+benchmarks call the function several times per sample so each sample
+takes at least --min-time seconds. Samples are interleaved: every round
+runs each benchmark once, so a slow patch on the machine is spread over
+all benchmarks instead of skewing one.
+
+Usage:
+    python -m benchmarks.micro [--scales 1000,10000,100000] [--repeat 7]
+        [--only to_dict,calculate_total] [--save results.json]
+        [--compare benchmarks/baselines/micro.json] [--threshold 0.15]
+
+--compare prints the change in median against a saved run. A benchmark
+counts as a regression when its median is slower by more than
+--threshold and even its fastest sample is slower than the slowest
+baseline sample. Slower medians whose samples overlap the baseline are
+marked as noise. The exit status is 1 when there is any regression.
+Baselines are only comparable on the machine that recorded them; record
+a fresh one with --save before starting on an optimization.
+"""
+import argparse
+import csv
+import gc
+import json
+import math
+import os
+import platform
+import random
+import statistics
+import sys
+import tempfile
+import time
+from datetime import date
+from io import StringIO
+
+from benchmarks import datagen
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_BASELINE = os.path.join(ROOT, 'benchmarks', 'baselines', 'micro.json')
+
+def time_per_call(loops, function, rows):
+    """Seconds per call of function(rows), averaged over `loops` calls with the garbage collector off as in timeit"""
+    gc_was_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        start = time.perf_counter()
+        for _ in range(loops):
+            function(rows)
+        return (time.perf_counter() - start) / loops
+    finally:
+        if gc_was_enabled:
+            gc.enable()
+
+def sample(cases, repeat, min_time):
+    """
+    Time every case `repeat` times, one round over all cases at a time
+
+    Args:
+        cases: List of (key, function, rows)
+        repeat: Number of rounds
+        min_time: Seconds each sample should take at least
+
+    Returns:
+        Dict of key -> list of seconds per call
+    """
+    # The calibration call doubles as a warm-up
+    loops = {key: max(1, math.ceil(min_time / max(time_per_call(1, function, rows), 1e-9)))
+             for key, function, rows in cases}
+    samples = {key: [] for key, function, rows in cases}
+    for _ in range(repeat):
+        for key, function, rows in cases:
+            samples[key].append(time_per_call(loops[key], function, rows))
+    return samples
+
+def detached_reports(count, seed):
+    """Reports with submitter and verifier set, built without a session"""
+    from sqlalchemy.orm.attributes import set_committed_value
+    from models import Report, User
+
+    team_leads = {number: User(id=number, username=datagen.username('teamLead', number)) for number in range(1, 41)}
+    analysts = {number: User(id=number, username=datagen.username('dataAnalyst', number)) for number in range(41, 49)}
+    flights = [(number, datagen.flight_name(number)) for number in range(200)]
+    supervisors = [(number, datagen.supervisor_name(number)) for number in range(60)]
+
+    rows = datagen.report_rows(random.Random(seed), count, list(team_leads), list(analysts),
+                               flights, supervisors, date.today())
+
+    reports = []
+    for row in rows:
+        report = Report(**row)
+        # Bypass the backref so no dynamic collection is touched
+        set_committed_value(report, 'submitter', team_leads[row['submitted_by_id']])
+        set_committed_value(report, 'verified_by', analysts.get(row['verified_by_id']))
+        reports.append(report)
+    return reports
+
+def form_data(reports):
+    """Submitted form fields for each report, as the browser would send them"""
+    from werkzeug.datastructures import MultiDict
+
+    report_forms = []
+    verification_forms = []
+    for report in reports:
+        report_forms.append(MultiDict({
+            'date': report.date.isoformat(),
+            'ref_no': report.ref_no,
+            'supervisor': report.supervisor,
+            'flight': report.flight_name,
+            'zone': report.zone,
+            **{field: str(getattr(report, field)) for field in datagen.COUNT_FIELDS},
+            'refunds': str(report.refunds),
+            'remarks': '',
+        }))
+        verification_forms.append(MultiDict({
+            'iics_infant': str(report.iics_infant),
+            'iics_adult': str(report.iics_adult),
+            'gia_infant': str(report.gia_infant),
+            'gia_adult': str(report.gia_adult),
+        }))
+    return report_forms, verification_forms
+
+def row_benchmarks():
+    """Benchmarks that take a list of Report objects"""
+    from utils.export import report_to_row
+
+    def to_dict(reports):
+        for report in reports:
+            report.to_dict()
+
+    def export_row(reports):
+        for report in reports:
+            report_to_row(report)
+
+    def csv_row(reports):
+        output = StringIO()
+        writer = csv.writer(output)
+        for report in reports:
+            writer.writerow(report_to_row(report))
+
+    def calculate_total(reports):
+        for report in reports:
+            report.calculate_total()
+
+    return {
+        'to_dict': to_dict,
+        'report_to_row': export_row,
+        'csv_row': csv_row,
+        'calculate_total': calculate_total,
+    }
+
+def form_benchmarks(app, supervisors, flights):
+    """Benchmarks that take submitted form data"""
+    from forms import ReportForm, VerificationForm
+
+    flight_choices = [('', 'Select Flight')] + [(name, name) for name in flights]
+    supervisor_choices = [('', 'Select Supervisor')] + [(name, name) for name in supervisors]
+
+    def report_form(submissions):
+        with app.test_request_context(method='POST'):
+            for formdata in submissions:
+                form = ReportForm(formdata=formdata)
+                form.flight.choices = flight_choices
+                form.supervisor.choices = supervisor_choices
+                if not form.validate():
+                    raise RuntimeError(f'ReportForm rejected benchmark data: {form.errors}')
+
+    def verification_form(submissions):
+        with app.test_request_context(method='POST'):
+            for formdata in submissions:
+                if not VerificationForm(formdata=formdata).validate():
+                    raise RuntimeError('VerificationForm rejected benchmark data')
+
+    return {'ReportForm.validate': report_form, 'VerificationForm.validate': verification_form}
+
+def run(args, tmp):
+    datagen.configure_database(sqlite_path=os.path.join(tmp, 'micro.db'))
+
+    from app import create_app
+    from extensions import db
+    from models import Report
+
+    app = create_app()
+    app.config['WTF_CSRF_ENABLED'] = False
+    scales = sorted(int(value) for value in args.scales.split(','))
+    only = set(args.only.split(',')) if args.only else None
+    results = {}
+
+    def case(cases, name, source, scale, function, data):
+        if only is None or name in only:
+            cases.append(((name, source, scale), function, data))
+
+    def measure(cases):
+        for (name, source, scale), seconds in sample(cases, args.repeat, args.min_time).items():
+            median = statistics.median(seconds)
+            results[f'{name}/{source}/{scale}'] = {
+                'ns_per_row': round(median / scale * 1e9, 1),
+                'ns_min': round(min(seconds) / scale * 1e9, 1),
+                'ns_max': round(max(seconds) / scale * 1e9, 1),
+                'total_ms': round(median * 1000, 3),
+            }
+            print(f'{name:26} {source:9} {scale:>7}  {median / scale * 1e9:10.1f} ns/row '
+                  f'({min(seconds) / scale * 1e9:.1f}..{max(seconds) / scale * 1e9:.1f})', file=sys.stderr)
+
+    rows = row_benchmarks()
+
+    with app.app_context():
+        detached = detached_reports(scales[-1], args.seed)
+        report_forms, verification_forms = form_data(detached)
+        forms = form_benchmarks(app, [datagen.supervisor_name(number) for number in range(60)],
+                                [datagen.flight_name(number) for number in range(200)])
+
+        cases = []
+        for scale in scales:
+            for name, function in rows.items():
+                case(cases, name, 'detached', scale, function, detached[:scale])
+            case(cases, 'ReportForm.validate', 'detached', scale, forms['ReportForm.validate'], report_forms[:scale])
+            case(cases, 'VerificationForm.validate', 'detached', scale, forms['VerificationForm.validate'],
+                 verification_forms[:scale])
+        measure(cases)
+        del cases, detached, report_forms, verification_forms
+
+        if only is None or only & set(rows):
+            db.create_all()
+            datagen.generate(scales[-1], seed=args.seed)
+            # Rows are in id order, so each scale is a prefix of one load
+            loaded = Report.query_with_users().order_by(Report.id).limit(scales[-1]).all()
+            cases = []
+            for scale in scales:
+                for name, function in rows.items():
+                    case(cases, name, 'db', scale, function, loaded[:scale])
+            measure(cases)
+            del cases, loaded
+            db.session.remove()
+
+    return results
+
+def compare(results, baseline, threshold):
+    """
+    Print the change of every benchmark's median against a baseline
+
+    Returns:
+        Names of benchmarks slower than the baseline by more than threshold,
+        with no overlap between their samples and the baseline's
+    """
+    regressions = []
+    print(f"{'benchmark':48} {'baseline':>28} {'current':>28} {'change':>8}")
+    for key, current in results.items():
+        before = baseline.get('results', {}).get(key)
+        current_range = f"{current['ns_per_row']} ({current['ns_min']}..{current['ns_max']})"
+        if before is None:
+            print(f"{key:48} {'-':>28} {current_range:>28} {'new':>8}")
+            continue
+        # Baselines from before spreads were recorded have a single value
+        before_max = before.get('ns_max', before['ns_per_row'])
+        before_range = f"{before['ns_per_row']} ({before.get('ns_min', before['ns_per_row'])}..{before_max})"
+        change = current['ns_per_row'] / before['ns_per_row'] - 1
+        flag = ''
+        if change > threshold:
+            if current['ns_min'] > before_max:
+                flag = '  SLOWER'
+                regressions.append(key)
+            else:
+                flag = '  noise'
+        print(f"{key:48} {before_range:>28} {current_range:>28} {change:>+8.1%}{flag}")
+    return regressions
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--scales', default='1000,10000,100000', help='Comma-separated row counts')
+    parser.add_argument('--repeat', type=int, default=7, help='Samples per benchmark')
+    parser.add_argument('--min-time', type=float, default=0.2, help='Minimum seconds per sample')
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--only', help='Comma-separated benchmark names')
+    parser.add_argument('--save', nargs='?', const=DEFAULT_BASELINE, help='Write the results as a baseline '
+                        f'(default path: {os.path.relpath(DEFAULT_BASELINE, ROOT)})')
+    parser.add_argument('--compare', nargs='?', const=DEFAULT_BASELINE, help='Baseline to compare against')
+    parser.add_argument('--threshold', type=float, default=0.15, help='Allowed slowdown before failing')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        results = run(args, tmp)
+
+    report = {
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'processor': platform.processor() or platform.machine(),
+        'repeat': args.repeat,
+        'min_time': args.min_time,
+        'seed': args.seed,
+        'results': results,
+    }
+
+    if args.save:
+        os.makedirs(os.path.dirname(os.path.abspath(args.save)), exist_ok=True)
+        with open(args.save, 'w') as handle:
+            handle.write(json.dumps(report, indent=2) + '\n')
+
+    if args.compare:
+        with open(args.compare) as handle:
+            baseline = json.load(handle)
+        if baseline.get('python') != report['python'] or baseline.get('platform') != report['platform']:
+            print(f"Baseline was recorded on Python {baseline.get('python')}, {baseline.get('platform')}; "
+                  'numbers may not be comparable', file=sys.stderr)
+        regressions = compare(results, baseline, args.threshold)
+        if regressions:
+            print(f'{len(regressions)} benchmark(s) slower than the baseline by more than {args.threshold:.0%} '
+                  'beyond its spread', file=sys.stderr)
+            sys.exit(1)
+    elif not args.save:
+        print(json.dumps(report, indent=2))
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,114 @@
+"""
+Startup-time benchmark
+
+Measures, in fresh interpreter processes, how long a gunicorn worker takes
+to import main and build the app. The same measurement runs against two
+trees:
+
+- baseline: a git worktree of --baseline. By default this is the revision
+  before the database bootstrap moved to CLI commands. In that revision
+  create_app() loaded Flask-Migrate, ran CREATE DATABASE, db.create_all()
+  and the admin lookup, and was called by both app.py and main.py.
+- current: this working tree.
+
+The baseline runs once before timing, so its bootstrap finds the schema
+and admin already in place, as a restarting worker would. Prints the
+results as JSON.
+
+Usage:
+    python -m benchmarks.startup [--runs 10] [--baseline REV] [--database-uri URI]
+
+Without --database-uri each tree gets a throwaway SQLite file. Needs git
+and a clone with the baseline revision.
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Timed inside the child so interpreter start-up is excluded
+WORKER = """
+import json, time
+start = time.perf_counter()
+from main import app
+print(json.dumps({'total': time.perf_counter() - start}))
+"""
+
+def git(*args):
+    return subprocess.run(['git', *args], cwd=ROOT, check=True, capture_output=True, text=True).stdout.strip()
+
+def default_baseline():
+    """Parent of the commit that added this benchmark, the last revision with the old startup"""
+    added = git('log', '--diff-filter=A', '--format=%H', '--', 'benchmarks/startup.py').splitlines()
+    return f'{added[-1]}^'
+
+def run_once(code, cwd, env):
+    output = subprocess.run(
+        [sys.executable, '-c', code],
+        cwd=cwd, env=env, check=True, capture_output=True, text=True
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+def summarize(samples):
+    totals = [sample['total'] for sample in samples]
+    return {
+        'runs': len(samples),
+        'median_ms': round(statistics.median(totals) * 1000, 2),
+        'min_ms': round(min(totals) * 1000, 2),
+        'max_ms': round(max(totals) * 1000, 2),
+    }
+
+def database_env(args, path):
+    env = dict(os.environ, PYTHONDONTWRITEBYTECODE='1')
+    env.pop('FLASK_RUN_FROM_CLI', None)
+    if args.database_uri:
+        env['SQLALCHEMY_DATABASE_URI'] = args.database_uri
+        env.pop('APP_CONFIG', None)
+    else:
+        env['APP_CONFIG'] = 'sqlite'
+        env['SQLITE_PATH'] = path
+    return env
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--runs', type=int, default=10)
+    parser.add_argument('--baseline', help='Revision to compare against (default: the revision before '
+                        'the bootstrap moved to CLI commands)')
+    parser.add_argument('--database-uri', help='Database to bootstrap against (default: temporary SQLite files)')
+    args = parser.parse_args()
+
+    try:
+        revision = git('rev-parse', '--short', args.baseline or default_baseline())
+    except (OSError, IndexError, subprocess.CalledProcessError):
+        sys.exit('Cannot resolve the baseline revision; run from a git clone or pass --baseline')
+
+    with tempfile.TemporaryDirectory() as tmp:
+        worktree = os.path.join(tmp, 'baseline')
+        git('worktree', 'add', '--detach', worktree, revision)
+        try:
+            baseline_env = database_env(args, os.path.join(tmp, 'baseline.db'))
+            current_env = database_env(args, os.path.join(tmp, 'current.db'))
+
+            # The first bootstrap creates the schema and admin; later runs
+            # measure the steady state a restarting worker would see
+            run_once(WORKER, worktree, baseline_env)
+
+            results = {
+                'baseline': {'revision': revision,
+                             **summarize([run_once(WORKER, worktree, baseline_env) for _ in range(args.runs)])},
+                'current': {'revision': git('rev-parse', '--short', 'HEAD'),
+                            **summarize([run_once(WORKER, ROOT, current_env) for _ in range(args.runs)])},
+            }
+        finally:
+            git('worktree', 'remove', '--force', worktree)
+
+    results['saved_ms'] = round(results['baseline']['median_ms'] - results['current']['median_ms'], 2)
+    print(json.dumps(results, indent=2))
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,191 @@
+# commands.py
+import logging
+import click
+from datetime import date, datetime
+from flask import current_app
+
+from extensions import db
+from models import Report, TeamLeadActivation, User
+from utils.passwords import hash_password
+from utils.summary import rebuild_summary
+
+
+def create_mysql_database(app):
+    """Create the MySQL database if it doesn't exist - for local MySQL setup"""
+    import pymysql
+
+    try:
+        full_uri = app.config['SQLALCHEMY_DATABASE_URI']
+        if 'mysql+pymysql' in full_uri:
+            uri_parts = full_uri.split('/')
+            db_name = uri_parts[-1].split('?')[0]  # Extract database name
+
+            # Connect to MySQL server (without specifying a database)
+            logging.info(f"Attempting to create database '{db_name}' if it doesn't exist")
+
+            try:
+                connection = pymysql.connect(
+                    host=app.config.get('MYSQL_HOST', 'localhost'),
+                    user=app.config.get('MYSQL_USER', 'jawo'),
+                    password=app.config.get('MYSQL_PASSWORD', 'abc_123'),
+                    charset='utf8mb4',
+                    cursorclass=pymysql.cursors.DictCursor
+                )
+
+                with connection.cursor() as cursor:
+                    cursor.execute(f"CREATE DATABASE IF NOT EXISTS `{db_name}`")
+                connection.commit()
+                logging.info(f"Database '{db_name}' created or already exists")
+                return True
+            except Exception as e:
+                logging.error(f"Error creating database: {e}")
+                return False
+            finally:
+                if 'connection' in locals() and connection:
+                    connection.close()
+    except Exception as e:
+        logging.error(f"Error attempting to create database: {e}")
+        return False
+
+def init_database(app):
+    """Create the MySQL database if needed and any missing tables"""
+    if 'mysql+pymysql' in app.config.get('SQLALCHEMY_DATABASE_URI', ''):
+        create_mysql_database(app)
+    db.create_all()
+
+def seed_admin(username, password, email):
+    """
+    Create the admin user if it does not exist
+
+    Returns:
+        True if the user was created
+    """
+    if User.query.filter_by(username=username).first():
+        return False
+
+    admin = User(
+        username=username,
+        password_hash=hash_password(password),
+        role='admin',
+        email=email,
+        telephone='123-456-7890',
+        gender='other',
+        active=True
+    )
+    db.session.add(admin)
+    db.session.commit()
+    return True
+
+def log_connection_error(e):
+    logging.error(f"Database connection error: {str(e)}")
+    if 'Unknown database' in str(e):
+        logging.error("Database does not exist. Ensure MySQL is running and create the database manually.")
+    elif 'Access denied' in str(e):
+        logging.error("Check MySQL username and password.")
+    elif 'Can\'t connect' in str(e) or 'Connection refused' in str(e):
+        logging.error("Ensure MySQL server is running.")
+
+
+def hot_queries():
+    """Representative queries issued by the dashboards and report APIs"""
+    today = date.today()
+    return {
+        'data_analyst.unverified': Report.query.filter_by(verified=False)
+            .order_by(Report.date.desc(), Report.id.desc()).limit(51),
+        'team_lead.reports': Report.query.filter_by(submitted_by_id=1)
+            .order_by(Report.date.desc(), Report.id.desc()).limit(51),
+        'cash_controller.reports': Report.query.filter_by(verified=True)
+            .filter(Report.date >= today.replace(day=1), Report.date <= today)
+            .order_by(Report.date.desc(), Report.id.desc()).limit(51),
+        'team_lead.activation': db.session.query(TeamLeadActivation.team_lead_id, TeamLeadActivation.valid_from,
+                                                 TeamLeadActivation.valid_until)
+            .filter(TeamLeadActivation.valid_until > datetime.now()),
+        'cash_controller.changes': Report.query
+            .filter(Report.updated_at < datetime.utcnow(), Report.updated_at > today.replace(day=1))
+            .order_by(Report.updated_at, Report.id).limit(51),
+    }
+
+
+def explain(query):
+    """Return the database query plan for a query as a list of text lines"""
+    connection = db.session.connection()
+    dialect = connection.dialect.name
+    compiled = query.statement.compile(dialect=connection.dialect)
+
+    if compiled.positional:
+        params = tuple(compiled.params[name] for name in compiled.positiontup)
+    else:
+        params = compiled.params
+
+    prefix = 'EXPLAIN QUERY PLAN ' if dialect == 'sqlite' else 'EXPLAIN '
+    rows = connection.exec_driver_sql(prefix + str(compiled), params).fetchall()
+
+    if dialect == 'sqlite':
+        return [row[-1] for row in rows]
+    if dialect == 'mysql':
+        return [f"table={row._mapping['table']} type={row._mapping['type']} key={row._mapping['key']}" for row in rows]
+    return [row[0] for row in rows]
+
+
+def is_full_scan(line):
+    """
+    Detect a full table or index scan in a plan line for SQLite, MySQL and PostgreSQL
+
+    Walking a whole index (SQLite "SCAN ... USING INDEX", MySQL type=index)
+    reads every row just like a table scan, so it counts too.
+    """
+    if line.startswith('SCAN ') and not line.startswith('SCAN CONSTANT ROW'):
+        return True
+    if ' type=ALL ' in f' {line} ' or ' type=index ' in f' {line} ':
+        return True
+    return 'Seq Scan' in line
+
+
+def register_commands(app):
+    from flask_migrate import Migrate
+    Migrate(app, db)
+
+    @app.cli.command('db-init')
+    def db_init():
+        """Create the database and any missing tables."""
+        try:
+            init_database(current_app)
+        except Exception as e:
+            log_connection_error(e)
+            raise SystemExit(1)
+        click.echo('Database tables are ready.')
+
+    @app.cli.command('seed-admin')
+    @click.option('--username', default='admin', show_default=True)
+    @click.option('--password', default='admin123', envvar='ADMIN_PASSWORD', show_default=True,
+                  help='Initial password (or set ADMIN_PASSWORD).')
+    @click.option('--email', default='admin@example.com', show_default=True)
+    def seed_admin_command(username, password, email):
+        """Create the admin user if it does not exist."""
+        try:
+            created = seed_admin(username, password, email)
+        except Exception as e:
+            log_connection_error(e)
+            raise SystemExit(1)
+        click.echo(f"Admin user '{username}' {'created' if created else 'already exists'}.")
+
+    @app.cli.command('check-query-plans')
+    def check_query_plans():
+        """Fail if a dashboard query falls back to a full table scan."""
+        failures = 0
+        for name, query in hot_queries().items():
+            plan = explain(query)
+            full_scan = any(is_full_scan(line) for line in plan)
+            failures += full_scan
+            click.echo(f"{'FULL SCAN' if full_scan else 'ok':9} {name}")
+            for line in plan:
+                click.echo(f'          {line}')
+
+        if failures:
+            raise SystemExit(1)
+
+    @app.cli.command('rebuild-summary')
+    def rebuild_summary_command():
+        """Regenerate the daily report summary from the reports table."""
+        rows = rebuild_summary()
+        click.echo(f'Rebuilt daily_report_summary: {rows} rows')
@@ -1,4 +1,5 @@
 from flask_wtf import FlaskForm
+from flask_wtf.file import FileField, FileRequired, FileAllowed
 from wtforms import StringField, PasswordField, SelectField, DateField, IntegerField, TextAreaField, SubmitField
 from wtforms.validators import DataRequired, Email, EqualTo, Length, ValidationError, NumberRange
 import re
@@ -76,6 +77,10 @@ class ReportForm(FlaskForm):
     
     submit = SubmitField('Submit Data')
 
+class ReportBatchForm(FlaskForm):
+    file = FileField('Shift CSV', validators=[FileRequired(), FileAllowed(['csv'], 'CSV files only')])
+    submit = SubmitField('Upload Shift')
+
 class VerificationForm(FlaskForm):
     iics_infant = IntegerField('IICS Infant', default=0, validators=[NumberRange(min=0)])
     iics_adult = IntegerField('IICS Adult', default=0, validators=[NumberRange(min=0)])
@@ -0,0 +1,87 @@
+"""add composite indexes on reports and team_lead_activations
+
+The unique index on reports (ref_no, date, flight_name, zone) cannot be
+created while duplicate reports exist, and the app accepted duplicates
+before this revision. The upgrade checks first and stops with a list of
+the duplicate groups and their report ids. Merge or delete the extra
+reports by hand, keeping the one that was verified, then run the upgrade
+again. Nothing is deleted automatically because these are cash records.
+
+Revision ID: 1a2b3c4d5e01
+Revises: 
+Create Date: 2026-10-18 09:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '1a2b3c4d5e01'
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+INDEXES = [
+    ('ix_reports_verified_date_id', 'reports', ['verified', 'date', 'id'], False),
+    ('ix_reports_submitted_by_id_date_id', 'reports', ['submitted_by_id', 'date', 'id'], False),
+    ('ix_reports_date_id', 'reports', ['date', 'id'], False),
+    ('uq_reports_ref_no_date_flight_name_zone', 'reports', ['ref_no', 'date', 'flight_name', 'zone'], True),
+    ('ix_team_lead_activations_team_lead_id_id', 'team_lead_activations', ['team_lead_id', 'id'], False),
+]
+
+
+def existing_indexes(table):
+    return {index['name'] for index in sa.inspect(op.get_bind()).get_indexes(table)}
+
+
+def duplicate_groups(table, columns):
+    """
+    Rows that would violate a unique index on columns, as {values: [ids]}
+
+    Joined on equality, so rows with a NULL in the key are left out, as the
+    unique index allows them.
+    """
+    column_list = ', '.join(columns)
+    matches = ' AND '.join(f'report.{column} = duplicate.{column}' for column in columns)
+    rows = op.get_bind().execute(sa.text(
+        f'SELECT report.id, {", ".join(f"report.{column}" for column in columns)} FROM {table} report '
+        f'JOIN (SELECT {column_list} FROM {table} GROUP BY {column_list} HAVING COUNT(*) > 1) duplicate '
+        f'ON {matches} ORDER BY report.id'
+    ))
+    groups = {}
+    for row in rows:
+        groups.setdefault(tuple(row[1:]), []).append(row[0])
+    return groups
+
+
+def check_duplicates(name, table, columns, shown=50):
+    groups = duplicate_groups(table, columns)
+    if not groups:
+        return
+    lines = '\n'.join(
+        '  ' + ', '.join(f'{column}={value!r}' for column, value in zip(columns, values))
+        + f": ids {', '.join(map(str, ids))}"
+        for values, ids in list(groups.items())[:shown]
+    )
+    raise RuntimeError(
+        f'Cannot create unique index {name}: {table} has {len(groups)} duplicate group(s) on '
+        f'{", ".join(columns)}. First {min(shown, len(groups))}:\n{lines}\n'
+        'Merge or delete the duplicates, then run the upgrade again.'
+    )
+
+
+def upgrade():
+    # Tables may have been created by db.create_all() with the indexes already in place
+    for name, table, columns, unique in INDEXES:
+        if name not in existing_indexes(table):
+            if unique:
+                check_duplicates(name, table, columns)
+            op.create_index(name, table, columns, unique=unique)
+
+
+def downgrade():
+    for name, table, columns, unique in reversed(INDEXES):
+        if name in existing_indexes(table):
+            op.drop_index(name, table_name=table)
@@ -0,0 +1,54 @@
+"""reference flights and supervisors from reports by id
+
+Revision ID: 2b3c4d5e6f02
+Revises: 1a2b3c4d5e01
+Create Date: 2026-10-18 10:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '2b3c4d5e6f02'
+down_revision = '1a2b3c4d5e01'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    columns = {column['name'] for column in sa.inspect(op.get_bind()).get_columns('reports')}
+
+    if 'flight_id' not in columns:
+        with op.batch_alter_table('reports') as batch_op:
+            batch_op.add_column(sa.Column('supervisor_id', sa.Integer(), nullable=True))
+            batch_op.add_column(sa.Column('flight_id', sa.Integer(), nullable=True))
+            batch_op.create_foreign_key('fk_reports_supervisor_id', 'flight_supervisors',
+                                        ['supervisor_id'], ['id'], ondelete='SET NULL')
+            batch_op.create_foreign_key('fk_reports_flight_id', 'flights',
+                                        ['flight_id'], ['id'], ondelete='SET NULL')
+            batch_op.create_index('ix_reports_supervisor_id_date_id', ['supervisor_id', 'date', 'id'])
+            batch_op.create_index('ix_reports_flight_id_date_id', ['flight_id', 'date', 'id'])
+
+    # Backfill from the free-text names; rows whose name no longer exists keep NULL
+    op.execute(
+        "UPDATE reports SET supervisor_id = "
+        "(SELECT MIN(flight_supervisors.id) FROM flight_supervisors "
+        "WHERE flight_supervisors.name = reports.supervisor) "
+        "WHERE supervisor_id IS NULL"
+    )
+    op.execute(
+        "UPDATE reports SET flight_id = "
+        "(SELECT MIN(flights.id) FROM flights WHERE flights.name = reports.flight_name) "
+        "WHERE flight_id IS NULL"
+    )
+
+
+def downgrade():
+    with op.batch_alter_table('reports') as batch_op:
+        batch_op.drop_index('ix_reports_flight_id_date_id')
+        batch_op.drop_index('ix_reports_supervisor_id_date_id')
+        batch_op.drop_constraint('fk_reports_flight_id', type_='foreignkey')
+        batch_op.drop_constraint('fk_reports_supervisor_id', type_='foreignkey')
+        batch_op.drop_column('flight_id')
+        batch_op.drop_column('supervisor_id')
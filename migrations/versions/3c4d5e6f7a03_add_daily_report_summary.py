@@ -0,0 +1,74 @@
+"""add daily_report_summary rollup table
+
+Revision ID: 3c4d5e6f7a03
+Revises: 2b3c4d5e6f02
+Create Date: 2026-10-18 11:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '3c4d5e6f7a03'
+down_revision = '2b3c4d5e6f02'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    if 'daily_report_summary' not in sa.inspect(op.get_bind()).get_table_names():
+        op.create_table(
+            'daily_report_summary',
+            sa.Column('id', sa.Integer(), primary_key=True),
+            sa.Column('date', sa.Date(), nullable=False),
+            sa.Column('flight_name', sa.String(length=100), nullable=False),
+            sa.Column('supervisor', sa.String(length=100), nullable=False),
+            sa.Column('zone', sa.String(length=20), nullable=False),
+            sa.Column('report_count', sa.Integer(), nullable=False),
+            sa.Column('paid', sa.Integer(), nullable=False),
+            sa.Column('not_paid', sa.Integer(), nullable=False),
+            sa.Column('refunds', sa.Integer(), nullable=False),
+            sa.Column('total_attended', sa.Integer(), nullable=False),
+            sa.Column('verified_count', sa.Integer(), nullable=False),
+            sa.Column('verified_total_attended', sa.Integer(), nullable=False),
+            sa.Column('iics_total', sa.Integer(), nullable=False),
+            sa.Column('gia_total', sa.Integer(), nullable=False),
+            sa.Column('iics_difference', sa.Integer(), nullable=False),
+            sa.Column('gia_difference', sa.Integer(), nullable=False),
+            sa.Column('updated_at', sa.DateTime(), nullable=True),
+        )
+        op.create_index('uq_daily_report_summary_key', 'daily_report_summary',
+                        ['date', 'flight_name', 'supervisor', 'zone'], unique=True)
+
+    # Populate from existing reports; same aggregation as utils.summary.rebuild_summary
+    op.execute("DELETE FROM daily_report_summary")
+    op.execute("""
+        INSERT INTO daily_report_summary (
+            date, flight_name, supervisor, zone,
+            report_count, paid, not_paid, refunds, total_attended,
+            verified_count, verified_total_attended, iics_total, gia_total,
+            iics_difference, gia_difference, updated_at
+        )
+        SELECT
+            date, flight_name, supervisor, zone,
+            COUNT(id),
+            COALESCE(SUM(paid), 0),
+            COALESCE(SUM(not_paid), 0),
+            COALESCE(SUM(refunds), 0),
+            COALESCE(SUM(total_attended), 0),
+            SUM(CASE WHEN verified THEN 1 ELSE 0 END),
+            SUM(CASE WHEN verified THEN COALESCE(total_attended, 0) ELSE 0 END),
+            SUM(CASE WHEN verified THEN COALESCE(iics_total, 0) ELSE 0 END),
+            SUM(CASE WHEN verified THEN COALESCE(gia_total, 0) ELSE 0 END),
+            SUM(CASE WHEN verified THEN COALESCE(iics_total, 0) - COALESCE(total_attended, 0) ELSE 0 END),
+            SUM(CASE WHEN verified THEN COALESCE(gia_total, 0) - COALESCE(total_attended, 0) ELSE 0 END),
+            CURRENT_TIMESTAMP
+        FROM reports
+        GROUP BY date, flight_name, supervisor, zone
+    """)
+
+
+def downgrade():
+    op.drop_index('uq_daily_report_summary_key', table_name='daily_report_summary')
+    op.drop_table('daily_report_summary')
@@ -0,0 +1,93 @@
+"""store team lead activations as validity windows
+
+Windows are in server local time, like the dates they are built from,
+while created_at is stored in UTC. The backfill converts created_at to
+local time before using it to close a window, so run it with the
+server's timezone (TZ).
+
+Revision ID: 4d5e6f7a8b04
+Revises: 3c4d5e6f7a03
+Create Date: 2026-10-18 12:00:00.000000
+
+"""
+from datetime import datetime, time, timedelta, timezone
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '4d5e6f7a8b04'
+down_revision = '3c4d5e6f7a03'
+branch_labels = None
+depends_on = None
+
+
+activations = sa.table(
+    'team_lead_activations',
+    sa.column('id', sa.Integer),
+    sa.column('team_lead_id', sa.Integer),
+    sa.column('date', sa.Date),
+    sa.column('created_at', sa.DateTime),
+    sa.column('valid_from', sa.DateTime),
+    sa.column('valid_until', sa.DateTime),
+)
+
+
+def utc_to_local(value):
+    """Naive UTC datetime -> naive local time, as utils.activation compares windows with datetime.now()"""
+    return value.replace(tzinfo=timezone.utc).astimezone().replace(tzinfo=None)
+
+
+def backfill():
+    # Only the latest activation of a team lead used to count, so each
+    # window also ends when the next activation was created
+    connection = op.get_bind()
+    rows = connection.execute(
+        sa.select(activations.c.id, activations.c.team_lead_id, activations.c.date, activations.c.created_at)
+        .where(activations.c.valid_from.is_(None))
+        .order_by(activations.c.team_lead_id, activations.c.id)
+    ).fetchall()
+
+    values = []
+    for index, row in enumerate(rows):
+        valid_from = datetime.combine(row.date, time.min)
+        valid_until = valid_from + timedelta(days=1)
+        following = rows[index + 1] if index + 1 < len(rows) else None
+        if following is not None and following.team_lead_id == row.team_lead_id and following.created_at:
+            valid_until = min(valid_until, utc_to_local(following.created_at))
+        values.append({'row_id': row.id, 'valid_from': valid_from, 'valid_until': valid_until})
+
+    if values:
+        connection.execute(
+            activations.update()
+            .where(activations.c.id == sa.bindparam('row_id'))
+            .values(valid_from=sa.bindparam('valid_from'), valid_until=sa.bindparam('valid_until')),
+            values
+        )
+
+
+def upgrade():
+    inspector = sa.inspect(op.get_bind())
+    columns = {column['name'] for column in inspector.get_columns('team_lead_activations')}
+    indexes = {index['name'] for index in inspector.get_indexes('team_lead_activations')}
+
+    if 'valid_from' not in columns:
+        with op.batch_alter_table('team_lead_activations') as batch_op:
+            batch_op.add_column(sa.Column('valid_from', sa.DateTime(), nullable=True))
+            batch_op.add_column(sa.Column('valid_until', sa.DateTime(), nullable=True))
+
+    backfill()
+
+    with op.batch_alter_table('team_lead_activations') as batch_op:
+        batch_op.alter_column('valid_from', existing_type=sa.DateTime(), nullable=False)
+        batch_op.alter_column('valid_until', existing_type=sa.DateTime(), nullable=False)
+        if 'ix_team_lead_activations_window' not in indexes:
+            batch_op.create_index('ix_team_lead_activations_window', ['valid_until', 'team_lead_id', 'valid_from'])
+
+
+def downgrade():
+    with op.batch_alter_table('team_lead_activations') as batch_op:
+        batch_op.drop_index('ix_team_lead_activations_window')
+        batch_op.drop_column('valid_until')
+        batch_op.drop_column('valid_from')
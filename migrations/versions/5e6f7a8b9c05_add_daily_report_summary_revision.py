@@ -0,0 +1,29 @@
+"""add revision counter to daily_report_summary
+
+Revision ID: 5e6f7a8b9c05
+Revises: 4d5e6f7a8b04
+Create Date: 2026-10-18 13:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '5e6f7a8b9c05'
+down_revision = '4d5e6f7a8b04'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    columns = {column['name'] for column in sa.inspect(op.get_bind()).get_columns('daily_report_summary')}
+
+    if 'revision' not in columns:
+        with op.batch_alter_table('daily_report_summary') as batch_op:
+            batch_op.add_column(sa.Column('revision', sa.Integer(), nullable=False, server_default='0'))
+
+
+def downgrade():
+    with op.batch_alter_table('daily_report_summary') as batch_op:
+        batch_op.drop_column('revision')
@@ -0,0 +1,41 @@
+"""index reports by updated_at and add report_tombstones for the change feed
+
+Revision ID: 6f7a8b9c0d06
+Revises: 5e6f7a8b9c05
+Create Date: 2026-10-18 14:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '6f7a8b9c0d06'
+down_revision = '5e6f7a8b9c05'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    inspector = sa.inspect(op.get_bind())
+
+    # Rows from before updated_at had a default would never enter the feed
+    op.execute("UPDATE reports SET updated_at = COALESCE(created_at, CURRENT_TIMESTAMP) WHERE updated_at IS NULL")
+
+    if 'ix_reports_updated_at_id' not in {index['name'] for index in inspector.get_indexes('reports')}:
+        op.create_index('ix_reports_updated_at_id', 'reports', ['updated_at', 'id'])
+
+    if 'report_tombstones' not in inspector.get_table_names():
+        op.create_table(
+            'report_tombstones',
+            sa.Column('id', sa.Integer(), primary_key=True),
+            sa.Column('report_id', sa.Integer(), nullable=False),
+            sa.Column('deleted_at', sa.DateTime(), nullable=False),
+        )
+        op.create_index('ix_report_tombstones_deleted_at_id', 'report_tombstones', ['deleted_at', 'id'])
+
+
+def downgrade():
+    op.drop_index('ix_report_tombstones_deleted_at_id', table_name='report_tombstones')
+    op.drop_table('report_tombstones')
+    op.drop_index('ix_reports_updated_at_id', table_name='reports')
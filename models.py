@@ -1,6 +1,8 @@
 # models.py
 from datetime import datetime
 from flask_login import UserMixin
+from sqlalchemy import event
+from sqlalchemy.orm import joinedload
 from extensions import db
 
 class User(UserMixin, db.Model):
@@ -42,6 +44,17 @@ class Flight(db.Model):
 
 class Report(db.Model):
     __tablename__ = 'reports'
+    __table_args__ = (
+        # Dashboards and APIs filter on verified/submitter and sort by (date, id)
+        db.Index('ix_reports_verified_date_id', 'verified', 'date', 'id'),
+        db.Index('ix_reports_submitted_by_id_date_id', 'submitted_by_id', 'date', 'id'),
+        db.Index('ix_reports_date_id', 'date', 'id'),
+        db.Index('ix_reports_supervisor_id_date_id', 'supervisor_id', 'date', 'id'),
+        db.Index('ix_reports_flight_id_date_id', 'flight_id', 'date', 'id'),
+        # Change feed keyset (utils.changes)
+        db.Index('ix_reports_updated_at_id', 'updated_at', 'id'),
+        db.Index('uq_reports_ref_no_date_flight_name_zone', 'ref_no', 'date', 'flight_name', 'zone', unique=True),
+    )
     
     id = db.Column(db.Integer, primary_key=True)
     date = db.Column(db.Date, nullable=False)
@@ -50,6 +63,10 @@ class Report(db.Model):
     flight_name = db.Column(db.String(100), nullable=False)
     zone = db.Column(db.String(20), nullable=False)  # arrival, departure
     
+    # Reference data; the names above are kept as submitted for display and export
+    supervisor_id = db.Column(db.Integer, db.ForeignKey('flight_supervisors.id', ondelete='SET NULL'))
+    flight_id = db.Column(db.Integer, db.ForeignKey('flights.id', ondelete='SET NULL'))
+    
     # Passenger counts
     paid = db.Column(db.Integer, default=0)
     diplomats = db.Column(db.Integer, default=0)
@@ -88,6 +105,11 @@ class Report(db.Model):
     def __repr__(self):
         return f'<Report {self.ref_no} - {self.date}>'
     
+    @classmethod
+    def query_with_users(cls):
+        """Report query that loads submitter and verifier in the same SELECT"""
+        return cls.query.options(joinedload(cls.submitter), joinedload(cls.verified_by))
+    
     def calculate_total(self):
         """Calculate total attended passengers"""
         return (
@@ -104,7 +126,9 @@ class Report(db.Model):
             'date': self.date.strftime('%Y-%m-%d'),
             'refNo': self.ref_no,
             'supervisor': self.supervisor,
+            'supervisorId': self.supervisor_id,
             'flightName': self.flight_name,
+            'flightId': self.flight_id,
             'zone': self.zone,
             'paid': self.paid,
             'diplomats': self.diplomats,
@@ -131,12 +155,40 @@ class Report(db.Model):
             'verifiedBy': self.verified_by.username if self.verified_by else None
         }
 
+class ReportTombstone(db.Model):
+    """Deleted report ids, so the change feed can report deletions"""
+    __tablename__ = 'report_tombstones'
+    __table_args__ = (
+        db.Index('ix_report_tombstones_deleted_at_id', 'deleted_at', 'id'),
+    )
+    
+    id = db.Column(db.Integer, primary_key=True)
+    report_id = db.Column(db.Integer, nullable=False)
+    deleted_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+    
+    def __repr__(self):
+        return f'<ReportTombstone {self.report_id}>'
+
+@event.listens_for(Report, 'after_delete')
+def record_report_tombstone(mapper, connection, target):
+    # Runs for session deletes only; bulk Query.delete() bypasses mapper events
+    connection.execute(ReportTombstone.__table__.insert().values(report_id=target.id, deleted_at=datetime.utcnow()))
+
 class TeamLeadActivation(db.Model):
     __tablename__ = 'team_lead_activations'
+    __table_args__ = (
+        db.Index('ix_team_lead_activations_team_lead_id_id', 'team_lead_id', 'id'),
+        # Covers the current-window lookup in utils.activation; expired
+        # history sorts before the range and is never read
+        db.Index('ix_team_lead_activations_window', 'valid_until', 'team_lead_id', 'valid_from'),
+    )
     
     id = db.Column(db.Integer, primary_key=True)
     team_lead_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
     date = db.Column(db.Date, nullable=False)
+    # Updates are allowed from valid_from until (excluding) valid_until, in server local time
+    valid_from = db.Column(db.DateTime, nullable=False)
+    valid_until = db.Column(db.DateTime, nullable=False)
     activated_by_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     
@@ -145,4 +197,41 @@ class TeamLeadActivation(db.Model):
     activated_by = db.relationship('User', foreign_keys=[activated_by_id])
     
     def __repr__(self):
-        return f'<TeamLeadActivation {self.team_lead.username} - {self.date}>'
\ No newline at end of file
+        return f'<TeamLeadActivation {self.team_lead.username} - {self.date}>'
+
+# Per-day rollup of reports, maintained incrementally by utils.summary
+class DailyReportSummary(db.Model):
+    __tablename__ = 'daily_report_summary'
+    __table_args__ = (
+        db.Index('uq_daily_report_summary_key', 'date', 'flight_name', 'supervisor', 'zone', unique=True),
+    )
+    
+    id = db.Column(db.Integer, primary_key=True)
+    date = db.Column(db.Date, nullable=False)
+    flight_name = db.Column(db.String(100), nullable=False)
+    supervisor = db.Column(db.String(100), nullable=False)
+    zone = db.Column(db.String(20), nullable=False)
+    
+    # Totals over all submitted reports
+    report_count = db.Column(db.Integer, nullable=False, default=0)
+    paid = db.Column(db.Integer, nullable=False, default=0)
+    not_paid = db.Column(db.Integer, nullable=False, default=0)
+    refunds = db.Column(db.Integer, nullable=False, default=0)
+    total_attended = db.Column(db.Integer, nullable=False, default=0)
+    
+    # Totals over verified reports only
+    verified_count = db.Column(db.Integer, nullable=False, default=0)
+    verified_total_attended = db.Column(db.Integer, nullable=False, default=0)
+    iics_total = db.Column(db.Integer, nullable=False, default=0)
+    gia_total = db.Column(db.Integer, nullable=False, default=0)
+    iics_difference = db.Column(db.Integer, nullable=False, default=0)  # IICS - Total Attended
+    gia_difference = db.Column(db.Integer, nullable=False, default=0)   # GIA - Total Attended
+    
+    # Incremented on every change to a report in this row, including text
+    # fields; utils.export_cache derives export data versions from it
+    revision = db.Column(db.Integer, nullable=False, default=0, server_default='0')
+    
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    
+    def __repr__(self):
+        return f'<DailyReportSummary {self.date} {self.flight_name} {self.zone}>'
@@ -5,5 +5,6 @@ from .team_lead import team_lead_bp
 from .data_analyst import data_analyst_bp
 from .cash_controller import cash_controller_bp
 from .common import common_bp
+from .metrics import metrics_bp
 
-__all__ = ['auth_bp', 'admin_bp', 'team_lead_bp', 'data_analyst_bp', 'cash_controller_bp', 'common_bp']
\ No newline at end of file
+__all__ = ['auth_bp', 'admin_bp', 'team_lead_bp', 'data_analyst_bp', 'cash_controller_bp', 'common_bp', 'metrics_bp']
\ No newline at end of file
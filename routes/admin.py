@@ -1,14 +1,19 @@
 # routes/admin.py
-from flask import Blueprint, render_template, redirect, url_for, request, flash, jsonify, current_app
+import logging
+
+from flask import Blueprint, render_template, redirect, url_for, request, flash
 from flask_login import login_required, current_user
-from werkzeug.security import generate_password_hash
 from models import User, Flight, FlightSupervisor
 from forms import RegisterForm, FlightSupervisorForm
 from extensions import db
+from utils import reference_data, user_cache
+from utils.passwords import hash_password
+from utils.reference_data import conditional_json
 
 
 
 admin_bp = Blueprint('admin', __name__)
+logger = logging.getLogger(__name__)
 
 def admin_required(f):
     @login_required
@@ -52,7 +57,9 @@ def manage_users():
 def activate_user(user_id):
     user = User.query.get_or_404(user_id)
     user.active = True
-    current_app.db.session.commit()
+    db.session.commit()
+    user_cache.invalidate(user.id)
+    logger.info('User %s activated by %s', user.username, current_user.username)
     flash(f'User {user.username} has been activated.', 'success')
     return redirect(url_for('admin.manage_users'))
 
@@ -64,7 +71,9 @@ def deactivate_user(user_id):
         flash('Cannot deactivate admin user.', 'danger')
     else:
         user.active = False
-        current_app.db.session.commit()
+        db.session.commit()
+        user_cache.invalidate(user.id)
+        logger.info('User %s deactivated by %s', user.username, current_user.username)
         flash(f'User {user.username} has been deactivated.', 'success')
     return redirect(url_for('admin.manage_users'))
 
@@ -75,8 +84,10 @@ def delete_user(user_id):
     if user.username == 'admin':
         flash('Cannot delete admin user.', 'danger')
     else:
-        current_app.db.session.delete(user)
-        current_app.db.session.commit()
+        db.session.delete(user)
+        db.session.commit()
+        user_cache.invalidate(user_id)
+        logger.info('User %s deleted by %s', user.username, current_user.username)
         flash(f'User {user.username} has been deleted.', 'success')
     return redirect(url_for('admin.manage_users'))
 
@@ -89,8 +100,9 @@ def reset_password(user_id):
     if not new_password:
         flash('Password is required.', 'danger')
     else:
-        user.password_hash = generate_password_hash(new_password)
-        current_app.db.session.commit()
+        user.password_hash = hash_password(new_password)
+        db.session.commit()
+        user_cache.invalidate(user.id)
         flash(f'Password for {user.username} has been reset.', 'success')
     
     return redirect(url_for('admin.manage_users'))
@@ -123,6 +135,7 @@ def add_flight():
             flight = Flight(name=flight_name)
             db.session.add(flight)
             db.session.commit()
+            reference_data.invalidate()
             flash(f'Flight "{flight_name}" has been added.', 'success')
     
     return redirect(url_for('admin.manage_flights_supervisors'))
@@ -133,6 +146,7 @@ def delete_flight(flight_id):
     flight = Flight.query.get_or_404(flight_id)
     db.session.delete(flight)
     db.session.commit()
+    reference_data.invalidate()
     flash(f'Flight "{flight.name}" has been deleted.', 'success')
     return redirect(url_for('admin.manage_flights_supervisors'))
 
@@ -151,6 +165,7 @@ def add_supervisor():
             supervisor = FlightSupervisor(name=supervisor_name)
             db.session.add(supervisor)
             db.session.commit()
+            reference_data.invalidate()
             flash(f'Supervisor "{supervisor_name}" has been added.', 'success')
     
     return redirect(url_for('admin.manage_flights_supervisors'))
@@ -161,17 +176,16 @@ def delete_supervisor(supervisor_id):
     supervisor = FlightSupervisor.query.get_or_404(supervisor_id)
     db.session.delete(supervisor)
     db.session.commit()
+    reference_data.invalidate()
     flash(f'Supervisor "{supervisor.name}" has been deleted.', 'success')
     return redirect(url_for('admin.manage_flights_supervisors'))
 
 @admin_bp.route('/api/flights')
 @admin_required
 def get_flights():
-    flights = Flight.query.all()
-    return jsonify([flight.name for flight in flights])
+    return conditional_json(reference_data.get_reference_data().flight_names)
 
 @admin_bp.route('/api/supervisors')
 @admin_required
 def get_supervisors():
-    supervisors = FlightSupervisor.query.all()
-    return jsonify([supervisor.name for supervisor in supervisors])
\ No newline at end of file
+    return conditional_json(reference_data.get_reference_data().supervisor_names)
\ No newline at end of file
@@ -1,12 +1,16 @@
 # routes/auth.py
+import logging
+
 from flask import Blueprint, render_template, redirect, url_for, request, flash
 from flask_login import login_user, logout_user, login_required, current_user
-from werkzeug.security import check_password_hash, generate_password_hash
 from forms import LoginForm, RegisterForm
 from models import User
 from extensions import db
+from utils import user_cache
+from utils.passwords import hash_password, needs_rehash, verify_password
 
 auth_bp = Blueprint('auth', __name__)
+logger = logging.getLogger(__name__)
 
 @auth_bp.route('/')
 def index():
@@ -23,11 +27,18 @@ def login():
     if form.validate_on_submit():
         user = User.query.filter_by(username=form.username.data).first()
 
-        if user and check_password_hash(user.password_hash, form.password.data) and user.active:
+        if user and verify_password(user.password_hash, form.password.data) and user.active:
+            # Upgrade hashes made under an older method or cost
+            if needs_rehash(user.password_hash):
+                user.password_hash = hash_password(form.password.data)
+                db.session.commit()
+                user_cache.invalidate(user.id)
             login_user(user)
+            logger.info('User %s logged in', user.username, extra={'user_id': user.id})
             next_page = request.args.get('next')
             return redirect(next_page or url_for('admin.dashboard'))
         else:
+            logger.warning('Failed login for %s', form.username.data)
             flash('Invalid credentials or user is deactivated. Please try again or contact Admin.', 'danger')
 
     return render_template('login.html', form=form)
@@ -54,7 +65,7 @@ def register():
 
         user = User(
             username=form.username.data,
-            password_hash=generate_password_hash(form.password.data),
+            password_hash=hash_password(form.password.data),
             email=form.email.data,
             role=form.role.data,
             gender=form.gender.data,
@@ -1,9 +1,16 @@
 # routes/cash_controller.py
-from flask import Blueprint, render_template, redirect, url_for, request, jsonify, current_app
+from flask import Blueprint, render_template, redirect, url_for, request, jsonify, current_app, send_file
 from flask_login import login_required, current_user
+from werkzeug.datastructures import MultiDict
+from extensions import db
 from models import Report
-from utils.export import export_to_csv
-from io import StringIO
+from utils.aggregate import aggregate_query, parse_group_by, serialize_group
+from utils.export import COLUMNAR_FORMATS, EXPORT_FORMATS, columnar_available
+from utils import export_cache, export_jobs
+from utils.changes import changes_response
+from utils.filters import apply_report_filters, normalize_filters
+from utils.pagination import paginate_reports, paginated_reports_response
+from utils.summary import verified_totals
 
 cash_controller_bp = Blueprint('cash_controller', __name__)
 
@@ -19,66 +26,124 @@ def cash_controller_required(f):
 @cash_controller_bp.route('/dashboard')
 @cash_controller_required
 def dashboard():
-    reports = Report.query.filter_by(verified=True).order_by(Report.date.desc()).all()
-    return render_template('cash_controller/dashboard.html', reports=reports)
+    # First page only; DataTable.js loads the rest on scroll and filters on the server
+    reports, next_cursor = paginate_reports(Report.query_with_users().filter_by(verified=True))
+    return render_template('cash_controller/dashboard.html', reports=reports, next_cursor=next_cursor,
+                           totals=verified_totals())
+
+def export_query():
+    """Verified reports matching the request filters, or None when there are none"""
+    query = apply_report_filters(Report.query_with_users().filter_by(verified=True), request.args)
+    
+    # Check for matching rows up front; the export itself is streamed
+    if not db.session.query(query.exists()).scalar():
+        return None
+    
+    return query.order_by(Report.date.desc())
 
 @cash_controller_bp.route('/download-csv')
 @cash_controller_required
 def download_csv():
-    # Get filter parameters
-    supervisor = request.args.get('supervisor', '')
-    flight = request.args.get('flight', '')
-    start_date = request.args.get('start_date', '')
-    end_date = request.args.get('end_date', '')
-    
-    # Build query with filters
-    query = Report.query.filter_by(verified=True)
-    
-    if supervisor:
-        query = query.filter(Report.supervisor.like(f'%{supervisor}%'))
+    response = export_cache.export_response(normalize_filters(request.args), 'csv', export_query)
+    if response is None:
+        return "No data to export", 404
     
-    if flight:
-        query = query.filter(Report.flight_name.like(f'%{flight}%'))
+    return response
+
+@cash_controller_bp.route('/download/<fmt>')
+@cash_controller_required
+def download_columnar(fmt):
+    if fmt not in COLUMNAR_FORMATS:
+        return f"Unsupported export format: {fmt}", 404
+    if not columnar_available():
+        return "Parquet and Arrow exports require the pyarrow package on the server", 501
     
-    if start_date:
-        query = query.filter(Report.date >= start_date)
+    response = export_cache.export_response(normalize_filters(request.args), fmt, export_query)
+    if response is None:
+        return "No data to export", 404
     
-    if end_date:
-        query = query.filter(Report.date <= end_date)
+    return response
+
+def export_job_response(job, status=200):
+    payload = dict(job)
+    payload['statusUrl'] = url_for('cash_controller.export_status', job_id=job['id'])
+    if job['status'] == 'done':
+        payload['downloadUrl'] = url_for('cash_controller.export_download', job_id=job['id'])
+    response = jsonify(payload)
+    response.status_code = status
+    return response
+
+@cash_controller_bp.route('/exports', methods=['POST'])
+@cash_controller_required
+def create_export():
+    if request.is_json:
+        body = request.get_json(silent=True)
+        if not isinstance(body, dict):
+            return jsonify({'error': 'Request body must be a JSON object'}), 400
+        # Filters are read like query arguments, so JSON numbers become strings
+        args = MultiDict({key: str(value) for key, value in body.items() if value is not None})
+    else:
+        args = request.values
+    fmt = args.get('format', 'csv')
+    if fmt not in EXPORT_FORMATS:
+        return jsonify({'error': f'Unsupported export format: {fmt}'}), 400
+    if fmt != 'csv' and not columnar_available():
+        return jsonify({'error': 'Parquet and Arrow exports require the pyarrow package on the server'}), 501
     
-    reports = query.order_by(Report.date.desc()).all()
+    job = export_jobs.submit_export(args, fmt)
+    response = export_job_response(job, 202)
+    response.headers['Location'] = response.json['statusUrl']
+    return response
+
+@cash_controller_bp.route('/exports/<job_id>')
+@cash_controller_required
+def export_status(job_id):
+    job = export_jobs.get_job(job_id)
+    if job is None:
+        return jsonify({'error': 'Export not found or expired'}), 404
     
-    # Export reports to CSV
-    if not reports:
-        return "No data to export", 404
+    return export_job_response(job)
+
+@cash_controller_bp.route('/exports/<job_id>/download')
+@cash_controller_required
+def export_download(job_id):
+    job = export_jobs.get_job(job_id)
+    if job is None:
+        return jsonify({'error': 'Export not found or expired'}), 404
+    if job['status'] != 'done':
+        return jsonify({'error': 'Export is not ready', 'status': job['status']}), 409
     
-    csv_data = export_to_csv(reports)
-    return csv_data
+    mimetype, extension = EXPORT_FORMATS[job['format']]
+    return send_file(
+        export_jobs.artifact_path(job),
+        as_attachment=True,
+        download_name=f'cash-collection-report.{extension}'
+    )
 
 @cash_controller_bp.route('/api/reports')
 @cash_controller_required
 def get_reports():
-    # Get filter parameters
-    supervisor = request.args.get('supervisor', '')
-    flight = request.args.get('flight', '')
-    start_date = request.args.get('start_date', '')
-    end_date = request.args.get('end_date', '')
-    
-    # Build query with filters
-    query = Report.query.filter_by(verified=True)
-    
-    if supervisor:
-        query = query.filter(Report.supervisor.like(f'%{supervisor}%'))
+    query = apply_report_filters(Report.query_with_users().filter_by(verified=True), request.args)
     
-    if flight:
-        query = query.filter(Report.flight_name.like(f'%{flight}%'))
-    
-    if start_date:
-        query = query.filter(Report.date >= start_date)
-    
-    if end_date:
-        query = query.filter(Report.date <= end_date)
+    return paginated_reports_response(query)
+
+@cash_controller_bp.route('/api/reports/changes')
+@cash_controller_required
+def report_changes():
+    # Covers every report, so reconciliation also sees reports that lose verification
+    return changes_response()
+
+@cash_controller_bp.route('/api/reports/aggregate')
+@cash_controller_required
+def aggregate_reports():
+    try:
+        group_by = parse_group_by(request.args.get('group_by', ''))
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
     
-    reports = query.order_by(Report.date.desc()).all()
+    query = apply_report_filters(aggregate_query(group_by).filter(Report.verified == True), request.args)
     
-    return jsonify([report.to_dict() for report in reports])
\ No newline at end of file
+    return jsonify({
+        'groupBy': group_by,
+        'groups': [serialize_group(row) for row in query]
+    })
\ No newline at end of file
@@ -1,7 +1,7 @@
 # routes/common.py
-from flask import Blueprint, jsonify, redirect, url_for, current_app
+from flask import Blueprint, redirect, url_for, current_app
 from flask_login import login_required, current_user
-from models import Flight, FlightSupervisor
+from utils.reference_data import get_reference_data, conditional_json
 
 common_bp = Blueprint('common', __name__)
 
@@ -21,10 +21,9 @@ def index():
 @common_bp.route('/api/flights-supervisors')
 @login_required
 def get_flights_supervisors():
-    flights = Flight.query.all()
-    supervisors = FlightSupervisor.query.all()
+    reference_data = get_reference_data()
     
-    return jsonify({
-        'flights': [flight.name for flight in flights],
-        'supervisors': [supervisor.name for supervisor in supervisors]
+    return conditional_json({
+        'flights': reference_data.flight_names,
+        'supervisors': reference_data.supervisor_names
     })
\ No newline at end of file
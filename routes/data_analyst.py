@@ -1,11 +1,20 @@
 # routes/data_analyst.py
-from flask import Blueprint, render_template, redirect, url_for, request, flash, jsonify, current_app
+import logging
+
+from flask import Blueprint, render_template, redirect, url_for, request, flash
 from flask_login import login_required, current_user
 from datetime import datetime
+from sqlalchemy.orm import joinedload
+from extensions import db
 from models import Report, User, TeamLeadActivation
 from forms import VerificationForm, TeamLeadActivationForm
+from utils import activation
+from utils.filters import apply_report_filters
+from utils.pagination import paginate_reports, paginated_reports_response
+from utils.summary import record_report_change, snapshot
 
 data_analyst_bp = Blueprint('data_analyst', __name__)
+logger = logging.getLogger(__name__)
 
 def data_analyst_required(f):
     @login_required
@@ -26,14 +35,15 @@ def dashboard():
     activation_form = TeamLeadActivationForm()
     activation_form.team_lead.choices = [('', 'Select Team Lead')] + [(str(tl.id), tl.username) for tl in team_leads]
     
-    # Get reports for verification
-    reports = Report.query.order_by(Report.date.desc()).all()
+    # First page of the verification queue; DataTable.js loads the rest on scroll
+    reports, next_cursor = paginate_reports(Report.query_with_users().filter_by(verified=False))
     
     # Get recent activations
-    recent_activations = TeamLeadActivation.query.order_by(TeamLeadActivation.created_at.desc()).limit(5).all()
+    recent_activations = TeamLeadActivation.query.options(joinedload(TeamLeadActivation.team_lead)).order_by(TeamLeadActivation.created_at.desc()).limit(5).all()
     
     return render_template('data_analyst/dashboard.html', 
                           reports=reports, 
+                          next_cursor=next_cursor,
                           activation_form=activation_form,
                           recent_activations=recent_activations)
 
@@ -65,6 +75,7 @@ def verify_report(report_id):
         gia_total = gia_infant + gia_adult
         
         # Update report with verification data
+        before = snapshot(report)
         report.iics_infant = iics_infant
         report.iics_adult = iics_adult
         report.iics_total = iics_total
@@ -74,7 +85,9 @@ def verify_report(report_id):
         report.verified = True
         report.verified_by_id = current_user.id
         
-        current_app.db.session.commit()
+        record_report_change(before, report)
+        db.session.commit()
+        logger.info('Report %s verified', report.id, extra={'user_id': current_user.id})
         
         flash('Report has been verified successfully.', 'success')
         return redirect(url_for('data_analyst.dashboard'))
@@ -95,14 +108,9 @@ def activate_team_lead():
         date = form.date.data
         
         # Create activation record
-        activation = TeamLeadActivation(
-            team_lead_id=team_lead_id,
-            date=date,
-            activated_by_id=current_user.id
-        )
-        
-        current_app.db.session.add(activation)
-        current_app.db.session.commit()
+        activation.create_activation(team_lead_id, date, current_user.id)
+        db.session.commit()
+        activation.invalidate()
         
         team_lead = User.query.get(team_lead_id)
         flash(f'Update activated for {team_lead.username} on {date.strftime("%Y-%m-%d")}.', 'success')
@@ -116,11 +124,11 @@ def activate_team_lead():
 @data_analyst_bp.route('/api/reports')
 @data_analyst_required
 def get_reports():
-    reports = Report.query.order_by(Report.date.desc()).all()
-    return jsonify([report.to_dict() for report in reports])
+    return paginated_reports_response(Report.query_with_users())
 
 @data_analyst_bp.route('/api/reports/unverified')
 @data_analyst_required
 def get_unverified_reports():
-    reports = Report.query.filter_by(verified=False).order_by(Report.date.desc()).all()
-    return jsonify([report.to_dict() for report in reports])
\ No newline at end of file
+    query = apply_report_filters(Report.query_with_users().filter_by(verified=False), request.args)
+    
+    return paginated_reports_response(query)
\ No newline at end of file
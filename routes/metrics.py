@@ -0,0 +1,35 @@
+# routes/metrics.py
+import hmac
+from functools import wraps
+
+from flask import Blueprint, Response, jsonify, request, current_app, abort
+from flask_login import current_user
+from extensions import db
+from utils.pool_metrics import pool_status
+from utils.request_metrics import prometheus_text
+
+metrics_bp = Blueprint('metrics', __name__)
+
+def metrics_access_required(f):
+    """Allow scrapers with the METRICS_TOKEN bearer token, or a logged-in admin"""
+    @wraps(f)
+    def decorated_function(*args, **kwargs):
+        token = current_app.config.get('METRICS_TOKEN')
+        if token:
+            supplied = request.headers.get('Authorization', '').removeprefix('Bearer ')
+            if not hmac.compare_digest(supplied, token):
+                abort(401)
+        elif not (current_user.is_authenticated and current_user.role == 'admin'):
+            abort(403)
+        return f(*args, **kwargs)
+    return decorated_function
+
+@metrics_bp.route('/metrics/pool')
+@metrics_access_required
+def pool():
+    return jsonify(pool_status(db.engine))
+
+@metrics_bp.route('/metrics')
+@metrics_access_required
+def prometheus():
+    return Response(prometheus_text(pool_status(db.engine)), mimetype='text/plain; version=0.0.4')
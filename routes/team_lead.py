@@ -1,12 +1,20 @@
 # routes/team_lead.py
-from flask import Blueprint, render_template, redirect, url_for, request, flash, jsonify
+import logging
+
+from flask import Blueprint, render_template, redirect, url_for, request, flash, jsonify, current_app
 from flask_login import login_required, current_user
-from datetime import datetime
+from sqlalchemy.exc import IntegrityError
 from extensions import db
-from models import Report, Flight, FlightSupervisor, TeamLeadActivation
-from forms import ReportForm
+from models import Report
+from forms import ReportForm, ReportBatchForm
+from utils.activation import active_window
+from utils.batch import BatchError, rows_from_csv, rows_from_json, validate_rows, insert_reports
+from utils.pagination import paginated_reports_response
+from utils.reference_data import get_reference_data
+from utils.summary import record_new_reports, record_report_change, snapshot
 
 team_lead_bp = Blueprint('team_lead', __name__)
+logger = logging.getLogger(__name__)
 
 def team_lead_required(f):
     @login_required
@@ -22,30 +30,24 @@ def team_lead_required(f):
 @team_lead_required
 def dashboard():
     # Get flights and supervisors for form
-    flights = Flight.query.all()
-    supervisors = FlightSupervisor.query.all()
+    reference_data = get_reference_data()
 
     # Create a new form with dynamic choices
     form = ReportForm()
-    form.flight.choices = [('', 'Select Flight')] + [(flight.name, flight.name) for flight in flights]
-    form.supervisor.choices = [('', 'Select Supervisor')] + [(supervisor.name, supervisor.name) for supervisor in supervisors]
+    form.flight.choices = reference_data.flight_choices()
+    form.supervisor.choices = reference_data.supervisor_choices()
 
     # Check if team lead has update activation
-    is_update_activated = False
-    activation = TeamLeadActivation.query.filter_by(team_lead_id=current_user.id).order_by(TeamLeadActivation.id.desc()).first()
-    activated_date = None
-
-    if activation:
-        today = datetime.now().date()
-        if activation.date == today:
-            is_update_activated = True
-            activated_date = activation.date
+    window = active_window(current_user.id)
+    is_update_activated = window is not None
+    activated_date = window[0].date() if window else None
 
     # Get reports submitted by this team lead
     reports = Report.query.filter_by(submitted_by_id=current_user.id).order_by(Report.date.desc()).all()
 
     return render_template('team_lead/dashboard.html', 
                           form=form, 
+                          batch_form=ReportBatchForm(), 
                           reports=reports, 
                           is_update_activated=is_update_activated,
                           activated_date=activated_date)
@@ -53,12 +55,11 @@ def dashboard():
 @team_lead_bp.route('/reports/submit', methods=['POST'])
 @team_lead_required
 def submit_report():
-    flights = Flight.query.all()
-    supervisors = FlightSupervisor.query.all()
+    reference_data = get_reference_data()
 
     form = ReportForm()
-    form.flight.choices = [('', 'Select Flight')] + [(flight.name, flight.name) for flight in flights]
-    form.supervisor.choices = [('', 'Select Supervisor')] + [(supervisor.name, supervisor.name) for supervisor in supervisors]
+    form.flight.choices = reference_data.flight_choices()
+    form.supervisor.choices = reference_data.supervisor_choices()
 
     if form.validate_on_submit():
         # Calculate total attended
@@ -73,7 +74,9 @@ def submit_report():
             date=form.date.data,
             ref_no=form.ref_no.data,
             supervisor=form.supervisor.data,
+            supervisor_id=reference_data.supervisor_ids.get(form.supervisor.data),
             flight_name=form.flight.data,
+            flight_id=reference_data.flight_ids.get(form.flight.data),
             zone=form.zone.data,
             paid=form.paid.data,
             diplomats=form.diplomats.data,
@@ -93,8 +96,17 @@ def submit_report():
         )
 
         db.session.add(report)
-        db.session.commit()
+        try:
+            # The summary lookup autoflushes the report, so a duplicate surfaces here
+            db.session.flush()
+            record_new_reports([report])
+            db.session.commit()
+        except IntegrityError:
+            db.session.rollback()
+            flash('A report with this reference number already exists for this date, flight and zone.', 'danger')
+            return redirect(url_for('team_lead.dashboard'))
 
+        logger.info('Report %s submitted', report.id, extra={'user_id': current_user.id})
         flash('Report submitted successfully.', 'success')
         return redirect(url_for('team_lead.dashboard'))
 
@@ -104,6 +116,68 @@ def submit_report():
 
     return redirect(url_for('team_lead.dashboard'))
 
+@team_lead_bp.route('/reports/batch', methods=['POST'])
+@team_lead_required
+def submit_report_batch():
+    # JSON clients get JSON back; the dashboard upload form gets flashes
+    is_json = request.is_json
+
+    try:
+        if is_json:
+            rows = rows_from_json(request.get_json(silent=True))
+        else:
+            batch_form = ReportBatchForm()
+            if not batch_form.validate_on_submit():
+                for field, errors in batch_form.errors.items():
+                    for error in errors:
+                        flash(f'{getattr(batch_form, field).label.text}: {error}', 'danger')
+                return redirect(url_for('team_lead.dashboard'))
+            rows = rows_from_csv(batch_form.file.data)
+    except BatchError as e:
+        if is_json:
+            return jsonify({'error': str(e)}), 400
+        flash(str(e), 'danger')
+        return redirect(url_for('team_lead.dashboard'))
+
+    max_rows = current_app.config['REPORT_BATCH_MAX_ROWS']
+    if not rows or len(rows) > max_rows:
+        message = f'A batch must contain between 1 and {max_rows} reports.'
+        if is_json:
+            return jsonify({'error': message}), 400
+        flash(message, 'danger')
+        return redirect(url_for('team_lead.dashboard'))
+
+    reports, errors = validate_rows(rows, get_reference_data(), current_user.id)
+    if not errors:
+        try:
+            insert_reports(reports)
+        except IntegrityError:
+            db.session.rollback()
+            # A concurrent submission stored one of these keys after validation;
+            # validating again names the rows that now clash
+            reports, errors = validate_rows(rows, get_reference_data(), current_user.id)
+            if not errors:
+                message = 'No reports were submitted because another submission conflicted with this batch. Upload it again.'
+                if is_json:
+                    return jsonify({'created': 0, 'errors': [], 'error': message}), 400
+                flash(message, 'danger')
+                return redirect(url_for('team_lead.dashboard'))
+
+    # The batch is all-or-nothing so a shift is never half submitted
+    if errors:
+        if is_json:
+            return jsonify({'created': 0, 'errors': errors}), 400
+        for error in errors:
+            messages = '; '.join(f'{field}: {", ".join(msgs)}' for field, msgs in error['errors'].items())
+            flash(f"Row {error['row']}: {messages}", 'danger')
+        flash('No reports were submitted. Fix the rows above and upload the file again.', 'danger')
+        return redirect(url_for('team_lead.dashboard'))
+
+    if is_json:
+        return jsonify({'created': len(reports), 'errors': []}), 201
+    flash(f'{len(reports)} reports submitted successfully.', 'success')
+    return redirect(url_for('team_lead.dashboard'))
+
 @team_lead_bp.route('/reports/<int:report_id>/update', methods=['POST'])
 @team_lead_required
 def update_report(report_id):
@@ -115,15 +189,7 @@ def update_report(report_id):
         return redirect(url_for('team_lead.dashboard'))
 
     # Check if the team lead is activated for updates
-    activation = TeamLeadActivation.query.filter_by(team_lead_id=current_user.id).order_by(TeamLeadActivation.id.desc()).first()
-    is_activated = False
-
-    if activation:
-        today = datetime.now().date()
-        if activation.date == today:
-            is_activated = True
-
-    if not is_activated:
+    if active_window(current_user.id) is None:
         flash('You do not have permission to update reports. Contact a Data Analyst for activation.', 'danger')
         return redirect(url_for('team_lead.dashboard'))
 
@@ -149,6 +215,7 @@ def update_report(report_id):
     ) - refunds
 
     # Update report
+    before = snapshot(report)
     report.paid = paid
     report.diplomats = diplomats
     report.infants = infants
@@ -166,6 +233,7 @@ def update_report(report_id):
     report.verified = False  # Reset verification status
     report.verified_by_id = None
 
+    record_report_change(before, report)
     db.session.commit()
 
     flash('Report updated successfully. It will need to be verified again.', 'success')
@@ -174,5 +242,19 @@ def update_report(report_id):
 @team_lead_bp.route('/api/reports')
 @team_lead_required
 def get_reports():
-    reports = Report.query.filter_by(submitted_by_id=current_user.id).order_by(Report.date.desc()).all()
-    return jsonify([report.to_dict() for report in reports])
\ No newline at end of file
+    return paginated_reports_response(Report.query_with_users().filter_by(submitted_by_id=current_user.id))
+
+@team_lead_bp.route('/api/reports/<int:report_id>')
+@team_lead_required
+def get_report(report_id):
+    # Reports of other team leads are reported as missing
+    report = Report.query_with_users().filter_by(id=report_id, submitted_by_id=current_user.id).first()
+    if report is None:
+        return jsonify({'error': 'Report not found'}), 404
+    
+    # Hashed from the body: updated_at alone has second precision on MySQL,
+    # so two edits within a second would share an ETag
+    response = jsonify(report.to_dict())
+    response.add_etag()
+    response.headers['Cache-Control'] = 'private, no-cache'
+    return response.make_conditional(request)
@@ -8,6 +8,14 @@ class DataTable {
       canEdit: false,
       canVerify: false,
       canDownload: false,
+      // Virtual scrolling: set renderRow, and data-source on the table. Server
+      // rendered rows carry their report JSON in data-report.
+      readRow: row => JSON.parse(row.dataset.report),
+      renderRow: null,
+      overscan: 10,
+      // Milliseconds to wait after the last keystroke before querying the server
+      filterDelay: 300,
+      emptyMessage: 'No reports found',
       ...options
     };
     
@@ -17,6 +25,11 @@ class DataTable {
   init() {
     if (!this.table) return;
     
+    // Virtualize tables backed by a paginated API
+    if (this.table.dataset.source && this.options.renderRow) {
+      this.initVirtualRows();
+    }
+    
     // Initialize filters
     this.initFilters();
     
@@ -37,6 +50,41 @@ class DataTable {
     
     if (!supervisorFilter && !flightFilter && !startDateFilter && !endDateFilter) return;
     
+    const matches = (supervisor, flight, date) => {
+      const matchesSupervisor = !supervisorFilter?.value || 
+                               supervisor.toLowerCase().includes(supervisorFilter.value.toLowerCase());
+      const matchesFlight = !flightFilter?.value || 
+                           flight.toLowerCase().includes(flightFilter.value.toLowerCase());
+      
+      let matchesDate = true;
+      if (startDateFilter?.value && endDateFilter?.value) {
+        matchesDate = date >= startDateFilter.value && date <= endDateFilter.value;
+      } else if (startDateFilter?.value) {
+        matchesDate = date >= startDateFilter.value;
+      } else if (endDateFilter?.value) {
+        matchesDate = date <= endDateFilter.value;
+      }
+      
+      return matchesSupervisor && matchesFlight && matchesDate;
+    };
+    
+    // Virtual tables ask the server for the first filtered page instead
+    if (this.virtual) {
+      this.filterInputs = { supervisor: supervisorFilter, flight: flightFilter,
+                            start_date: startDateFilter, end_date: endDateFilter };
+      
+      let timer = null;
+      const debouncedReload = () => {
+        clearTimeout(timer);
+        timer = setTimeout(() => this.reload(), this.options.filterDelay);
+      };
+      
+      Object.values(this.filterInputs).forEach(input => {
+        if (input) input.addEventListener('input', debouncedReload);
+      });
+      return;
+    }
+    
     const filterFunction = () => {
       if (!this.tableBody) return;
       
@@ -47,23 +95,8 @@ class DataTable {
         const flight = row.getAttribute('data-flight') || row.cells[3]?.textContent || '';
         const date = row.getAttribute('data-date') || row.cells[0]?.textContent || '';
         
-        // Apply filters
-        const matchesSupervisor = !supervisorFilter?.value || 
-                                 supervisor.toLowerCase().includes(supervisorFilter.value.toLowerCase());
-        const matchesFlight = !flightFilter?.value || 
-                             flight.toLowerCase().includes(flightFilter.value.toLowerCase());
-        
-        let matchesDate = true;
-        if (startDateFilter?.value && endDateFilter?.value) {
-          matchesDate = date >= startDateFilter.value && date <= endDateFilter.value;
-        } else if (startDateFilter?.value) {
-          matchesDate = date >= startDateFilter.value;
-        } else if (endDateFilter?.value) {
-          matchesDate = date <= endDateFilter.value;
-        }
-        
         // Show/hide row
-        row.style.display = (matchesSupervisor && matchesFlight && matchesDate) ? '' : 'none';
+        row.style.display = matches(supervisor, flight, date) ? '' : 'none';
       });
     };
     
@@ -77,24 +110,138 @@ class DataTable {
   initActions() {
     if (!this.tableBody) return;
     
-    // Edit buttons
-    if (this.options.canEdit) {
-      this.tableBody.querySelectorAll('.update-report-btn').forEach(btn => {
-        btn.addEventListener('click', () => {
-          const reportId = btn.getAttribute('data-report-id');
-          this.openEditModal(reportId);
-        });
+    // Delegated so rows rendered later by virtual scrolling are covered too
+    this.tableBody.addEventListener('click', (event) => {
+      // Edit buttons
+      const editButton = this.options.canEdit && event.target.closest('.update-report-btn');
+      if (editButton) {
+        this.openEditModal(editButton.getAttribute('data-report-id'));
+        return;
+      }
+      
+      // Verify buttons
+      const verifyButton = this.options.canVerify && event.target.closest('.verify-report-btn');
+      if (verifyButton) {
+        window.location.href = `/data-analyst/reports/${verifyButton.getAttribute('data-report-id')}/verify`;
+      }
+    });
+  }
+
+  initVirtualRows() {
+    this.virtual = true;
+    this.source = this.table.dataset.source;
+    this.nextCursor = this.table.dataset.nextCursor || null;
+    this.rowHeight = Number(this.table.dataset.rowHeight) || 41;
+    this.columnCount = this.table.querySelectorAll('thead th').length;
+    this.scrollContainer = this.table.closest('[data-scroll-container]') || this.table.parentElement;
+    this.controller = null;
+    this.filterInputs = {};
+    
+    // The server renders the first page; keep it as data and render rows on demand
+    this.rows = Array.from(this.tableBody.querySelectorAll('tr[data-report]')).map(row => this.options.readRow(row));
+    
+    const scheduleRender = () => {
+      if (this.renderPending) return;
+      this.renderPending = true;
+      requestAnimationFrame(() => {
+        this.renderPending = false;
+        this.renderVisibleRows();
       });
+    };
+    this.scrollContainer.addEventListener('scroll', scheduleRender, { passive: true });
+    window.addEventListener('resize', scheduleRender);
+    
+    this.renderVisibleRows(true);
+  }
+
+  filterParams() {
+    const params = new URLSearchParams();
+    Object.entries(this.filterInputs).forEach(([name, input]) => {
+      if (input?.value) params.append(name, input.value.trim());
+    });
+    return params;
+  }
+
+  spacerRow(height) {
+    if (height <= 0) return '';
+    return `<tr aria-hidden="true"><td colspan="${this.columnCount}" style="height: ${height}px; padding: 0; border: 0;"></td></tr>`;
+  }
+
+  renderVisibleRows(force = false) {
+    const { scrollTop, clientHeight } = this.scrollContainer;
+    const { overscan } = this.options;
+    const start = Math.max(0, Math.floor(scrollTop / this.rowHeight) - overscan);
+    const end = Math.min(this.rows.length, Math.ceil((scrollTop + clientHeight) / this.rowHeight) + overscan);
+    
+    if (force || start !== this.renderedStart || end !== this.renderedEnd) {
+      this.renderedStart = start;
+      this.renderedEnd = end;
+      
+      // Only the visible window is in the DOM; spacer rows keep the scroll height
+      if (this.rows.length === 0 && !this.nextCursor) {
+        this.tableBody.innerHTML = `<tr><td colspan="${this.columnCount}" class="px-2 py-3 text-center text-gray-500">${escapeHtml(this.options.emptyMessage)}</td></tr>`;
+      } else {
+        this.tableBody.innerHTML =
+          this.spacerRow(start * this.rowHeight) +
+          this.rows.slice(start, end).map(report => this.options.renderRow(report, this.rowHeight)).join('') +
+          this.spacerRow((this.rows.length - end) * this.rowHeight);
+      }
     }
     
-    // Verify buttons
-    if (this.options.canVerify) {
-      this.tableBody.querySelectorAll('.verify-report-btn').forEach(btn => {
-        btn.addEventListener('click', () => {
-          const reportId = btn.getAttribute('data-report-id');
-          window.location.href = `/data-analyst/reports/${reportId}/verify`;
-        });
-      });
+    // Fetch the next page before the user reaches the end of the loaded rows
+    if (end >= this.rows.length - overscan) {
+      this.loadMore();
+    }
+  }
+
+  async fetchPage(cursor) {
+    // A newer filter or page request makes this one stale: cancel it
+    this.controller?.abort();
+    const controller = new AbortController();
+    this.controller = controller;
+    
+    const params = this.filterParams();
+    if (cursor) params.append('cursor', cursor);
+    
+    try {
+      const response = await fetch(`${this.source}?${params.toString()}`, { signal: controller.signal });
+      if (!response.ok) throw new Error('Failed to fetch reports');
+      return await response.json();
+    } finally {
+      if (this.controller === controller) this.controller = null;
+    }
+  }
+
+  async loadMore() {
+    // One request at a time; a filter change aborts the request in flight
+    if (this.controller || !this.nextCursor) return;
+    
+    try {
+      const { reports, next_cursor } = await this.fetchPage(this.nextCursor);
+      this.rows.push(...reports);
+      this.nextCursor = next_cursor;
+    } catch (error) {
+      if (error.name !== 'AbortError') {
+        console.error('Error loading reports:', error);
+        this.nextCursor = null;
+      }
+      return;
+    }
+    
+    this.renderVisibleRows(true);
+  }
+
+  async reload() {
+    try {
+      const { reports, next_cursor } = await this.fetchPage(null);
+      this.rows = reports;
+      this.nextCursor = next_cursor;
+      this.scrollContainer.scrollTop = 0;
+      this.renderVisibleRows(true);
+    } catch (error) {
+      if (error.name !== 'AbortError') {
+        console.error('Error filtering reports:', error);
+      }
     }
   }
 
@@ -115,22 +262,64 @@ class DataTable {
       if (startDateFilter) params.append('start_date', startDateFilter);
       if (endDateFilter) params.append('end_date', endDateFilter);
       
-      // Redirect to download endpoint
-      window.location.href = `/cash-controller/download-csv?${params.toString()}`;
+      const format = document.getElementById('downloadFormat')?.value || 'csv';
+      
+      // Tables with an export job endpoint build the file in the background
+      if (this.table.dataset.exportUrl) {
+        params.append('format', format);
+        this.runExportJob(downloadBtn, params);
+        return;
+      }
+      
+      // Redirect to download endpoint; Parquet and Arrow use the columnar export
+      const path = format === 'csv' ? '/cash-controller/download-csv' : `/cash-controller/download/${format}`;
+      window.location.href = `${path}?${params.toString()}`;
     });
   }
 
+  async runExportJob(button, params) {
+    if (button.disabled) return;
+    const label = button.innerHTML;
+    button.disabled = true;
+    
+    const showProgress = (job) => {
+      const percent = job.totalRows ? Math.floor(100 * job.rowsWritten / job.totalRows) : 0;
+      button.textContent = job.status === 'queued' ? 'Export queued...' : `Exporting... ${percent}%`;
+    };
+    
+    try {
+      let response = await fetch(this.table.dataset.exportUrl, { method: 'POST', body: params });
+      let job = await response.json();
+      if (!response.ok) throw new Error(job.error || 'Failed to start export');
+      
+      // Poll until the file is ready; the request never holds a worker for the whole export
+      while (job.status === 'queued' || job.status === 'running') {
+        showProgress(job);
+        await new Promise(resolve => setTimeout(resolve, 1000));
+        response = await fetch(job.statusUrl);
+        job = await response.json();
+        if (!response.ok) throw new Error(job.error || 'Failed to check export status');
+      }
+      
+      if (job.status !== 'done') throw new Error(job.error || 'Export failed');
+      window.location.href = job.downloadUrl;
+    } catch (error) {
+      console.error('Error exporting reports:', error);
+      alert(`Export failed: ${error.message}`);
+    } finally {
+      button.disabled = false;
+      button.innerHTML = label;
+    }
+  }
+
   async openEditModal(reportId) {
     try {
       // Fetch report data
-      const response = await fetch(`/team-lead/api/reports?id=${reportId}`);
+      const response = await fetch(`/team-lead/api/reports/${reportId}`);
+      if (response.status === 404) throw new Error('Report not found');
       if (!response.ok) throw new Error('Failed to fetch report data');
       
-      const data = await response.json();
-      
-      if (data.length === 0) throw new Error('Report not found');
-      
-      const report = data[0];
+      const report = await response.json();
       
       // Get modal elements
       const modal = document.getElementById('updateReportModal');
@@ -266,6 +455,60 @@ class DataTable {
   }
 }
 
+function escapeHtml(value) {
+  return String(value ?? '').replace(/[&<>"']/g, char => ({
+    '&': '&amp;', '<': '&lt;', '>': '&gt;', '"': '&quot;', "'": '&#39;'
+  })[char]);
+}
+
+// Data analyst verification queue
+function renderVerificationRow(report, rowHeight) {
+  const status = report.verified
+    ? '<span class="px-2 py-1 bg-green-100 text-green-800 rounded-full text-xs">Verified</span>'
+    : '<span class="px-2 py-1 bg-yellow-100 text-yellow-800 rounded-full text-xs">Pending</span>';
+  const action = report.verified ? '' : `
+        <a href="/data-analyst/reports/${report.id}/verify" class="text-blue-500 hover:text-blue-700">
+          <i class="fas fa-check-circle"></i> Verify
+        </a>`;
+  
+  return `
+    <tr class="hover:bg-gray-50 whitespace-nowrap" style="height: ${rowHeight}px;">
+      <td class="py-2 px-4 border-b">${escapeHtml(report.date)}</td>
+      <td class="py-2 px-4 border-b">${escapeHtml(report.refNo)}</td>
+      <td class="py-2 px-4 border-b">${escapeHtml(report.supervisor)}</td>
+      <td class="py-2 px-4 border-b">${escapeHtml(report.flightName)}</td>
+      <td class="py-2 px-4 border-b">${escapeHtml(report.zone)}</td>
+      <td class="py-2 px-4 border-b">${escapeHtml(report.totalAttended)}</td>
+      <td class="py-2 px-4 border-b">${status}</td>
+      <td class="py-2 px-4 border-b">${action}</td>
+    </tr>`;
+}
+
+// Cash controller verified reports
+function renderCashControllerRow(report, rowHeight) {
+  const cell = (value, extra = '') => `<td class="px-2 py-3 whitespace-nowrap ${extra}">${escapeHtml(value)}</td>`;
+  
+  return `
+    <tr class="hover:bg-gray-50" style="height: ${rowHeight}px;">
+      ${cell(report.date)}
+      ${cell(report.refNo)}
+      ${cell(report.supervisor)}
+      ${cell(report.flightName)}
+      ${cell(report.zone, 'capitalize')}
+      ${cell(report.paid)}
+      ${cell(report.diplomats)}
+      ${cell(report.infants)}
+      ${cell(report.notPaid)}
+      ${cell(report.paidCardQr)}
+      ${cell(report.refunds)}
+      ${cell(report.totalAttended, 'font-semibold')}
+      ${cell(report.iicsTotal)}
+      ${cell(report.giaTotal)}
+      ${cell(report.submittedBy)}
+      ${cell(report.verifiedBy)}
+    </tr>`;
+}
+
 // Initialize data tables when document is ready
 document.addEventListener('DOMContentLoaded', function() {
   // Team Lead reports table
@@ -281,14 +524,17 @@ document.addEventListener('DOMContentLoaded', function() {
     new DataTable('dataAnalystReportsTable', {
       showVerification: true,
       canVerify: true,
-      canDownload: true
+      canDownload: true,
+      renderRow: renderVerificationRow
     });
   }
   
   // Cash Controller reports table
   if (document.getElementById('cashControllerReportsTable')) {
     new DataTable('cashControllerReportsTable', {
-      canDownload: true
+      canDownload: true,
+      renderRow: renderCashControllerRow,
+      emptyMessage: 'No verified reports available'
     });
   }
 });
@@ -287,29 +287,25 @@ function initUpdateReportModal() {
             const modalBody = document.getElementById('updateReportModalBody');
             
             try {
-                const response = await fetch(`/team-lead/api/reports?id=${reportId}`);
+                const response = await fetch(`/team-lead/api/reports/${reportId}`);
                 if (!response.ok) throw new Error('Failed to fetch report data');
                 
-                const reports = await response.json();
+                const report = await response.json();
                 
-                if (reports.length > 0) {
-                    const report = reports[0];
-                    
-                    // Create update form in modal
-                    modalBody.innerHTML = createUpdateFormHTML(report, reportId);
-                    
-                    // Show modal
-                    const updateModal = new bootstrap.Modal(document.getElementById('updateReportModal'));
-                    updateModal.show();
-                    
-                    // Add event listeners for calculation
-                    document.querySelectorAll('#updateReportForm input[type="number"]').forEach(input => {
-                        input.addEventListener('input', calculateUpdateTotal);
-                    });
-                    
-                    // Calculate initial total
-                    calculateUpdateTotal();
-                }
+                // Create update form in modal
+                modalBody.innerHTML = createUpdateFormHTML(report, reportId);
+                
+                // Show modal
+                const updateModal = new bootstrap.Modal(document.getElementById('updateReportModal'));
+                updateModal.show();
+                
+                // Add event listeners for calculation
+                document.querySelectorAll('#updateReportForm input[type="number"]').forEach(input => {
+                    input.addEventListener('input', calculateUpdateTotal);
+                });
+                
+                // Calculate initial total
+                calculateUpdateTotal();
             } catch (error) {
                 console.error('Error fetching report data:', error);
                 alert('Failed to load report data. Please try again.');
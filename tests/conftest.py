@@ -0,0 +1,101 @@
+import itertools
+import os
+import shutil
+import tempfile
+from datetime import date
+
+import pytest
+
+# Config is read from the environment when config.py is imported
+_tmp = tempfile.mkdtemp(prefix='cash-collection-tests-')
+os.environ.update({
+    'APP_CONFIG': 'sqlite',
+    'SQLITE_PATH': os.path.join(_tmp, 'test.db'),
+    'EXPORT_DIR': os.path.join(_tmp, 'exports'),
+    'EXPORT_CACHE_DIR': os.path.join(_tmp, 'export-cache'),
+    'PASSWORD_HASH_METHOD': 'pbkdf2:sha256:1000',
+    'LOG_LEVEL': 'WARNING',
+    'LOG_QUEUE_SIZE': '0',
+})
+
+from app import create_app
+from extensions import db
+from models import Flight, FlightSupervisor, Report, User
+from utils import activation, reference_data, user_cache
+from utils.passwords import hash_password
+from utils.summary import record_new_reports
+
+PASSWORD = 'test-password'
+
+_ref_numbers = itertools.count(1)
+
+@pytest.fixture(scope='session')
+def app():
+    app = create_app()
+    app.config.update(TESTING=True, WTF_CSRF_ENABLED=False)
+    return app
+
+@pytest.fixture(autouse=True)
+def database(app):
+    """Fresh tables, caches and export files, with one user per role, a flight and a supervisor"""
+    for setting in ('EXPORT_DIR', 'EXPORT_CACHE_DIR'):
+        shutil.rmtree(app.config[setting], ignore_errors=True)
+
+    with app.app_context():
+        db.drop_all()
+        db.create_all()
+        password_hash = hash_password(PASSWORD)
+        for role in ('teamLead', 'dataAnalyst', 'cashController', 'admin'):
+            db.session.add(User(username=role, password_hash=password_hash, email=f'{role}@example.com',
+                                role=role, gender='male', telephone='0000000000', active=True))
+        db.session.add_all([Flight(name='FL100'), FlightSupervisor(name='Supervisor A')])
+        db.session.commit()
+
+        reference_data.invalidate()
+        activation.invalidate()
+        user_cache.init_app(app)
+        db.session.remove()
+
+    # No context stays pushed: each request gets its own g, so logins do not
+    # leak between test clients. Tests that query push their own.
+    yield
+
+def login(app, role):
+    client = app.test_client()
+    response = client.post('/login', data={'username': role, 'password': PASSWORD})
+    assert response.status_code == 302
+    return client
+
+def flashes(client):
+    with client.session_transaction() as session:
+        return session.get('_flashes', [])
+
+def user_id(role):
+    """Id of the seeded user with this role; call inside an app context"""
+    return User.query.filter_by(username=role).one().id
+
+def add_report(**values):
+    """
+    Store a report and its summary contribution; call inside an app context
+
+    Defaults to an unverified arrival report on FL100 by the team lead.
+    """
+    report = Report(**{
+        'date': date(2026, 1, 15),
+        'ref_no': f'REF-{next(_ref_numbers)}',
+        'supervisor': 'Supervisor A',
+        'supervisor_id': 1,
+        'flight_name': 'FL100',
+        'flight_id': 1,
+        'zone': 'arrival',
+        'paid': 10,
+        'total_attended': 10,
+        'verified': False,
+        'submitted_by_id': user_id('teamLead'),
+        **values,
+    })
+    db.session.add(report)
+    db.session.flush()
+    record_new_reports([report])
+    db.session.commit()
+    return report
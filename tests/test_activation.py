@@ -0,0 +1,56 @@
+import importlib.util
+import os
+import time
+from datetime import date, datetime, timedelta
+
+from models import TeamLeadActivation
+from tests.conftest import login, user_id
+from utils.activation import active_window
+
+def activate(client, team_lead_id, day):
+    response = client.post('/data-analyst/activate-team-lead',
+                           data={'team_lead': str(team_lead_id), 'date': day.isoformat()})
+    assert response.status_code == 302
+
+def test_new_activation_closes_the_open_window(app):
+    with app.app_context():
+        team_lead_id = user_id('teamLead')
+    analyst = login(app, 'dataAnalyst')
+    today = date.today()
+
+    activate(analyst, team_lead_id, today)
+    with app.app_context():
+        assert active_window(team_lead_id) == (datetime.combine(today, datetime.min.time()),
+                                               datetime.combine(today + timedelta(days=1), datetime.min.time()))
+
+    activate(analyst, team_lead_id, today + timedelta(days=1))
+    with app.app_context():
+        assert active_window(team_lead_id) is None
+        first, second = TeamLeadActivation.query.order_by(TeamLeadActivation.id)
+        assert first.valid_until <= datetime.now()
+        assert second.valid_from == datetime.combine(today + timedelta(days=1), datetime.min.time())
+
+def test_dashboard_shows_updates_only_inside_a_window(app):
+    with app.app_context():
+        team_lead_id = user_id('teamLead')
+    team_lead = login(app, 'teamLead')
+    assert b'Updates enabled for today' not in team_lead.get('/team-lead/dashboard').data
+
+    activate(login(app, 'dataAnalyst'), team_lead_id, date.today())
+
+    assert b'Updates enabled for today' in team_lead.get('/team-lead/dashboard').data
+
+def test_backfill_closes_windows_in_local_time(monkeypatch):
+    path = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'migrations', 'versions',
+                        '4d5e6f7a8b04_team_lead_activation_windows.py')
+    spec = importlib.util.spec_from_file_location('activation_windows_migration', path)
+    migration = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(migration)
+
+    monkeypatch.setenv('TZ', 'Africa/Lagos')  # UTC+1, no daylight saving
+    time.tzset()
+    try:
+        assert migration.utc_to_local(datetime(2026, 1, 15, 23, 30)) == datetime(2026, 1, 16, 0, 30)
+    finally:
+        monkeypatch.undo()
+        time.tzset()
@@ -0,0 +1,64 @@
+from datetime import date
+
+import pytest
+
+from extensions import db
+from models import User
+from tests.conftest import add_report, login
+
+@pytest.fixture
+def reports(app):
+    with app.app_context():
+        other = User(username='teamLead2', password_hash='-', email='teamLead2@example.com', role='teamLead',
+                     gender='female', telephone='0000000001', active=True)
+        db.session.add(other)
+        db.session.commit()
+
+        # Two reports in the week of Monday 2026-01-05, one in February, plus an unverified one
+        add_report(date=date(2026, 1, 5), paid=10, total_attended=10, iics_total=11, gia_total=9, verified=True)
+        add_report(date=date(2026, 1, 7), flight_name='FL200', flight_id=None, supervisor='Supervisor B',
+                   supervisor_id=None, zone='departure', submitted_by_id=other.id,
+                   paid=20, total_attended=20, iics_total=20, gia_total=22, verified=True)
+        add_report(date=date(2026, 2, 2), paid=5, total_attended=5, iics_total=4, gia_total=5, verified=True)
+        add_report(date=date(2026, 2, 3), paid=100, total_attended=100)
+
+# (group value, reportCount, totalAttended, iicsDifference, giaDifference) per group, in order
+FL100 = (2, 15, 0, -1)
+FL200 = (1, 20, 0, 2)
+
+@pytest.mark.parametrize('group_by, key, expected', [
+    ('date', 'date', [('2026-01-05', 1, 10, 1, -1), ('2026-01-07', *FL200), ('2026-02-02', 1, 5, -1, 0)]),
+    ('week', 'week', [('2026-01-05', 2, 30, 1, 1), ('2026-02-02', 1, 5, -1, 0)]),
+    ('month', 'month', [('2026-01', 2, 30, 1, 1), ('2026-02', 1, 5, -1, 0)]),
+    ('flight_name', 'flightName', [('FL100', *FL100), ('FL200', *FL200)]),
+    ('supervisor', 'supervisor', [('Supervisor A', *FL100), ('Supervisor B', *FL200)]),
+    ('zone', 'zone', [('arrival', *FL100), ('departure', *FL200)]),
+    ('submitted_by', 'submittedBy', [('teamLead', *FL100), ('teamLead2', *FL200)]),
+])
+def test_groups_sum_verified_reports(app, reports, group_by, key, expected):
+    client = login(app, 'cashController')
+
+    body = client.get('/cash-controller/api/reports/aggregate', query_string={'group_by': group_by}).get_json()
+
+    assert body['groupBy'] == [group_by]
+    assert [
+        (group[key], group['reportCount'], group['totalAttended'], group['iicsDifference'], group['giaDifference'])
+        for group in body['groups']
+    ] == expected
+
+def test_without_group_by_returns_one_total(app, reports):
+    client = login(app, 'cashController')
+
+    body = client.get('/cash-controller/api/reports/aggregate').get_json()
+
+    assert len(body['groups']) == 1
+    assert body['groups'][0]['reportCount'] == 3
+    assert body['groups'][0]['paid'] == 35
+
+def test_unknown_group_by_is_rejected(app):
+    client = login(app, 'cashController')
+
+    response = client.get('/cash-controller/api/reports/aggregate', query_string={'group_by': 'date,year'})
+
+    assert response.status_code == 400
+    assert 'Unsupported group_by: year' in response.get_json()['error']
@@ -0,0 +1,40 @@
+import pytest
+from werkzeug.security import generate_password_hash
+
+from extensions import db
+from models import User
+from tests.conftest import PASSWORD, login
+from utils.passwords import needs_rehash, verify_password
+
+def test_clients_keep_their_own_login(app):
+    team_lead = login(app, 'teamLead')
+    cash_controller = login(app, 'cashController')
+
+    assert team_lead.get('/team-lead/api/reports').status_code == 200
+    assert cash_controller.get('/cash-controller/api/reports').status_code == 200
+    assert team_lead.get('/cash-controller/api/reports').status_code == 302
+
+@pytest.mark.parametrize('old_method', ['pbkdf2:sha256:1000', 'scrypt:16384:8:1'])
+def test_login_rehashes_with_the_configured_method(app, monkeypatch, old_method):
+    # Only the iteration count differs in the first case
+    monkeypatch.setitem(app.config, 'PASSWORD_HASH_METHOD', 'pbkdf2:sha256:2000')
+    with app.app_context():
+        user = User.query.filter_by(username='teamLead').one()
+        user.password_hash = generate_password_hash(PASSWORD, method=old_method)
+        db.session.commit()
+
+    login(app, 'teamLead')
+
+    with app.app_context():
+        password_hash = User.query.filter_by(username='teamLead').one().password_hash
+        assert password_hash.startswith('pbkdf2:sha256:2000$')
+        assert not needs_rehash(password_hash)
+        assert verify_password(password_hash, PASSWORD)
+
+def test_needs_rehash_compares_parameters(app, monkeypatch):
+    monkeypatch.setitem(app.config, 'PASSWORD_HASH_METHOD', 'pbkdf2:sha256:600000')
+    with app.app_context():
+        assert needs_rehash('pbkdf2:sha256:1000$salt$hash')
+        assert needs_rehash('scrypt:32768:8:1$salt$hash')
+        assert not needs_rehash('pbkdf2:sha256:600000$salt$hash')
+        assert not needs_rehash('pbkdf2:sha256:0600000$salt$hash')
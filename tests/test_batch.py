@@ -0,0 +1,122 @@
+from datetime import date
+from io import BytesIO
+
+import routes.team_lead
+from models import DailyReportSummary, Report
+from tests.conftest import add_report, flashes, login
+
+DUPLICATE = 'A report with this reference number already exists for this date, flight and zone.'
+
+def row(ref_no, **values):
+    return {'date': '2026-01-15', 'ref_no': ref_no, 'supervisor': 'Supervisor A', 'flight': 'FL100',
+            'zone': 'arrival', 'paid': 10, **values}
+
+def stored(app):
+    with app.app_context():
+        return sorted(report.ref_no for report in Report.query)
+
+def test_json_batch_is_stored(app):
+    client = login(app, 'teamLead')
+
+    response = client.post('/team-lead/reports/batch', json=[row('B-1'), row('B-2', paid=5, refunds=1)])
+
+    assert response.status_code == 201
+    assert response.get_json() == {'created': 2, 'errors': []}
+    assert stored(app) == ['B-1', 'B-2']
+    with app.app_context():
+        summary = DailyReportSummary.query.one()
+        assert (summary.report_count, summary.total_attended) == (2, 14)
+
+def test_invalid_row_rejects_the_whole_batch(app):
+    client = login(app, 'teamLead')
+
+    response = client.post('/team-lead/reports/batch', json={'reports': [row('B-1'), row('B-2', flight='XX999')]})
+
+    assert response.status_code == 400
+    body = response.get_json()
+    assert body['created'] == 0
+    assert [error['row'] for error in body['errors']] == [2]
+    assert 'flight' in body['errors'][0]['errors']
+    assert stored(app) == []
+
+def test_duplicate_within_batch_is_rejected(app):
+    client = login(app, 'teamLead')
+
+    response = client.post('/team-lead/reports/batch', json=[row('B-1'), row('B-1', paid=3)])
+
+    assert response.status_code == 400
+    assert response.get_json()['errors'] == [{'row': 2, 'errors': {'ref_no': ['Duplicate of row 1']}}]
+    assert stored(app) == []
+
+def test_duplicate_of_stored_report_is_rejected(app):
+    with app.app_context():
+        add_report(ref_no='B-1', date=date(2026, 1, 15))
+    client = login(app, 'teamLead')
+
+    response = client.post('/team-lead/reports/batch', json=[row('B-2'), row('B-1')])
+
+    assert response.status_code == 400
+    assert response.get_json()['errors'] == [{'row': 2, 'errors': {'ref_no': [DUPLICATE]}}]
+    assert stored(app) == ['B-1']
+
+def test_concurrent_duplicate_is_reported_per_row(app, monkeypatch):
+    validate_rows = routes.team_lead.validate_rows
+    calls = []
+
+    def validate_then_race(rows, reference_data, submitted_by_id):
+        result = validate_rows(rows, reference_data, submitted_by_id)
+        if not calls:
+            # Another request stores B-1 between validation and insert
+            add_report(ref_no='B-1', date=date(2026, 1, 15))
+        calls.append(result)
+        return result
+
+    monkeypatch.setattr(routes.team_lead, 'validate_rows', validate_then_race)
+    client = login(app, 'teamLead')
+
+    response = client.post('/team-lead/reports/batch', json=[row('B-1'), row('B-2')])
+
+    assert response.status_code == 400
+    assert response.get_json()['errors'] == [{'row': 1, 'errors': {'ref_no': [DUPLICATE]}}]
+    assert len(calls) == 2
+    assert stored(app) == ['B-1']
+    with app.app_context():
+        assert DailyReportSummary.query.one().report_count == 1
+
+def test_csv_upload(app):
+    client = login(app, 'teamLead')
+    upload = ('Date,Ref No,Supervisor,Flight Name,Zone,Paid,Remarks\n'
+              '2026-01-15,C-1,Supervisor A,FL100,arrival,7,\n'
+              '2026-01-15,C-2,Supervisor A,FL100,departure,,late\n')
+
+    response = client.post('/team-lead/reports/batch',
+                           data={'file': (BytesIO(upload.encode()), 'shift.csv')},
+                           content_type='multipart/form-data')
+
+    assert response.status_code == 302
+    assert ('success', '2 reports submitted successfully.') in flashes(client)
+    assert stored(app) == ['C-1', 'C-2']
+
+def test_csv_upload_with_invalid_row_flashes_errors(app):
+    client = login(app, 'teamLead')
+    upload = 'Date,Ref No,Supervisor,Flight Name,Zone\n2026-01-15,C-1,Nobody,FL100,arrival\n'
+
+    response = client.post('/team-lead/reports/batch',
+                           data={'file': (BytesIO(upload.encode()), 'shift.csv')},
+                           content_type='multipart/form-data')
+
+    assert response.status_code == 302
+    messages = [message for category, message in flashes(client)]
+    assert any(message.startswith('Row 1: supervisor') for message in messages)
+    assert 'No reports were submitted. Fix the rows above and upload the file again.' in messages
+    assert stored(app) == []
+
+def test_batch_size_is_limited(app, monkeypatch):
+    monkeypatch.setitem(app.config, 'REPORT_BATCH_MAX_ROWS', 2)
+    client = login(app, 'teamLead')
+
+    for rows in ([], [row('B-1'), row('B-2'), row('B-3')]):
+        response = client.post('/team-lead/reports/batch', json=rows)
+        assert response.status_code == 400
+        assert response.get_json() == {'error': 'A batch must contain between 1 and 2 reports.'}
+    assert stored(app) == []
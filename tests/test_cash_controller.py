@@ -0,0 +1,29 @@
+import time
+
+import pytest
+
+from tests.conftest import login
+
+def wait_for_export(client, response):
+    for _ in range(100):
+        job = client.get(response.headers['Location']).get_json()
+        if job['status'] in ('done', 'failed'):
+            return job
+        time.sleep(0.05)
+    raise AssertionError('Export did not finish')
+
+def test_export_accepts_json_numbers(app):
+    client = login(app, 'cashController')
+
+    response = client.post('/cash-controller/exports', json={'format': 'csv', 'supervisor_id': 1, 'flight_id': None})
+    assert response.status_code == 202
+    assert response.get_json()['filters'] == {'supervisor_id': '1'}
+    assert wait_for_export(client, response)['status'] == 'done'
+
+@pytest.mark.parametrize('body', [['csv'], 'csv', 1])
+def test_export_rejects_json_that_is_not_an_object(app, body):
+    client = login(app, 'cashController')
+
+    response = client.post('/cash-controller/exports', json=body)
+    assert response.status_code == 400
+    assert response.get_json() == {'error': 'Request body must be a JSON object'}
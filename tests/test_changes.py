@@ -0,0 +1,97 @@
+import base64
+import json
+from datetime import datetime, timedelta
+
+import pytest
+
+from extensions import db
+from models import Report
+from tests.conftest import add_report, login
+
+URL = '/cash-controller/api/reports/changes'
+
+@pytest.fixture
+def settled(app, monkeypatch):
+    """No settle lag, so rows show up as soon as they are committed"""
+    monkeypatch.setitem(app.config, 'CHANGE_FEED_SETTLE_SECONDS', 0)
+
+def page(client, cursor=None, limit=None):
+    response = client.get(URL, query_string={key: value for key, value in
+                                             (('cursor', cursor), ('limit', limit)) if value is not None})
+    assert response.status_code == 200
+    return response.get_json()
+
+def cursor_for(payload):
+    return base64.urlsafe_b64encode(json.dumps(payload).encode()).decode().rstrip('=')
+
+def test_feed_pages_through_updates_and_deletes(app, settled):
+    with app.app_context():
+        ids = [add_report().id for _ in range(3)]
+    client = login(app, 'cashController')
+
+    first = page(client, limit=2)
+    assert [report['id'] for report in first['reports']] == ids[:2]
+    assert first['has_more']
+
+    second = page(client, first['next_cursor'], limit=2)
+    assert [report['id'] for report in second['reports']] == ids[2:]
+    assert not second['has_more']
+
+    caught_up = page(client, second['next_cursor'], limit=2)
+    assert caught_up['reports'] == [] and caught_up['deleted'] == []
+    assert caught_up['next_cursor'] == second['next_cursor']
+
+    with app.app_context():
+        db.session.get(Report, ids[0]).remarks = 'Recounted'
+        db.session.delete(db.session.get(Report, ids[1]))
+        db.session.commit()
+
+    changes = page(client, caught_up['next_cursor'], limit=2)
+    assert [(report['id'], report['remarks']) for report in changes['reports']] == [(ids[0], 'Recounted')]
+    assert [tombstone['id'] for tombstone in changes['deleted']] == [ids[1]]
+    assert page(client, changes['next_cursor'])['deleted'] == []
+
+def test_deleted_report_appears_as_tombstone(app, settled):
+    with app.app_context():
+        report_id = add_report().id
+        db.session.delete(db.session.get(Report, report_id))
+        db.session.commit()
+    client = login(app, 'cashController')
+
+    feed = page(client)
+    assert feed['reports'] == []
+    assert [tombstone['id'] for tombstone in feed['deleted']] == [report_id]
+    assert datetime.fromisoformat(feed['deleted'][0]['deletedAt']) <= datetime.utcnow()
+
+def test_recent_changes_are_held_back(app, monkeypatch):
+    monkeypatch.setitem(app.config, 'CHANGE_FEED_SETTLE_SECONDS', 30)
+    with app.app_context():
+        report_id = add_report().id
+    client = login(app, 'cashController')
+
+    held = page(client)
+    assert held['reports'] == []
+
+    with app.app_context():
+        Report.query.filter_by(id=report_id).update(
+            {Report.updated_at: datetime.utcnow() - timedelta(seconds=60)})
+        db.session.commit()
+
+    # The held-back cursor did not move past the report
+    assert [report['id'] for report in page(client, held['next_cursor'])['reports']] == [report_id]
+
+@pytest.mark.parametrize('cursor', [
+    'not a cursor!',
+    cursor_for([['2026-01-01T00:00:00', 1]]),
+    cursor_for([{'a': 1}, None]),
+    cursor_for([['2026-01-01T00:00:00', 1, 2], None]),
+    cursor_for([[1, 2], None]),
+    cursor_for([['yesterday', 1], None]),
+    cursor_for([['2026-01-01T00:00:00', 'one'], None]),
+    cursor_for([['2026-01-01T00:00:00', [1]], None]),
+    cursor_for(5),
+])
+def test_invalid_cursor_is_rejected(app, cursor):
+    response = login(app, 'cashController').get(URL, query_string={'cursor': cursor})
+    assert response.status_code == 400
+    assert response.get_json() == {'error': 'Invalid cursor'}
@@ -0,0 +1,91 @@
+import os
+
+from extensions import db
+from models import DailyReportSummary
+from tests.conftest import add_report, login
+from utils import export_cache
+
+def download(client, **filters):
+    response = client.get('/cash-controller/download-csv', query_string=filters)
+    response.get_data()
+    response.close()
+    return response
+
+def cached_files(app):
+    with app.app_context():
+        directory = export_cache.cache_dir()
+        return sorted(name for name in os.listdir(directory) if not name.endswith('.part'))
+
+def no_query(monkeypatch):
+    def fail():
+        raise AssertionError('Export was generated instead of served from the cache')
+    monkeypatch.setattr('routes.cash_controller.export_query', fail)
+
+def test_repeat_download_is_served_from_cache(app, monkeypatch):
+    with app.app_context():
+        add_report(verified=True)
+    client = login(app, 'cashController')
+
+    first = download(client)
+    assert first.status_code == 200
+    assert cached_files(app) == [f'{first.get_etag()[0]}.csv']
+
+    no_query(monkeypatch)
+    second = download(client)
+    assert second.status_code == 200
+    assert second.get_etag()[0] == first.get_etag()[0]
+    assert second.data == first.data
+
+def test_matching_etag_gets_not_modified(app, monkeypatch):
+    with app.app_context():
+        add_report(verified=True)
+    client = login(app, 'cashController')
+    etag = download(client).get_etag()[0]
+
+    no_query(monkeypatch)
+    response = client.get('/cash-controller/download-csv', headers={'If-None-Match': f'"{etag}"'})
+    assert response.status_code == 304
+    assert response.get_etag()[0] == etag
+    assert response.data == b''
+
+def test_summary_changes_invalidate_the_cache(app):
+    with app.app_context():
+        add_report(verified=True)
+    client = login(app, 'cashController')
+    first = download(client)
+
+    # A new report bumps the day's summary revision
+    with app.app_context():
+        add_report(verified=True)
+    second = download(client)
+    assert second.get_etag() != first.get_etag()
+    assert len(second.data.decode().strip().splitlines()) == 3
+
+    # So does an edit that leaves the totals alone
+    with app.app_context():
+        DailyReportSummary.query.update({DailyReportSummary.revision: DailyReportSummary.revision + 1})
+        db.session.commit()
+    third = download(client)
+    assert third.get_etag() != second.get_etag()
+    assert third.data == second.data
+
+    # And updated_at, which keeps moving after rebuild_summary restarts revisions
+    with app.app_context():
+        row = DailyReportSummary.query.first()
+        row.updated_at = row.updated_at.replace(year=row.updated_at.year + 1)
+        db.session.commit()
+    assert download(client).get_etag() != third.get_etag()
+
+def test_least_recently_used_export_is_evicted(app, monkeypatch):
+    with app.app_context():
+        add_report(verified=True)
+    client = login(app, 'cashController')
+
+    oldest = download(client, start_date='2026-01-01').get_etag()[0]
+    recent = download(client, start_date='2026-01-02').get_etag()[0]
+    size = len(download(client, start_date='2026-01-01').data)  # Now the most recently used
+    monkeypatch.setitem(app.config, 'EXPORT_CACHE_MAX_BYTES', size * 2 + size // 2)
+
+    newest = download(client, start_date='2026-01-03').get_etag()[0]
+    assert cached_files(app) == sorted([f'{oldest}.csv', f'{newest}.csv'])
+    assert f'{recent}.csv' not in cached_files(app)
@@ -0,0 +1,116 @@
+import os
+import threading
+import time
+
+import pytest
+
+from tests.conftest import add_report, login
+from utils import export_jobs
+
+@pytest.fixture
+def held_jobs(monkeypatch):
+    """Keep export jobs queued until the returned event is set"""
+    release = threading.Event()
+    run = export_jobs._run
+
+    def held_run(app, job):
+        release.wait(5)
+        run(app, job)
+
+    monkeypatch.setattr(export_jobs, '_run', held_run)
+    yield release
+    release.set()
+
+def poll(client, url):
+    for _ in range(100):
+        job = client.get(url).get_json()
+        if job['status'] in ('done', 'failed'):
+            return job
+        time.sleep(0.05)
+    raise AssertionError('Export did not finish')
+
+def test_export_job_lifecycle(app, held_jobs):
+    with app.app_context():
+        add_report(verified=True)
+        add_report(verified=True)
+    client = login(app, 'cashController')
+
+    response = client.post('/cash-controller/exports', data={'format': 'csv'})
+    assert response.status_code == 202
+    job = response.get_json()
+    status_url = response.headers['Location']
+    assert status_url.endswith(f"/cash-controller/exports/{job['id']}")
+    assert job['status'] == 'queued'
+
+    download_url = f"/cash-controller/exports/{job['id']}/download"
+    response = client.get(download_url)
+    assert response.status_code == 409
+    assert response.get_json()['status'] == 'queued'
+
+    held_jobs.set()
+    finished = poll(client, status_url)
+    assert finished['status'] == 'done'
+    assert finished['rowsWritten'] == finished['totalRows'] == 2
+    assert finished['downloadUrl'].endswith(download_url)
+
+    response = client.get(download_url)
+    assert response.status_code == 200
+    assert len(response.data.decode().strip().splitlines()) == 3
+
+def test_identical_requests_share_a_job(app, held_jobs):
+    client = login(app, 'cashController')
+
+    first = client.post('/cash-controller/exports', json={'format': 'csv', 'start_date': '2026-01-01'})
+    second = client.post('/cash-controller/exports', data={'format': 'csv', 'start_date': '2026-01-01 '})
+    other = client.post('/cash-controller/exports', json={'format': 'csv', 'start_date': '2026-01-02'})
+
+    assert first.get_json()['id'] == second.get_json()['id']
+    assert other.get_json()['id'] != first.get_json()['id']
+
+def test_concurrent_submissions_start_one_job(app, held_jobs):
+    ids = []
+    barrier = threading.Barrier(4)
+
+    def submit():
+        with app.test_request_context():
+            barrier.wait()
+            ids.append(export_jobs.submit_export({'start_date': '2026-01-01'}, 'csv')['id'])
+
+    threads = [threading.Thread(target=submit) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(ids) == 4
+    assert len(set(ids)) == 1
+
+def test_key_file_is_claimed_once(app):
+    with app.app_context():
+        directory = export_jobs.export_dir()
+        descriptor = export_jobs._claim_key(directory, 'abc')
+        assert descriptor is not None
+        os.close(descriptor)
+        assert export_jobs._claim_key(directory, 'abc') is None
+
+def test_purge_keeps_queued_jobs_past_the_ttl(app, held_jobs, monkeypatch):
+    monkeypatch.setitem(app.config, 'EXPORT_JOB_TTL', 60)
+    with app.test_request_context():
+        job = export_jobs.submit_export({}, 'csv')
+        directory = export_jobs.export_dir()
+        files = [os.path.join(directory, name) for name in os.listdir(directory)]
+
+        def age(seconds):
+            for path in files:
+                os.utime(path, (time.time() - seconds, time.time() - seconds))
+
+        age(120)
+        export_jobs.purge_expired()
+        assert export_jobs.get_job(job['id'])['status'] == 'queued'
+        assert export_jobs.submit_export({}, 'csv')['id'] == job['id']
+
+        # Abandoned by a worker that died
+        age(60 * export_jobs.ACTIVE_JOB_TTL_FACTOR + 1)
+        export_jobs.purge_expired()
+        assert export_jobs.get_job(job['id']) is None
+        assert os.listdir(directory) == []
@@ -0,0 +1,65 @@
+from datetime import date
+
+import pytest
+
+from tests.conftest import add_report, login
+
+def fetch_pages(client, url, limit):
+    ids = []
+    cursor = None
+    pages = 0
+    while True:
+        params = {'limit': limit}
+        if cursor:
+            params['cursor'] = cursor
+        body = client.get(url, query_string=params).get_json()
+        ids.extend(report['id'] for report in body['reports'])
+        pages += 1
+        cursor = body['next_cursor']
+        if cursor is None:
+            return ids, pages
+
+def test_pages_cover_reports_sharing_a_date_once(app):
+    with app.app_context():
+        # Several reports per date, so pages split inside a date
+        expected = [add_report(date=date(2026, 1, day)).id for day in (10, 10, 11, 11, 11, 12, 12)]
+    client = login(app, 'teamLead')
+
+    ids, pages = fetch_pages(client, '/team-lead/api/reports', limit=2)
+
+    assert pages == 4
+    assert sorted(ids) == sorted(expected)
+    assert len(ids) == len(set(ids))
+
+def test_last_page_has_no_next_cursor(app):
+    with app.app_context():
+        for _ in range(3):
+            add_report()
+    client = login(app, 'teamLead')
+
+    body = client.get('/team-lead/api/reports', query_string={'limit': 3}).get_json()
+
+    assert len(body['reports']) == 3
+    assert body['next_cursor'] is None
+
+@pytest.mark.parametrize('limit, expected', [('0', 1), ('-5', 1), ('1000', 4), ('abc', 4)])
+def test_limit_is_clamped(app, monkeypatch, limit, expected):
+    monkeypatch.setitem(app.config, 'REPORTS_PAGE_SIZE', 4)
+    monkeypatch.setitem(app.config, 'REPORTS_MAX_PAGE_SIZE', 4)
+    with app.app_context():
+        for _ in range(6):
+            add_report()
+    client = login(app, 'teamLead')
+
+    body = client.get('/team-lead/api/reports', query_string={'limit': limit}).get_json()
+
+    assert len(body['reports']) == expected
+
+@pytest.mark.parametrize('cursor', ['not-base64!', 'bm90IGpzb24', 'WzFd', 'eyJhIjoxfQ', 'WyIyMDI2LTAxLTAxIix7fV0'])
+def test_malformed_cursor_is_rejected(app, cursor):
+    client = login(app, 'teamLead')
+
+    response = client.get('/team-lead/api/reports', query_string={'cursor': cursor})
+
+    assert response.status_code == 400
+    assert response.get_json() == {'error': 'Invalid cursor'}
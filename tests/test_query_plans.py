@@ -0,0 +1,22 @@
+from sqlalchemy import text
+
+from commands import explain, hot_queries, is_full_scan
+from extensions import db
+
+def full_scans(app):
+    with app.app_context():
+        return {name: plan for name, plan in ((name, explain(query)) for name, query in hot_queries().items())
+                if any(is_full_scan(line) for line in plan)}
+
+def test_hot_queries_use_indexes(app):
+    assert full_scans(app) == {}
+
+def test_dropped_index_is_detected(app):
+    with app.app_context():
+        db.session.execute(text('DROP INDEX ix_reports_verified_date_id'))
+        db.session.commit()
+        # Pooled connections cache EXPLAIN statements, which SQLite does not
+        # prepare again after a schema change
+        db.engine.dispose()
+
+    assert 'data_analyst.unverified' in full_scans(app)
@@ -0,0 +1,58 @@
+from datetime import datetime
+
+from extensions import db
+from models import DailyReportSummary, Report
+from tests.conftest import add_report, flashes, login
+
+REPORT = {
+    'date': '2026-01-15',
+    'ref_no': 'REF-1',
+    'supervisor': 'Supervisor A',
+    'flight': 'FL100',
+    'zone': 'arrival',
+    'paid': 10,
+}
+
+def test_duplicate_submit_flashes_instead_of_failing(app):
+    client = login(app, 'teamLead')
+
+    response = client.post('/team-lead/reports/submit', data=REPORT)
+    assert response.status_code == 302
+    assert ('success', 'Report submitted successfully.') in flashes(client)
+
+    response = client.post('/team-lead/reports/submit', data=REPORT)
+    assert response.status_code == 302
+    assert response.headers['Location'].endswith('/team-lead/dashboard')
+    assert ('danger', 'A report with this reference number already exists for this date, flight and zone.') \
+        in flashes(client)
+
+    with app.app_context():
+        assert Report.query.count() == 1
+        assert DailyReportSummary.query.one().report_count == 1
+
+def test_report_etag_changes_with_edits_in_the_same_second(app):
+    with app.app_context():
+        report_id = add_report().id
+    client = login(app, 'teamLead')
+    url = f'/team-lead/api/reports/{report_id}'
+
+    def edit(remarks):
+        # updated_at as MySQL stores it, truncated to the second
+        with app.app_context():
+            report = db.session.get(Report, report_id)
+            report.remarks = remarks
+            db.session.flush()
+            report.updated_at = datetime(2026, 1, 15, 12, 0, 0)
+            db.session.commit()
+        response = client.get(url)
+        assert response.status_code == 200
+        assert response.headers['Cache-Control'] == 'private, no-cache'
+        return response.get_etag()[0]
+
+    first = edit('First edit')
+    second = edit('Second edit')
+    assert first != second
+
+    response = client.get(url, headers={'If-None-Match': f'"{second}"'})
+    assert response.status_code == 304
+    assert client.get(url, headers={'If-None-Match': f'"{first}"'}).status_code == 200
@@ -0,0 +1,72 @@
+from sqlalchemy import event
+
+from extensions import db
+from models import User
+from tests.conftest import add_report, login, user_id
+from utils import user_cache
+
+def count_queries(app, function):
+    statements = []
+    listener = lambda *args: statements.append(args[2])
+    with app.app_context():
+        event.listen(db.engine, 'before_cursor_execute', listener)
+        try:
+            result = function()
+        finally:
+            event.remove(db.engine, 'before_cursor_execute', listener)
+    return result, len(statements)
+
+def test_cached_user_is_copied_into_each_request(app):
+    with app.app_context():
+        team_lead_id = user_id('teamLead')
+        add_report()
+
+    loaded = []
+    for _ in range(2):
+        with app.test_request_context():
+            user = user_cache.load_user(str(team_lead_id))
+            loaded.append(user)
+            # Lazy relationships need the copy to be attached to this request's session
+            assert user in db.session
+            assert user.reports.count() == 1
+
+    assert loaded[0] is not loaded[1]
+
+    def load_again():
+        with app.test_request_context():
+            return user_cache.load_user(str(team_lead_id)).username
+
+    username, queries = count_queries(app, load_again)
+    assert username == 'teamLead'
+    assert queries == 0
+
+def test_deactivated_user_is_logged_out(app):
+    client = login(app, 'teamLead')
+    admin = login(app, 'admin')
+    assert client.get('/team-lead/api/reports').status_code == 200
+
+    with app.app_context():
+        team_lead_id = user_id('teamLead')
+    assert admin.post(f'/admin/users/{team_lead_id}/deactivate').status_code == 302
+
+    response = client.get('/team-lead/api/reports')
+    assert response.status_code == 302
+    assert '/login' in response.headers['Location']
+
+def test_role_change_applies_after_invalidate(app):
+    client = login(app, 'teamLead')
+    assert client.get('/team-lead/api/reports').status_code == 200
+
+    with app.app_context():
+        user = User.query.filter_by(username='teamLead').one()
+        user.role = 'dataAnalyst'
+        db.session.commit()
+        team_lead_id = user.id
+
+    # Until the entry is dropped the cached role is still served
+    assert client.get('/team-lead/api/reports').status_code == 200
+
+    with app.app_context():
+        user_cache.invalidate(team_lead_id)
+    assert client.get('/team-lead/api/reports').status_code == 302
+    assert client.get('/data-analyst/api/reports').status_code == 200
@@ -0,0 +1,92 @@
+import threading
+import time
+from datetime import datetime, time as day_start, timedelta
+
+from flask import current_app
+
+from extensions import db
+from models import TeamLeadActivation
+
+_lock = threading.Lock()
+_windows = None
+_loaded_at = 0.0
+
+def activation_window(day):
+    """The (valid_from, valid_until) window that allows updates for one day"""
+    valid_from = datetime.combine(day, day_start.min)
+    return valid_from, valid_from + timedelta(days=1)
+
+def create_activation(team_lead_id, day, activated_by_id):
+    """
+    Add an activation window for a team lead; the caller commits and then calls invalidate()
+
+    A new activation supersedes any of the team lead's windows that are
+    still open, as only the latest activation used to count.
+
+    Returns:
+        The new TeamLeadActivation
+    """
+    now = datetime.now()
+    valid_from, valid_until = activation_window(day)
+
+    TeamLeadActivation.query.filter(
+        TeamLeadActivation.team_lead_id == team_lead_id,
+        TeamLeadActivation.valid_until > now
+    ).update({TeamLeadActivation.valid_until: now}, synchronize_session=False)
+
+    activation = TeamLeadActivation(
+        team_lead_id=team_lead_id,
+        date=day,
+        valid_from=valid_from,
+        valid_until=valid_until,
+        activated_by_id=activated_by_id
+    )
+    db.session.add(activation)
+    return activation
+
+def _load():
+    windows = {}
+    rows = db.session.query(
+        TeamLeadActivation.team_lead_id, TeamLeadActivation.valid_from, TeamLeadActivation.valid_until
+    ).filter(TeamLeadActivation.valid_until > datetime.now())
+    for team_lead_id, valid_from, valid_until in rows:
+        windows.setdefault(team_lead_id, []).append((valid_from, valid_until))
+    return windows
+
+def _get_windows():
+    global _windows, _loaded_at
+
+    ttl = current_app.config['ACTIVATION_CACHE_TTL']
+    windows = _windows
+    if windows is not None and time.monotonic() - _loaded_at < ttl:
+        return windows
+
+    with _lock:
+        if _windows is None or time.monotonic() - _loaded_at >= ttl:
+            _windows = _load()
+            _loaded_at = time.monotonic()
+        return _windows
+
+def active_window(team_lead_id):
+    """
+    The team lead's activation window covering the current time
+
+    Current and future windows of every team lead are cached per process
+    and reloaded after invalidate() or once older than ACTIVATION_CACHE_TTL
+    seconds.
+
+    Returns:
+        (valid_from, valid_until) tuple, or None when updates are not allowed
+    """
+    now = datetime.now()
+    for valid_from, valid_until in _get_windows().get(team_lead_id, ()):
+        if valid_from <= now < valid_until:
+            return valid_from, valid_until
+    return None
+
+def invalidate():
+    """Drop the cached windows; call after committing an activation"""
+    global _windows
+
+    with _lock:
+        _windows = None
@@ -0,0 +1,131 @@
+from sqlalchemy import func, literal_column
+
+from extensions import db
+from models import Report, User
+
+# Passenger-count columns summed by the aggregation API, keyed by response name
+SUM_COLUMNS = {
+    'paid': Report.paid,
+    'diplomats': Report.diplomats,
+    'infants': Report.infants,
+    'notPaid': Report.not_paid,
+    'paidCardQr': Report.paid_card_qr,
+    'refunds': Report.refunds,
+    'deportees': Report.deportees,
+    'transit': Report.transit,
+    'waivers': Report.waivers,
+    'prepaidBank': Report.prepaid_bank,
+    'roundTrip': Report.round_trip,
+    'latePayment': Report.late_payment,
+    'totalAttended': Report.total_attended,
+    'iicsInfant': Report.iics_infant,
+    'iicsAdult': Report.iics_adult,
+    'iicsTotal': Report.iics_total,
+    'giaInfant': Report.gia_infant,
+    'giaAdult': Report.gia_adult,
+    'giaTotal': Report.gia_total,
+}
+
+GROUP_BY_OPTIONS = ['date', 'week', 'month', 'flight_name', 'supervisor', 'zone', 'submitted_by']
+
+# Response key for each group_by option, matching Report.to_dict naming
+GROUP_KEYS = {
+    'date': 'date',
+    'week': 'week',
+    'month': 'month',
+    'flight_name': 'flightName',
+    'supervisor': 'supervisor',
+    'zone': 'zone',
+    'submitted_by': 'submittedBy',
+}
+
+# Constants in grouped expressions are rendered inline: MySQL and PostgreSQL do
+# not treat "f(col, ?)" in SELECT and GROUP BY as the same expression when the
+# constant is a bound parameter.
+
+def _week_start(dialect):
+    """Expression for the Monday that starts the report's week"""
+    if dialect == 'sqlite':
+        return func.date(Report.date, literal_column("'weekday 0'"), literal_column("'-6 days'"))
+    if dialect == 'mysql':
+        return func.date_sub(Report.date, literal_column(f'INTERVAL WEEKDAY({Report.__tablename__}.date) DAY'))
+    return func.date(func.date_trunc(literal_column("'week'"), Report.date))
+
+def _month(dialect):
+    """Expression for the report's month as YYYY-MM"""
+    if dialect == 'sqlite':
+        return func.strftime(literal_column("'%Y-%m'"), Report.date)
+    if dialect == 'mysql':
+        return func.date_format(Report.date, literal_column("'%Y-%m'"))
+    return func.to_char(Report.date, literal_column("'YYYY-MM'"))
+
+def group_expression(option, dialect):
+    """SQL expression for a group_by option"""
+    if option == 'date':
+        return Report.date
+    if option == 'week':
+        return _week_start(dialect)
+    if option == 'month':
+        return _month(dialect)
+    if option == 'flight_name':
+        return Report.flight_name
+    if option == 'supervisor':
+        return Report.supervisor
+    if option == 'zone':
+        return Report.zone
+    if option == 'submitted_by':
+        return User.username
+    raise ValueError(f'Unsupported group_by: {option}')
+
+def parse_group_by(value):
+    """
+    Parse a comma-separated group_by argument
+
+    Raises:
+        ValueError: If an option is not in GROUP_BY_OPTIONS
+    """
+    options = [option.strip() for option in (value or '').split(',') if option.strip()]
+    invalid = [option for option in options if option not in GROUP_BY_OPTIONS]
+    if invalid:
+        raise ValueError(f"Unsupported group_by: {', '.join(invalid)}. "
+                         f"Allowed: {', '.join(GROUP_BY_OPTIONS)}")
+    # Keep the requested order but drop duplicates
+    return list(dict.fromkeys(options))
+
+def aggregate_query(group_by):
+    """
+    Build a single GROUP BY query summing passenger counts per group
+
+    Filters are applied by the caller on the returned query.
+
+    Args:
+        group_by: List of options from GROUP_BY_OPTIONS
+
+    Returns:
+        Query yielding one row per group
+    """
+    dialect = db.session.get_bind().dialect.name
+    group_columns = [group_expression(option, dialect).label(GROUP_KEYS[option]) for option in group_by]
+
+    total_attended = func.coalesce(Report.total_attended, 0)
+    sums = [func.coalesce(func.sum(column), 0).label(key) for key, column in SUM_COLUMNS.items()]
+    sums += [
+        func.coalesce(func.sum(func.coalesce(Report.iics_total, 0) - total_attended), 0).label('iicsDifference'),
+        func.coalesce(func.sum(func.coalesce(Report.gia_total, 0) - total_attended), 0).label('giaDifference'),
+    ]
+
+    query = db.session.query(*group_columns, func.count(Report.id).label('reportCount'), *sums).select_from(Report)
+    if 'submitted_by' in group_by:
+        query = query.join(User, User.id == Report.submitted_by_id)
+
+    if group_columns:
+        query = query.group_by(*group_columns).order_by(*group_columns)
+
+    return query
+
+def serialize_group(row):
+    """Convert an aggregate row to a JSON-friendly dict"""
+    return {
+        key: value.isoformat() if hasattr(value, 'isoformat') else value
+        for key, value in row._mapping.items()
+    }
@@ -0,0 +1,181 @@
+import csv
+from io import StringIO
+
+from sqlalchemy import insert, tuple_
+from werkzeug.datastructures import MultiDict
+
+from extensions import db
+from forms import ReportForm
+from models import Report
+from utils.summary import record_new_reports
+
+# ReportForm fields copied onto a Report, keyed by form field name
+REPORT_FIELDS = {
+    'date': 'date',
+    'ref_no': 'ref_no',
+    'supervisor': 'supervisor',
+    'flight': 'flight_name',
+    'zone': 'zone',
+    'paid': 'paid',
+    'diplomats': 'diplomats',
+    'infants': 'infants',
+    'not_paid': 'not_paid',
+    'paid_card_qr': 'paid_card_qr',
+    'refunds': 'refunds',
+    'deportees': 'deportees',
+    'transit': 'transit',
+    'waivers': 'waivers',
+    'prepaid_bank': 'prepaid_bank',
+    'round_trip': 'round_trip',
+    'late_payment': 'late_payment',
+    'remarks': 'remarks',
+}
+
+# CSV export column headers accepted in uploads; the verification and
+# status columns of an export are ignored
+CSV_COLUMNS = {
+    'Date': 'date',
+    'Ref No': 'ref_no',
+    'Supervisor': 'supervisor',
+    'Flight Name': 'flight',
+    'Zone': 'zone',
+    'Paid': 'paid',
+    'Diplomats': 'diplomats',
+    'Infants': 'infants',
+    'Not Paid': 'not_paid',
+    'Paid Card/QR': 'paid_card_qr',
+    'Refunds': 'refunds',
+    'Deportees': 'deportees',
+    'Transit': 'transit',
+    'Waivers': 'waivers',
+    'Prepaid Bank': 'prepaid_bank',
+    'Round Trip': 'round_trip',
+    'Late Payment': 'late_payment',
+    'Remarks': 'remarks',
+}
+
+class BatchError(ValueError):
+    """Raised when a batch cannot be read at all"""
+
+def rows_from_csv(file_storage):
+    """
+    Read report rows from an uploaded CSV in the CSV export column layout
+
+    Args:
+        file_storage: Uploaded file
+
+    Returns:
+        List of dicts keyed by ReportForm field name
+    """
+    try:
+        text = file_storage.read().decode('utf-8-sig')
+    except UnicodeDecodeError as e:
+        raise BatchError('The file must be UTF-8 encoded CSV') from e
+
+    reader = csv.DictReader(StringIO(text))
+    missing = [header for header in ('Date', 'Ref No', 'Supervisor', 'Flight Name', 'Zone')
+               if header not in (reader.fieldnames or [])]
+    if missing:
+        raise BatchError(f"Missing CSV columns: {', '.join(missing)}")
+
+    return [
+        {field: row[header] for header, field in CSV_COLUMNS.items() if header in row}
+        for row in reader
+    ]
+
+def rows_from_json(payload):
+    """
+    Read report rows from a JSON payload
+
+    Args:
+        payload: List of report objects, or {"reports": [...]}, keyed by
+                 ReportForm field name
+
+    Returns:
+        List of dicts keyed by ReportForm field name
+    """
+    if isinstance(payload, dict):
+        payload = payload.get('reports')
+    if not isinstance(payload, list) or not all(isinstance(row, dict) for row in payload):
+        raise BatchError('Expected a list of report objects')
+    return payload
+
+def _to_formdata(row):
+    # Blank cells fall back to the field defaults instead of failing integer parsing
+    return MultiDict({
+        field: str(value) for field, value in row.items()
+        if field in REPORT_FIELDS and value is not None and str(value).strip() != ''
+    })
+
+def validate_rows(rows, reference_data, submitted_by_id):
+    """
+    Validate rows with the ReportForm rules and build Report objects
+
+    Args:
+        rows: List of dicts keyed by ReportForm field name
+        reference_data: ReferenceData snapshot for flight/supervisor choices
+        submitted_by_id: Id of the submitting team lead
+
+    Returns:
+        Tuple of (list of Report objects, list of {'row': n, 'errors': {...}})
+    """
+    reports = []
+    errors = []
+    seen_keys = {}
+
+    for number, row in enumerate(rows, start=1):
+        form = ReportForm(formdata=_to_formdata(row), meta={'csrf': False})
+        form.flight.choices = reference_data.flight_choices()
+        form.supervisor.choices = reference_data.supervisor_choices()
+
+        if not form.validate():
+            errors.append({'row': number, 'errors': form.errors})
+            continue
+
+        report = Report(
+            **{column: getattr(form, field).data for field, column in REPORT_FIELDS.items()},
+            supervisor_id=reference_data.supervisor_ids.get(form.supervisor.data),
+            flight_id=reference_data.flight_ids.get(form.flight.data),
+            submitted_by_id=submitted_by_id,
+            verified=False
+        )
+        report.total_attended = report.calculate_total()
+
+        key = (report.ref_no, report.date, report.flight_name, report.zone)
+        if key in seen_keys:
+            errors.append({'row': number, 'errors': {'ref_no': [f'Duplicate of row {seen_keys[key]}']}})
+            continue
+        seen_keys[key] = number
+        reports.append((number, report))
+
+    # One query for every key in the batch that is already stored
+    if seen_keys:
+        existing = set(
+            db.session.query(Report.ref_no, Report.date, Report.flight_name, Report.zone)
+            .filter(tuple_(Report.ref_no, Report.date, Report.flight_name, Report.zone).in_(list(seen_keys)))
+        )
+        for number, report in reports:
+            if (report.ref_no, report.date, report.flight_name, report.zone) in existing:
+                errors.append({'row': number, 'errors': {
+                    'ref_no': ['A report with this reference number already exists for this date, flight and zone.']
+                }})
+
+    errors.sort(key=lambda error: error['row'])
+    return [report for number, report in reports], errors
+
+def insert_reports(reports):
+    """
+    Insert validated reports and update the daily summary in one transaction
+
+    Args:
+        reports: Report objects returned by validate_rows
+    """
+    columns = [column.key for column in Report.__table__.columns if column.key != 'id']
+    values = [
+        {column: getattr(report, column) for column in columns if getattr(report, column) is not None}
+        for report in reports
+    ]
+
+    db.session.execute(insert(Report), values)
+    record_new_reports(reports)
+    db.session.commit()
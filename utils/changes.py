@@ -0,0 +1,130 @@
+import base64
+import json
+from datetime import datetime, timedelta
+
+from flask import current_app, jsonify, request
+from sqlalchemy import and_, or_
+
+from models import Report, ReportTombstone
+from utils.pagination import InvalidCursor, parse_limit
+
+# Feed positions are (timestamp, id) pairs, one for reports and one for
+# tombstones; None means nothing has been read from that stream yet
+def encode_change_cursor(report_position, tombstone_position):
+    """
+    Build an opaque cursor from the last report and tombstone positions read
+
+    Args:
+        report_position: (updated_at, id) of the last report returned, or None
+        tombstone_position: (deleted_at, id) of the last tombstone returned, or None
+
+    Returns:
+        URL-safe cursor string
+    """
+    payload = json.dumps(
+        [[position[0].isoformat(), position[1]] if position else None
+         for position in (report_position, tombstone_position)],
+        separators=(',', ':')
+    )
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip('=')
+
+
+def decode_change_cursor(cursor):
+    """
+    Decode a cursor produced by encode_change_cursor
+
+    Args:
+        cursor: Cursor string from the request
+
+    Returns:
+        Tuple of (report position, tombstone position)
+    """
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        report_position, tombstone_position = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        for position in (report_position, tombstone_position):
+            if position is not None and not (isinstance(position, list) and len(position) == 2):
+                raise ValueError('Cursor positions must be [timestamp, id] pairs')
+        return tuple(
+            (datetime.fromisoformat(position[0]), int(position[1])) if position is not None else None
+            for position in (report_position, tombstone_position)
+        )
+    except (ValueError, TypeError, IndexError) as e:
+        raise InvalidCursor('Invalid cursor') from e
+
+
+def _after(query, timestamp_column, id_column, position, settled, limit):
+    query = query.filter(timestamp_column < settled)
+    if position:
+        timestamp, row_id = position
+        query = query.filter(or_(
+            timestamp_column > timestamp,
+            and_(timestamp_column == timestamp, id_column > row_id)
+        ))
+    return query.order_by(timestamp_column, id_column).limit(limit + 1).all()
+
+
+def changes_since(cursor=None, limit=None):
+    """
+    Reports changed and deleted after a cursor, in commit-safe order
+
+    Reports are read in (updated_at, id) order and tombstones in
+    (deleted_at, id) order. Rows younger than CHANGE_FEED_SETTLE_SECONDS
+    are held back: timestamps are taken before commit, so a slow
+    transaction can land behind rows that were already returned, and the
+    lag keeps the cursor from moving past it.
+
+    Args:
+        cursor: Optional cursor string from a previous call; None starts
+                from the beginning
+        limit: Optional requested page size, applied to each stream
+
+    Returns:
+        Tuple of (list of Report objects, list of ReportTombstone objects,
+        next cursor, whether more changes are ready)
+    """
+    limit = parse_limit(limit)
+    report_position, tombstone_position = decode_change_cursor(cursor) if cursor else (None, None)
+    settled = datetime.utcnow() - timedelta(seconds=current_app.config['CHANGE_FEED_SETTLE_SECONDS'])
+
+    reports = _after(Report.query_with_users(), Report.updated_at, Report.id,
+                     report_position, settled, limit)
+    tombstones = _after(ReportTombstone.query, ReportTombstone.deleted_at, ReportTombstone.id,
+                        tombstone_position, settled, limit)
+
+    has_more = len(reports) > limit or len(tombstones) > limit
+    reports, tombstones = reports[:limit], tombstones[:limit]
+
+    if reports:
+        report_position = (reports[-1].updated_at, reports[-1].id)
+    if tombstones:
+        tombstone_position = (tombstones[-1].deleted_at, tombstones[-1].id)
+
+    return reports, tombstones, encode_change_cursor(report_position, tombstone_position), has_more
+
+
+def changes_response():
+    """
+    Change feed page for the cursor and limit request arguments
+
+    Returns:
+        JSON response with changed reports, deleted report ids, the cursor
+        to resume from and whether more changes are ready
+    """
+    try:
+        reports, tombstones, next_cursor, has_more = changes_since(
+            cursor=request.args.get('cursor'),
+            limit=request.args.get('limit')
+        )
+    except InvalidCursor as e:
+        return jsonify({'error': str(e)}), 400
+
+    return jsonify({
+        'reports': [report.to_dict() for report in reports],
+        'deleted': [
+            {'id': tombstone.report_id, 'deletedAt': tombstone.deleted_at.isoformat()}
+            for tombstone in tombstones
+        ],
+        'next_cursor': next_cursor,
+        'has_more': has_more
+    })
@@ -1,68 +1,236 @@
-from flask import make_response
 import csv
+import importlib.util
+import io
 from io import StringIO
 
-def export_to_csv(reports):
+# Number of rows fetched from the database cursor and flushed to the client at a time
+EXPORT_CHUNK_SIZE = 500
+
+# Rows per Parquet row group / Arrow record batch
+COLUMNAR_BATCH_SIZE = 10000
+
+# Export columns as (CSV header, columnar field name, type). The columnar
+# formats use snake_case names, which Spark and pandas accept without quoting.
+EXPORT_COLUMNS = [
+    ('Date', 'date', 'date'),
+    ('Ref No', 'ref_no', 'string'),
+    ('Supervisor', 'supervisor', 'string'),
+    ('Flight Name', 'flight_name', 'string'),
+    ('Zone', 'zone', 'string'),
+    ('Paid', 'paid', 'int'),
+    ('Diplomats', 'diplomats', 'int'),
+    ('Infants', 'infants', 'int'),
+    ('Not Paid', 'not_paid', 'int'),
+    ('Paid Card/QR', 'paid_card_qr', 'int'),
+    ('Refunds', 'refunds', 'int'),
+    ('Deportees', 'deportees', 'int'),
+    ('Transit', 'transit', 'int'),
+    ('Waivers', 'waivers', 'int'),
+    ('Prepaid Bank', 'prepaid_bank', 'int'),
+    ('Round Trip', 'round_trip', 'int'),
+    ('Late Payment', 'late_payment', 'int'),
+    ('Total Attended', 'total_attended', 'int'),
+    ('IICS Infant', 'iics_infant', 'int'),
+    ('IICS Adult', 'iics_adult', 'int'),
+    ('IICS Total', 'iics_total', 'int'),
+    ('GIA Infant', 'gia_infant', 'int'),
+    ('GIA Adult', 'gia_adult', 'int'),
+    ('GIA Total', 'gia_total', 'int'),
+    ('IICS-Total Difference', 'iics_total_difference', 'int'),
+    ('GIA-Total Difference', 'gia_total_difference', 'int'),
+    ('Status', 'status', 'string'),
+    ('Submitted By', 'submitted_by', 'string'),
+    ('Verified By', 'verified_by', 'string'),
+    ('Remarks', 'remarks', 'string'),
+]
+
+CSV_HEADERS = [header for header, name, column_type in EXPORT_COLUMNS]
+
+def report_to_row(report):
+    """Convert a report to a list of values in EXPORT_COLUMNS order; missing values are None"""
+    return [
+        report.date,
+        report.ref_no,
+        report.supervisor,
+        report.flight_name,
+        report.zone,
+        report.paid,
+        report.diplomats,
+        report.infants,
+        report.not_paid,
+        report.paid_card_qr,
+        report.refunds,
+        report.deportees,
+        report.transit,
+        report.waivers,
+        report.prepaid_bank,
+        report.round_trip,
+        report.late_payment,
+        report.total_attended,
+        report.iics_infant,
+        report.iics_adult,
+        report.iics_total,
+        report.gia_infant,
+        report.gia_adult,
+        report.gia_total,
+        (report.iics_total or 0) - (report.total_attended or 0),  # IICS - Total Attended
+        (report.gia_total or 0) - (report.total_attended or 0),   # GIA - Total Attended
+        'Verified' if report.verified else 'Pending',
+        report.submitter.username if report.submitter else None,
+        report.verified_by.username if report.verified_by else None,
+        report.remarks
+    ]
+
+def iter_csv(query, chunk_size=EXPORT_CHUNK_SIZE, on_rows=None):
     """
-    Export reports to CSV file
-    
+    Generate CSV text for a report query in chunks
+
     Args:
-        reports: List of Report objects to export
-        
-    Returns:
-        Flask response with CSV attachment
+        query: Report query to export, already filtered and ordered
+        chunk_size: Number of rows fetched and yielded at a time
+        on_rows: Optional callback receiving the number of rows written so far
+
+    Yields:
+        CSV text, starting with the header row
     """
-    # Create output in memory
     output = StringIO()
     writer = csv.writer(output)
-    
-    # Write header row
-    headers = [
-        'Date', 'Ref No', 'Supervisor', 'Flight Name', 'Zone', 'Paid', 'Diplomats', 'Infants', 'Not Paid', 'Paid Card/QR',
-        'Refunds', 'Deportees', 'Transit', 'Waivers', 'Prepaid Bank', 'Round Trip', 'Late Payment', 'Total Attended',
-        'IICS Infant', 'IICS Adult', 'IICS Total', 'GIA Infant', 'GIA Adult', 'GIA Total', 'IICS-Total Difference', 
-        'GIA-Total Difference', 'Status', 'Submitted By', 'Verified By', 'Remarks'
-    ]
-    writer.writerow(headers)
-    
-    # Write data rows
-    for report in reports:
-        writer.writerow([
-            report.date.strftime('%Y-%m-%d'),
-            report.ref_no,
-            report.supervisor,
-            report.flight_name,
-            report.zone,
-            report.paid,
-            report.diplomats,
-            report.infants,
-            report.not_paid,
-            report.paid_card_qr,
-            report.refunds,
-            report.deportees,
-            report.transit,
-            report.waivers,
-            report.prepaid_bank,
-            report.round_trip,
-            report.late_payment,
-            report.total_attended,
-            report.iics_infant,
-            report.iics_adult,
-            report.iics_total,
-            report.gia_infant,
-            report.gia_adult,
-            report.gia_total,
-            (report.iics_total or 0) - (report.total_attended or 0),  # IICS - Total Attended
-            (report.gia_total or 0) - (report.total_attended or 0),   # GIA - Total Attended
-            'Verified' if report.verified else 'Pending',
-            report.submitter.username if report.submitter else '',
-            report.verified_by.username if report.verified_by else '',
-            report.remarks or ''
-        ])
-    
-    # Create response
-    response = make_response(output.getvalue())
-    response.headers['Content-Disposition'] = f'attachment; filename=cash-collection-report.csv'
-    response.headers['Content-type'] = 'text/csv'
-    
-    return response
+
+    def drain():
+        data = output.getvalue()
+        output.seek(0)
+        output.truncate(0)
+        return data
+
+    # Send the header before the query runs so the download starts immediately
+    writer.writerow(CSV_HEADERS)
+    yield drain()
+
+    # yield_per streams rows from a server-side cursor instead of loading them all.
+    # The csv module writes dates in ISO format and None as an empty field.
+    count = 0
+    for count, report in enumerate(query.yield_per(chunk_size), start=1):
+        writer.writerow(report_to_row(report))
+        if count % chunk_size == 0:
+            if on_rows:
+                on_rows(count)
+            yield drain()
+
+    if on_rows:
+        on_rows(count)
+
+    remaining = drain()
+    if remaining:
+        yield remaining
+
+# Columnar formats need the optional pyarrow package: pip install pyarrow
+COLUMNAR_FORMATS = {
+    'parquet': ('application/vnd.apache.parquet', 'parquet'),
+    'arrow': ('application/vnd.apache.arrow.file', 'arrow'),
+}
+
+# Every download format as format -> (mimetype, file extension)
+EXPORT_FORMATS = {'csv': ('text/csv', 'csv'), **COLUMNAR_FORMATS}
+
+def columnar_available():
+    """True when pyarrow is installed"""
+    return importlib.util.find_spec('pyarrow') is not None
+
+def export_schema():
+    """pyarrow schema for EXPORT_COLUMNS"""
+    import pyarrow as pa
+
+    types = {'date': pa.date32(), 'int': pa.int32(), 'string': pa.string()}
+    return pa.schema([pa.field(name, types[column_type]) for header, name, column_type in EXPORT_COLUMNS])
+
+class _StreamSink(io.RawIOBase):
+    """Write-only file that buffers output until drained, keeping the absolute position writers rely on"""
+
+    def __init__(self):
+        super().__init__()
+        self._chunks = []
+        self._position = 0
+
+    def writable(self):
+        return True
+
+    def write(self, data):
+        self._chunks.append(bytes(data))
+        self._position += len(data)
+        return len(data)
+
+    def tell(self):
+        return self._position
+
+    def drain(self):
+        data = b''.join(self._chunks)
+        self._chunks = []
+        return data
+
+def iter_columnar(query, fmt, batch_size=COLUMNAR_BATCH_SIZE, on_rows=None):
+    """
+    Generate a Parquet or Arrow IPC file for a report query in batches
+
+    Rows are fetched with yield_per and converted to typed columns; each
+    batch becomes one Parquet row group or Arrow record batch and is sent
+    as soon as it is written.
+
+    Args:
+        query: Report query to export, already filtered and ordered
+        fmt: 'parquet' or 'arrow'
+        batch_size: Rows per row group / record batch
+        on_rows: Optional callback receiving the number of rows written so far
+
+    Yields:
+        File content as bytes
+    """
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    schema = export_schema()
+    sink = _StreamSink()
+    if fmt == 'parquet':
+        writer = pq.ParquetWriter(sink, schema, compression='snappy')
+    else:
+        writer = pa.ipc.new_file(sink, schema)
+
+    def write(rows):
+        columns = [list(values) for values in zip(*rows)]
+        writer.write_batch(pa.RecordBatch.from_arrays(
+            [pa.array(values, type=field.type) for values, field in zip(columns, schema)],
+            schema=schema
+        ))
+
+    rows = []
+    count = 0
+    for count, report in enumerate(query.yield_per(min(batch_size, EXPORT_CHUNK_SIZE)), start=1):
+        rows.append(report_to_row(report))
+        if len(rows) == batch_size:
+            write(rows)
+            rows = []
+            if on_rows:
+                on_rows(count)
+            yield sink.drain()
+
+    if rows:
+        write(rows)
+    writer.close()
+    if on_rows:
+        on_rows(count)
+    yield sink.drain()
+
+def iter_export(query, fmt, on_rows=None):
+    """
+    Generate an export file in any of EXPORT_FORMATS as bytes
+
+    Args:
+        query: Report query to export, already filtered and ordered
+        fmt: Key of EXPORT_FORMATS
+        on_rows: Optional callback receiving the number of rows written so far
+
+    Yields:
+        File content as bytes
+    """
+    if fmt == 'csv':
+        return (text.encode('utf-8') for text in iter_csv(query, on_rows=on_rows))
+    return iter_columnar(query, fmt, on_rows=on_rows)
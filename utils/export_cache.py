@@ -0,0 +1,155 @@
+import hashlib
+import json
+import os
+import threading
+import time
+
+from flask import Response, current_app, request, send_file, stream_with_context
+from sqlalchemy import func
+
+from extensions import db
+from models import DailyReportSummary
+from utils.export import EXPORT_FORMATS, iter_export
+
+# Finished exports on disk, named by content key. Lookups touch the file's
+# mtime, so eviction by oldest mtime is least recently used.
+_lock = threading.Lock()
+
+def cache_dir():
+    """Directory holding cached export files"""
+    path = current_app.config['EXPORT_CACHE_DIR'] or os.path.join(current_app.instance_path, 'export-cache')
+    os.makedirs(path, exist_ok=True)
+    return path
+
+def data_version(filters):
+    """
+    Version of the reports an export with these filters reads
+
+    Built from the daily summary rows in the date range: their revisions
+    are bumped whenever a report on that day is submitted, updated or
+    verified. Supervisor and flight filters are not narrowed on, so the
+    version may change when nothing in the export did. Report edits that
+    bypass the summary (direct SQL, deleting a flight or supervisor that
+    reports point to) are not seen; clear EXPORT_CACHE_DIR after those.
+    """
+    query = db.session.query(
+        func.count(DailyReportSummary.id),
+        func.coalesce(func.sum(DailyReportSummary.revision), 0),
+        func.max(DailyReportSummary.updated_at),
+    )
+    if filters.get('start_date'):
+        query = query.filter(DailyReportSummary.date >= filters['start_date'])
+    if filters.get('end_date'):
+        query = query.filter(DailyReportSummary.date <= filters['end_date'])
+
+    row_count, revisions, updated_at = query.one()
+    return f"{row_count}:{revisions}:{updated_at.isoformat() if updated_at else ''}"
+
+def cache_key(filters, fmt):
+    """Content key for an export: normalized filters, format and data version"""
+    payload = json.dumps([fmt, sorted(filters.items()), data_version(filters)], separators=(',', ':'))
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+def _path(key, fmt):
+    mimetype, extension = EXPORT_FORMATS[fmt]
+    return os.path.join(cache_dir(), f'{key}.{extension}')
+
+def lookup(key, fmt):
+    """Path of a cached export, or None"""
+    path = _path(key, fmt)
+    # An explicit time: the kernel's own "now" is coarser than the mtime of
+    # a file written moments ago, which would make this lookup look older
+    now = time.time_ns()
+    try:
+        os.utime(path, ns=(now, now))
+    except FileNotFoundError:
+        return None
+    return path
+
+def evict():
+    """Delete the least recently used exports until the cache fits EXPORT_CACHE_MAX_BYTES"""
+    directory = cache_dir()
+    limit = current_app.config['EXPORT_CACHE_MAX_BYTES']
+
+    with _lock:
+        entries = []
+        for entry in os.scandir(directory):
+            if entry.is_file() and not entry.name.endswith('.part'):
+                stat = entry.stat()
+                entries.append((stat.st_mtime, stat.st_size, entry.path))
+
+        total = sum(size for mtime, size, path in entries)
+        for mtime, size, path in sorted(entries):
+            if total <= limit:
+                break
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            total -= size
+
+def store(key, fmt, chunks):
+    """
+    Pass export chunks through while writing them to the cache
+
+    The file is only added once the export completes; an interrupted
+    download leaves nothing behind.
+
+    Yields:
+        The chunks, unchanged
+    """
+    path = _path(key, fmt)
+    partial = f'{path}.{os.getpid()}.{threading.get_ident()}.part'
+    completed = False
+
+    try:
+        with open(partial, 'wb') as handle:
+            for chunk in chunks:
+                handle.write(chunk)
+                yield chunk
+        os.replace(partial, path)
+        completed = True
+    finally:
+        if not completed and os.path.exists(partial):
+            os.remove(partial)
+
+    evict()
+
+def export_response(filters, fmt, build_query):
+    """
+    Serve an export from the cache, generating and caching it on a miss
+
+    The ETag is the content key, so a client holding the current version
+    gets 304 without the file being read.
+
+    Args:
+        filters: Normalized filters (utils.filters.normalize_filters)
+        fmt: Key of EXPORT_FORMATS
+        build_query: Callable returning the ordered report query, or None
+                     when nothing matches
+
+    Returns:
+        Flask response, or None when build_query found no rows
+    """
+    mimetype, extension = EXPORT_FORMATS[fmt]
+    download_name = f'cash-collection-report.{extension}'
+    key = cache_key(filters, fmt)
+
+    if request.if_none_match.contains(key):
+        response = Response(status=304)
+        response.set_etag(key)
+        return response
+
+    path = lookup(key, fmt)
+    if path:
+        return send_file(path, mimetype=mimetype, as_attachment=True, download_name=download_name,
+                         etag=key, conditional=True)
+
+    query = build_query()
+    if query is None:
+        return None
+
+    response = Response(stream_with_context(store(key, fmt, iter_export(query, fmt))), mimetype=mimetype)
+    response.headers['Content-Disposition'] = f'attachment; filename={download_name}'
+    response.set_etag(key)
+    return response
@@ -0,0 +1,266 @@
+import hashlib
+import json
+import logging
+import os
+import re
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+from flask import current_app
+from werkzeug.datastructures import MultiDict
+
+from extensions import db
+from models import Report
+from utils.export import EXPORT_FORMATS, iter_export
+from utils.filters import apply_report_filters, normalize_filters
+
+_JOB_ID = re.compile(r'^[0-9a-f]{32}$')
+
+logger = logging.getLogger(__name__)
+
+# Job state lives in JSON files next to the artifacts, so any worker process
+# on the host can report progress and serve the download
+_lock = threading.Lock()
+_executor = None
+
+def export_dir():
+    """Directory holding export artifacts and job state"""
+    path = current_app.config['EXPORT_DIR'] or os.path.join(current_app.instance_path, 'exports')
+    os.makedirs(path, exist_ok=True)
+    return path
+
+def job_key(filters, fmt):
+    """Stable key for deduplicating exports of the same rows and format"""
+    payload = json.dumps([fmt, sorted(filters.items())], separators=(',', ':'))
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+def _state_path(directory, job_id):
+    return os.path.join(directory, f'{job_id}.json')
+
+def _key_path(directory, key):
+    return os.path.join(directory, f'key-{key}')
+
+def _write_json(path, data):
+    # Write then rename so readers never see a partial file
+    temporary = f'{path}.{threading.get_ident()}.tmp'
+    with open(temporary, 'w') as handle:
+        json.dump(data, handle)
+    os.replace(temporary, path)
+
+def artifact_path(job):
+    mimetype, extension = EXPORT_FORMATS[job['format']]
+    return os.path.join(export_dir(), f"{job['id']}.{extension}")
+
+def get_job(job_id):
+    """
+    Load a job's state
+
+    Returns:
+        Job dict, or None when the id is unknown or expired
+    """
+    if not _JOB_ID.match(job_id or ''):
+        return None
+    try:
+        with open(_state_path(export_dir(), job_id)) as handle:
+            return json.load(handle)
+    except (FileNotFoundError, ValueError):
+        return None
+
+def _save(job):
+    _write_json(_state_path(export_dir(), job['id']), job)
+
+def _get_executor():
+    global _executor
+
+    if _executor is None:
+        with _lock:
+            # Created on first use so each forked worker gets its own threads
+            if _executor is None:
+                _executor = ThreadPoolExecutor(
+                    max_workers=current_app.config['EXPORT_JOB_WORKERS'],
+                    thread_name_prefix='export-job'
+                )
+    return _executor
+
+# Queued or running jobs outlive EXPORT_JOB_TTL by this factor before they
+# are treated as abandoned by a worker that died
+ACTIVE_JOB_TTL_FACTOR = 10
+
+def _active_jobs(directory, cutoff):
+    """Ids of queued or running jobs whose state is newer than cutoff"""
+    active = set()
+    for name in os.listdir(directory):
+        job_id, extension = os.path.splitext(name)
+        if extension != '.json' or not _JOB_ID.match(job_id):
+            continue
+        job = get_job(job_id)
+        try:
+            if job and job['status'] in ('queued', 'running') and \
+                    os.path.getmtime(_state_path(directory, job_id)) >= cutoff:
+                active.add(job_id)
+        except FileNotFoundError:
+            pass
+    return active
+
+def purge_expired():
+    """
+    Delete job state and artifacts older than EXPORT_JOB_TTL seconds
+
+    Queued and running jobs are kept, with their key and partial files, so
+    clients polling a slow export do not lose it; only when their state has
+    not changed for ACTIVE_JOB_TTL_FACTOR times the TTL are they purged.
+    """
+    directory = export_dir()
+    ttl = current_app.config['EXPORT_JOB_TTL']
+    now = time.time()
+    active = _active_jobs(directory, now - ttl * ACTIVE_JOB_TTL_FACTOR)
+
+    for name in os.listdir(directory):
+        path = os.path.join(directory, name)
+        try:
+            if name.startswith('key-'):
+                with open(path) as handle:
+                    owner = handle.read().strip()
+            else:
+                owner = name.split('.', 1)[0]
+            if owner in active:
+                continue
+            if os.path.getmtime(path) < now - ttl:
+                os.remove(path)
+        except FileNotFoundError:
+            pass
+
+def _claim_key(directory, key):
+    """
+    Create the key file for a new job, failing if it exists
+
+    O_EXCL makes the check and the creation one step, so of several worker
+    processes starting the same export only one gets the key.
+
+    Returns:
+        File descriptor to write the job id to, or None when the key is taken
+    """
+    try:
+        return os.open(_key_path(directory, key), os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+    except FileExistsError:
+        return None
+
+def _job_for_key(directory, key):
+    """
+    The job a key file points to
+
+    A key file is created empty and the id written right after, so an empty
+    file is read again for a moment before it counts as abandoned.
+
+    Returns:
+        Tuple of (job id or None, job dict or None)
+    """
+    for _ in range(20):
+        try:
+            with open(_key_path(directory, key)) as handle:
+                job_id = handle.read().strip()
+        except FileNotFoundError:
+            return None, None
+        if job_id:
+            return job_id, get_job(job_id)
+        time.sleep(0.05)
+    return '', None
+
+def _release_key(directory, key, job_id):
+    """Remove a key file, unless another process has already replaced it"""
+    path = _key_path(directory, key)
+    try:
+        with open(path) as handle:
+            if handle.read().strip() == job_id:
+                os.remove(path)
+    except FileNotFoundError:
+        pass
+
+def submit_export(args, fmt):
+    """
+    Start an export job, or return a recent job for the same filters and format
+
+    Job creation is deduplicated across worker processes through the key
+    file (see _claim_key).
+
+    Args:
+        args: Request arguments holding the filters
+        fmt: Key of EXPORT_FORMATS
+
+    Returns:
+        Job dict
+    """
+    directory = export_dir()
+    filters = normalize_filters(args)
+    key = job_key(filters, fmt)
+
+    with _lock:
+        purge_expired()
+
+    while True:
+        descriptor = _claim_key(directory, key)
+        if descriptor is not None:
+            break
+        # Reuse a queued, running or finished job; failed and expired jobs are retried
+        job_id, existing = _job_for_key(directory, key)
+        if existing and existing['status'] != 'failed':
+            return existing
+        if job_id is not None:
+            _release_key(directory, key, job_id)
+
+    job = {
+        'id': uuid.uuid4().hex,
+        'key': key,
+        'format': fmt,
+        'filters': filters,
+        'status': 'queued',
+        'rowsWritten': 0,
+        'totalRows': None,
+        'error': None,
+        'createdAt': time.time(),
+        'finishedAt': None,
+    }
+    # State first, so a process that reads the id always finds the job
+    _save(job)
+    with os.fdopen(descriptor, 'w') as handle:
+        handle.write(job['id'])
+
+    # The worker thread updates its own copy
+    _get_executor().submit(_run, current_app._get_current_object(), dict(job))
+    return job
+
+def _run(app, job):
+    with app.app_context():
+        try:
+            job['status'] = 'running'
+            query = apply_report_filters(
+                Report.query_with_users().filter_by(verified=True), MultiDict(job['filters'])
+            )
+            job['totalRows'] = query.order_by(None).count()
+            _save(job)
+
+            def on_rows(count):
+                job['rowsWritten'] = count
+                _save(job)
+
+            chunks = iter_export(query.order_by(Report.date.desc()), job['format'], on_rows=on_rows)
+
+            path = artifact_path(job)
+            with open(f'{path}.part', 'wb') as handle:
+                for chunk in chunks:
+                    handle.write(chunk)
+            os.replace(f'{path}.part', path)
+
+            job['status'] = 'done'
+        except Exception as e:
+            logger.exception('Export job %s failed', job['id'])
+            job['status'] = 'failed'
+            job['error'] = str(e)
+        finally:
+            # Release the connection as soon as the export is written
+            db.session.remove()
+
+        job['finishedAt'] = time.time()
+        _save(job)
@@ -0,0 +1,58 @@
+from sqlalchemy import select
+
+from models import Report, Flight, FlightSupervisor
+
+# Request arguments read by apply_report_filters
+FILTER_ARGS = ('supervisor', 'supervisor_id', 'flight', 'flight_id', 'start_date', 'end_date')
+
+def normalize_filters(args):
+    """The filter arguments apply_report_filters uses, stripped and with empty values dropped"""
+    filters = {}
+    for name in FILTER_ARGS:
+        value = (args.get(name) or '').strip()
+        if value:
+            filters[name] = value
+    return filters
+
+def apply_report_filters(query, args):
+    """
+    Apply the supervisor, flight and date range filters used by the report listings
+
+    Supervisor and flight are matched on their ids. An explicit supervisor_id or
+    flight_id is used as is; free text matches reference names by prefix, which
+    only touches the small reference tables.
+
+    Args:
+        query: Report query to filter
+        args: Request arguments (supervisor, supervisor_id, flight, flight_id,
+              start_date, end_date)
+
+    Returns:
+        Filtered query
+    """
+    supervisor_id = args.get('supervisor_id', type=int)
+    supervisor = args.get('supervisor', '').strip()
+    flight_id = args.get('flight_id', type=int)
+    flight = args.get('flight', '').strip()
+    start_date = args.get('start_date', '')
+    end_date = args.get('end_date', '')
+
+    if supervisor_id:
+        query = query.filter(Report.supervisor_id == supervisor_id)
+    elif supervisor:
+        matching = select(FlightSupervisor.id).where(FlightSupervisor.name.startswith(supervisor, autoescape=True))
+        query = query.filter(Report.supervisor_id.in_(matching))
+
+    if flight_id:
+        query = query.filter(Report.flight_id == flight_id)
+    elif flight:
+        matching = select(Flight.id).where(Flight.name.startswith(flight, autoescape=True))
+        query = query.filter(Report.flight_id.in_(matching))
+
+    if start_date:
+        query = query.filter(Report.date >= start_date)
+
+    if end_date:
+        query = query.filter(Report.date <= end_date)
+
+    return query
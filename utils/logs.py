@@ -0,0 +1,230 @@
+import atexit
+import itertools
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import sys
+import threading
+from datetime import datetime, timezone
+
+from flask import has_request_context, request
+
+# Attributes every LogRecord has; anything else was passed with extra=
+_RECORD_ATTRIBUTES = frozenset(vars(logging.LogRecord('', 0, '', 0, '', (), None))) | {'message', 'asctime'}
+
+_lock = threading.Lock()
+_handler = None
+_listener = None
+_settings = None
+
+def parse_levels(value):
+    """
+    Parse "logger=LEVEL,logger=LEVEL" into a dict of logger name to level name
+
+    Raises:
+        ValueError: For an entry without "=" or an unknown level
+    """
+    levels = {}
+    for entry in filter(None, (part.strip() for part in (value or '').split(','))):
+        name, separator, level = entry.partition('=')
+        level = level.strip().upper()
+        if not separator or not isinstance(logging.getLevelName(level), int):
+            raise ValueError(f'Invalid log level setting: {entry!r}')
+        levels[name.strip()] = level
+    return levels
+
+def parse_rates(value):
+    """
+    Parse "logger=rate,logger=rate" into a dict of logger name to the share of records kept
+
+    Raises:
+        ValueError: For an entry without "=" or a rate outside 0..1
+    """
+    rates = {}
+    for entry in filter(None, (part.strip() for part in (value or '').split(','))):
+        name, separator, rate = entry.partition('=')
+        if not separator or not 0 <= float(rate) <= 1:
+            raise ValueError(f'Invalid log sampling setting: {entry!r}')
+        rates[name.strip()] = float(rate)
+    return rates
+
+class RequestContextFilter(logging.Filter):
+    """Add the current request to records, before they leave the request thread"""
+
+    def filter(self, record):
+        if has_request_context():
+            record.request = {'method': request.method, 'path': request.path, 'endpoint': request.endpoint}
+        return True
+
+class SamplingFilter(logging.Filter):
+    """
+    Keep a fixed share of records below WARNING for the configured loggers
+
+    Rates apply to a logger and its children; the most specific name wins.
+    Counting instead of random draws keeps the kept share exact.
+    """
+
+    def __init__(self, rates):
+        super().__init__()
+        self.rates = rates
+        self.counters = {}
+
+    def _rate(self, name):
+        while name:
+            if name in self.rates:
+                return name, self.rates[name]
+            name = name.rpartition('.')[0]
+        return None, 1.0
+
+    def filter(self, record):
+        if record.levelno >= logging.WARNING:
+            return True
+        name, rate = self._rate(record.name)
+        if rate >= 1.0:
+            return True
+        if rate <= 0.0:
+            return False
+        # next() on itertools.count is atomic under the GIL
+        counter = self.counters.get(name) or self.counters.setdefault(name, itertools.count())
+        position = next(counter)
+        return int(position * rate) != int((position + 1) * rate)
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line, with request details and extra= fields"""
+
+    def format(self, record):
+        entry = {
+            'time': datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec='milliseconds'),
+            'level': record.levelname,
+            'logger': record.name,
+            'message': record.getMessage(),
+            'process': record.process,
+            'thread': record.threadName,
+        }
+        entry.update((key, value) for key, value in vars(record).items() if key not in _RECORD_ATTRIBUTES)
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            entry['exception'] = record.exc_text
+        return json.dumps(entry, default=str)
+
+class TextFormatter(logging.Formatter):
+    def __init__(self):
+        super().__init__('%(asctime)s %(levelname)s [%(name)s] %(message)s')
+
+class DroppingQueueHandler(logging.handlers.QueueHandler):
+    """
+    QueueHandler that never blocks the logging thread
+
+    Records are made picklable-simple here, in the calling thread: the
+    message is interpolated and tracebacks are rendered to text. All other
+    formatting and the I/O happen on the listener thread. When the queue
+    is full the record is dropped and counted.
+    """
+
+    def __init__(self, log_queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def prepare(self, record):
+        record.message = record.getMessage()
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+        record.msg = record.message
+        record.args = None
+        record.exc_info = None
+        return record
+
+    def enqueue(self, record):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+def dropped_records():
+    """Number of records dropped because the log queue was full, in this process"""
+    handler = _handler
+    return getattr(handler, 'dropped', 0)
+
+def _output_handler(settings):
+    if settings['LOG_FILE']:
+        handler = logging.FileHandler(settings['LOG_FILE'])
+    else:
+        handler = logging.StreamHandler(sys.stderr)
+    handler.setFormatter(JsonFormatter() if settings['LOG_FORMAT'] == 'json' else TextFormatter())
+    return handler
+
+def _install(settings):
+    global _handler, _listener
+
+    output = _output_handler(settings)
+    if settings['LOG_QUEUE_SIZE'] > 0:
+        handler = DroppingQueueHandler(queue.Queue(settings['LOG_QUEUE_SIZE']))
+        _listener = logging.handlers.QueueListener(handler.queue, output, respect_handler_level=True)
+        _listener.start()
+    else:
+        handler = output
+    handler.addFilter(RequestContextFilter())
+    rates = parse_rates(settings['LOG_SAMPLING'])
+    if rates:
+        handler.addFilter(SamplingFilter(rates))
+
+    logging.getLogger().addHandler(handler)
+    _handler = handler
+
+def shutdown():
+    """Write out queued records and detach the handler; runs at exit"""
+    global _handler, _listener
+
+    if _listener is not None:
+        # Writes out everything still queued
+        _listener.stop()
+        _listener = None
+    if _handler is not None:
+        logging.getLogger().removeHandler(_handler)
+        _handler.close()
+        _handler = None
+
+def _restart_after_fork():
+    # The listener thread does not survive fork; give the child its own
+    global _listener
+
+    if _listener is not None and _settings is not None:
+        _listener = None
+        logging.getLogger().removeHandler(_handler)
+        _install(_settings)
+
+def configure_logging(app):
+    """
+    Route all logging through one handler configured from the app config
+
+    With LOG_QUEUE_SIZE above zero, records are put on a bounded queue and
+    written by a listener thread, so request threads never wait on log I/O.
+    Levels are set on the root logger (LOG_LEVEL) and per logger
+    (LOG_LEVELS), so disabled records are never created. Blueprint loggers
+    are named after their module, e.g. routes.team_lead.
+
+    Calling it again, e.g. for a second app in the same process, replaces
+    the previous configuration.
+    """
+    global _settings
+
+    settings = {key: app.config[key] for key in (
+        'LOG_LEVEL', 'LOG_LEVELS', 'LOG_FORMAT', 'LOG_FILE', 'LOG_QUEUE_SIZE', 'LOG_SAMPLING'
+    )}
+
+    with _lock:
+        shutdown()
+
+        root = logging.getLogger()
+        root.setLevel(settings['LOG_LEVEL'].upper())
+        for name, level in parse_levels(settings['LOG_LEVELS']).items():
+            logging.getLogger(name).setLevel(level)
+
+        _install(settings)
+        if _settings is None:
+            atexit.register(shutdown)
+            os.register_at_fork(after_in_child=_restart_after_fork)
+        _settings = settings
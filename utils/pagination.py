@@ -0,0 +1,112 @@
+import base64
+import json
+from datetime import date
+
+from flask import current_app, jsonify, request
+from sqlalchemy import and_, or_
+
+from models import Report
+
+
+class InvalidCursor(ValueError):
+    """Raised when a pagination cursor cannot be decoded"""
+
+
+def encode_cursor(report):
+    """
+    Build an opaque cursor pointing just after the given report
+
+    Args:
+        report: Last Report object of the current page
+
+    Returns:
+        URL-safe cursor string
+    """
+    payload = json.dumps([report.date.isoformat(), report.id], separators=(',', ':'))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip('=')
+
+
+def decode_cursor(cursor):
+    """
+    Decode a cursor produced by encode_cursor
+
+    Args:
+        cursor: Cursor string from the request
+
+    Returns:
+        Tuple of (date, id)
+    """
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        cursor_date, cursor_id = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        return date.fromisoformat(cursor_date), int(cursor_id)
+    except (ValueError, TypeError) as e:
+        raise InvalidCursor('Invalid cursor') from e
+
+
+def parse_limit(value):
+    """Clamp the requested page size to the configured bounds"""
+    default = current_app.config['REPORTS_PAGE_SIZE']
+    maximum = current_app.config['REPORTS_MAX_PAGE_SIZE']
+    try:
+        limit = int(value) if value else default
+    except ValueError:
+        limit = default
+    return max(1, min(limit, maximum))
+
+
+def paginate_reports(query, cursor=None, limit=None):
+    """
+    Keyset (seek) pagination over reports ordered by (date, id) descending
+
+    Args:
+        query: Report query with filters already applied
+        cursor: Optional cursor string from a previous page
+        limit: Optional requested page size
+
+    Returns:
+        Tuple of (list of Report objects, next cursor or None)
+    """
+    limit = parse_limit(limit)
+
+    if cursor:
+        cursor_date, cursor_id = decode_cursor(cursor)
+        query = query.filter(or_(
+            Report.date < cursor_date,
+            and_(Report.date == cursor_date, Report.id < cursor_id)
+        ))
+
+    # Fetch one extra row to find out whether another page exists
+    reports = query.order_by(Report.date.desc(), Report.id.desc()).limit(limit + 1).all()
+
+    next_cursor = None
+    if len(reports) > limit:
+        reports = reports[:limit]
+        next_cursor = encode_cursor(reports[-1])
+
+    return reports, next_cursor
+
+
+def paginated_reports_response(query):
+    """
+    Paginate a report query using the cursor and limit request arguments
+
+    Args:
+        query: Report query with filters already applied
+
+    Returns:
+        JSON response with the page of reports and the next cursor
+    """
+    try:
+        reports, next_cursor = paginate_reports(
+            query,
+            cursor=request.args.get('cursor'),
+            limit=request.args.get('limit')
+        )
+    except InvalidCursor as e:
+        return jsonify({'error': str(e)}), 400
+
+    return jsonify({
+        'reports': [report.to_dict() for report in reports],
+        'next_cursor': next_cursor
+    })
@@ -0,0 +1,55 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+
+from flask import current_app
+from werkzeug.security import check_password_hash, generate_password_hash
+
+# Hashing runs in a small per-process pool: hashlib releases the GIL while
+# hashing, and the pool size caps how many hashes compete for CPU at once
+_lock = threading.Lock()
+_executor = None
+
+def _get_executor():
+    global _executor
+
+    if _executor is None:
+        with _lock:
+            # Created on first use so each forked worker gets its own threads
+            if _executor is None:
+                _executor = ThreadPoolExecutor(
+                    max_workers=current_app.config['PASSWORD_HASH_WORKERS'],
+                    thread_name_prefix='password-hash'
+                )
+    return _executor
+
+def _method():
+    return current_app.config['PASSWORD_HASH_METHOD']
+
+def _parse_method(method):
+    """Split a werkzeug method string into its name and parameters: "pbkdf2:sha256:600000" -> ('pbkdf2', ('sha256', 600000))"""
+    name, *params = method.split(':')
+    return name, tuple(int(param) if param.isdigit() else param for param in params)
+
+@lru_cache(maxsize=8)
+def _policy(method):
+    # werkzeug fills in default parameters ("pbkdf2" -> "pbkdf2:sha256:<iterations>"),
+    # so read the full method back from a hash instead of the setting alone
+    return _parse_method(generate_password_hash('', method=method).split('$', 1)[0])
+
+def hash_password(password):
+    """Hash a password with the configured PASSWORD_HASH_METHOD"""
+    return _get_executor().submit(generate_password_hash, password, _method()).result()
+
+def verify_password(password_hash, password):
+    """Check a password against a stored hash on the hashing pool"""
+    return _get_executor().submit(check_password_hash, password_hash, password).result()
+
+def needs_rehash(password_hash):
+    """
+    True when a stored hash was made with a different method or cost than the configured one
+
+    Compares the algorithm and every parameter, so a change of iteration
+    count or scrypt cost alone also triggers a rehash.
+    """
+    return _parse_method(password_hash.split('$', 1)[0]) != _policy(_method())
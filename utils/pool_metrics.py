@@ -0,0 +1,97 @@
+import os
+import threading
+import time
+
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import QueuePool
+
+# Upper bounds (seconds) of the checkout wait histogram buckets
+WAIT_BUCKETS = (0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 30.0)
+
+class PoolStats:
+    """Process-wide counters for connection checkouts"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.checkouts = 0
+        self.timeouts = 0
+        self.wait_seconds_total = 0.0
+        self.wait_seconds_max = 0.0
+        self.bucket_counts = [0] * len(WAIT_BUCKETS)
+
+    def observe(self, seconds, timed_out=False):
+        with self._lock:
+            if timed_out:
+                self.timeouts += 1
+            else:
+                self.checkouts += 1
+            self.wait_seconds_total += seconds
+            self.wait_seconds_max = max(self.wait_seconds_max, seconds)
+            for index, bound in enumerate(WAIT_BUCKETS):
+                if seconds <= bound:
+                    self.bucket_counts[index] += 1
+                    break
+
+    def snapshot(self):
+        with self._lock:
+            observed = self.checkouts + self.timeouts
+            return {
+                'checkouts': self.checkouts,
+                'timeouts': self.timeouts,
+                'wait_seconds_total': self.wait_seconds_total,
+                'wait_seconds_avg': self.wait_seconds_total / observed if observed else 0.0,
+                'wait_seconds_max': self.wait_seconds_max,
+                # Cumulative counts, Prometheus style; waits above the last bound only appear in +Inf
+                'wait_buckets': {
+                    str(bound): sum(self.bucket_counts[:index + 1])
+                    for index, bound in enumerate(WAIT_BUCKETS)
+                } | {'+Inf': observed},
+            }
+
+pool_stats = PoolStats()
+
+class InstrumentedQueuePool(QueuePool):
+    """QueuePool that records how long each checkout waits for a connection"""
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        except PoolTimeoutError:
+            pool_stats.observe(time.perf_counter() - start, timed_out=True)
+            raise
+        pool_stats.observe(time.perf_counter() - start)
+        return connection
+
+def pool_status(engine):
+    """
+    Current pool utilization and checkout statistics for this process
+
+    Args:
+        engine: SQLAlchemy engine
+
+    Returns:
+        Dict suitable for JSON output
+    """
+    pool = engine.pool
+    status = {
+        'pid': os.getpid(),
+        'pool_class': type(pool).__name__,
+        'status': pool.status(),
+    }
+
+    if isinstance(pool, QueuePool):
+        size = pool.size()
+        checked_out = pool.checkedout()
+        capacity = size + max(pool._max_overflow, 0)
+        status.update({
+            'size': size,
+            'max_overflow': pool._max_overflow,
+            'checked_in': pool.checkedin(),
+            'checked_out': checked_out,
+            'overflow': pool.overflow(),
+            'utilization': checked_out / capacity if capacity else None,
+        })
+
+    status.update(pool_stats.snapshot())
+    return status
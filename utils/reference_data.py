@@ -0,0 +1,85 @@
+import threading
+import time
+from collections import namedtuple
+
+from flask import current_app, jsonify, request
+
+from models import Flight, FlightSupervisor
+
+ReferenceItem = namedtuple('ReferenceItem', ['id', 'name'])
+
+class ReferenceData:
+    """Immutable snapshot of flights and supervisors shared by all requests in a process"""
+
+    def __init__(self, flights, supervisors):
+        self.flights = tuple(flights)
+        self.supervisors = tuple(supervisors)
+        self.flight_names = [flight.name for flight in self.flights]
+        self.supervisor_names = [supervisor.name for supervisor in self.supervisors]
+        self.flight_ids = {flight.name: flight.id for flight in self.flights}
+        self.supervisor_ids = {supervisor.name: supervisor.id for supervisor in self.supervisors}
+
+    def flight_choices(self, placeholder='Select Flight'):
+        """SelectField choices for flights, valued by name"""
+        return [('', placeholder)] + [(name, name) for name in self.flight_names]
+
+    def supervisor_choices(self, placeholder='Select Supervisor'):
+        """SelectField choices for supervisors, valued by name"""
+        return [('', placeholder)] + [(name, name) for name in self.supervisor_names]
+
+_lock = threading.Lock()
+_snapshot = None
+_loaded_at = 0.0
+
+def _load():
+    flights = [ReferenceItem(flight.id, flight.name) for flight in Flight.query.order_by(Flight.id)]
+    supervisors = [ReferenceItem(supervisor.id, supervisor.name)
+                   for supervisor in FlightSupervisor.query.order_by(FlightSupervisor.id)]
+    return ReferenceData(flights, supervisors)
+
+def get_reference_data():
+    """
+    Return the cached flights and supervisors, loading them if needed
+
+    The snapshot is reloaded after invalidate() and, so that other worker
+    processes also pick up admin edits, once it is older than
+    REFERENCE_DATA_TTL seconds.
+
+    Returns:
+        ReferenceData snapshot
+    """
+    global _snapshot, _loaded_at
+
+    ttl = current_app.config['REFERENCE_DATA_TTL']
+    snapshot = _snapshot
+    if snapshot is not None and time.monotonic() - _loaded_at < ttl:
+        return snapshot
+
+    with _lock:
+        # Another thread may have reloaded while we waited for the lock
+        if _snapshot is None or time.monotonic() - _loaded_at >= ttl:
+            _snapshot = _load()
+            _loaded_at = time.monotonic()
+        return _snapshot
+
+def invalidate():
+    """Drop the cached snapshot; call after committing a flight or supervisor change"""
+    global _snapshot
+
+    with _lock:
+        _snapshot = None
+
+def conditional_json(payload):
+    """
+    JSON response with an ETag, answering 304 when the client copy is current
+
+    Args:
+        payload: JSON-serializable data
+
+    Returns:
+        Flask response
+    """
+    response = jsonify(payload)
+    response.add_etag()
+    response.headers['Cache-Control'] = 'private, no-cache'
+    return response.make_conditional(request)
@@ -0,0 +1,231 @@
+import os
+import threading
+import time
+
+from flask import before_render_template, current_app, g, has_request_context, request, template_rendered
+from flask.json.provider import DefaultJSONProvider
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from utils.logs import dropped_records
+
+# Upper bounds of the request latency (seconds) and queries-per-request histogram buckets
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100)
+
+# Per-request phase durations, kept on flask.g
+PHASES = ('db', 'render', 'serialize')
+
+class Histogram:
+    """Cumulative-bucket histogram; callers hold the owning lock"""
+
+    def __init__(self, bounds):
+        self.bounds = bounds
+        self.counts = [0] * len(bounds)
+        self.total = 0
+        self.sum = 0.0
+
+    def observe(self, value):
+        self.total += 1
+        self.sum += value
+        for index, bound in enumerate(self.bounds):
+            if value <= bound:
+                self.counts[index] += 1
+                break
+
+    def snapshot(self):
+        return {
+            'buckets': [(bound, sum(self.counts[:index + 1])) for index, bound in enumerate(self.bounds)],
+            'count': self.total,
+            'sum': self.sum,
+        }
+
+class EndpointStats:
+    def __init__(self):
+        self.latency = Histogram(LATENCY_BUCKETS)
+        self.queries = Histogram(QUERY_BUCKETS)
+        self.phase_seconds = dict.fromkeys(PHASES, 0.0)
+
+class RequestMetrics:
+    """Process-wide per-endpoint request statistics"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._endpoints = {}
+
+    def observe(self, endpoint, seconds, query_count, phase_seconds):
+        with self._lock:
+            stats = self._endpoints.get(endpoint)
+            if stats is None:
+                stats = self._endpoints[endpoint] = EndpointStats()
+            stats.latency.observe(seconds)
+            stats.queries.observe(query_count)
+            for phase, value in phase_seconds.items():
+                stats.phase_seconds[phase] += value
+
+    def snapshot(self):
+        with self._lock:
+            return {
+                endpoint: {
+                    'latency': stats.latency.snapshot(),
+                    'queries': stats.queries.snapshot(),
+                    'phase_seconds': dict(stats.phase_seconds),
+                }
+                for endpoint, stats in sorted(self._endpoints.items())
+            }
+
+request_metrics = RequestMetrics()
+
+def _timings():
+    # Only requests are attributed; background jobs run in a bare app context
+    if has_request_context():
+        return g.get('request_timings')
+    return None
+
+def _add(phase, seconds):
+    timings = _timings()
+    if timings is not None:
+        timings[phase] += seconds
+
+class TimedJSONProvider(DefaultJSONProvider):
+    """JSON provider that attributes jsonify() time to the current request"""
+
+    def response(self, *args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return super().response(*args, **kwargs)
+        finally:
+            _add('serialize', time.perf_counter() - start)
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    # Kept on the execution context, so a failed statement leaves nothing behind
+    context.query_start = time.perf_counter()
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    timings = _timings()
+    if timings is not None:
+        timings['db'] += time.perf_counter() - context.query_start
+        timings['queries'] += 1
+
+def _before_render(sender, template, context, **extra):
+    timings = _timings()
+    if timings is not None:
+        timings['render_start'].append(time.perf_counter())
+
+def _after_render(sender, template, context, **extra):
+    timings = _timings()
+    if timings is not None and timings['render_start']:
+        timings['render'] += time.perf_counter() - timings['render_start'].pop()
+
+def _start_request():
+    g.request_timings = {'start': time.perf_counter(), 'queries': 0, 'render_start': [],
+                         **dict.fromkeys(PHASES, 0.0)}
+
+def _finish_request(response):
+    timings = g.pop('request_timings', None)
+    if timings is None:
+        return response
+
+    elapsed = time.perf_counter() - timings['start']
+    phase_seconds = {phase: timings[phase] for phase in PHASES}
+
+    # Unmatched URLs and static files would only add noise and label cardinality
+    if request.endpoint and request.endpoint != 'static':
+        request_metrics.observe(request.endpoint, elapsed, timings['queries'], phase_seconds)
+
+    if current_app.config['SERVER_TIMING']:
+        entries = [f'db;dur={phase_seconds["db"] * 1000:.1f};desc="{timings["queries"]} queries"']
+        entries += [f'{phase};dur={phase_seconds[phase] * 1000:.1f}' for phase in PHASES[1:]]
+        entries.append(f'total;dur={elapsed * 1000:.1f}')
+        response.headers.add('Server-Timing', ', '.join(entries))
+    return response
+
+def init_app(app):
+    """
+    Time SQL queries, template rendering and JSON serialization per request
+
+    Totals are kept per endpoint for /metrics and sent to the browser in a
+    Server-Timing header when SERVER_TIMING is enabled. Streamed bodies
+    (exports) are timed up to the point the response is returned.
+    """
+    if not app.config['REQUEST_METRICS_ENABLED']:
+        return
+
+    # Class-level listeners cover every engine; registering twice is a no-op
+    if not event.contains(Engine, 'before_cursor_execute', _before_cursor_execute):
+        event.listen(Engine, 'before_cursor_execute', _before_cursor_execute)
+        event.listen(Engine, 'after_cursor_execute', _after_cursor_execute)
+
+    before_render_template.connect(_before_render, app)
+    template_rendered.connect(_after_render, app)
+    app.json = TimedJSONProvider(app)
+
+    app.before_request(_start_request)
+    app.after_request(_finish_request)
+
+def _labels(**labels):
+    return '{' + ','.join(f'{name}="{value}"' for name, value in labels.items()) + '}'
+
+def _histogram_lines(name, endpoint, snapshot):
+    lines = [f'{name}_bucket{_labels(endpoint=endpoint, le=bound)} {count}' for bound, count in snapshot['buckets']]
+    lines.append(f'{name}_bucket{_labels(endpoint=endpoint, le="+Inf")} {snapshot["count"]}')
+    lines.append(f'{name}_sum{_labels(endpoint=endpoint)} {snapshot["sum"]}')
+    lines.append(f'{name}_count{_labels(endpoint=endpoint)} {snapshot["count"]}')
+    return lines
+
+def prometheus_text(pool):
+    """
+    Request and connection pool metrics of this process in Prometheus text format
+
+    Args:
+        pool: Result of utils.pool_metrics.pool_status
+
+    Returns:
+        Exposition text; each worker process reports its own counters, and
+        app_process_info carries its pid
+    """
+    snapshot = request_metrics.snapshot()
+    pid = os.getpid()
+    lines = []
+
+    def family(name, kind, description):
+        lines.append(f'# HELP {name} {description}')
+        lines.append(f'# TYPE {name} {kind}')
+
+    family('app_request_duration_seconds', 'histogram', 'Request latency by endpoint')
+    for endpoint, stats in snapshot.items():
+        lines += _histogram_lines('app_request_duration_seconds', endpoint, stats['latency'])
+
+    family('app_request_queries', 'histogram', 'SQL statements executed per request by endpoint')
+    for endpoint, stats in snapshot.items():
+        lines += _histogram_lines('app_request_queries', endpoint, stats['queries'])
+
+    for phase, description in (('db', 'executing SQL'), ('render', 'rendering templates'),
+                               ('serialize', 'serializing JSON responses')):
+        name = f'app_request_{phase}_seconds_total'
+        family(name, 'counter', f'Seconds spent {description} by endpoint')
+        for endpoint, stats in snapshot.items():
+            lines.append(f'{name}{_labels(endpoint=endpoint)} {stats["phase_seconds"][phase]}')
+
+    family('app_process_info', 'gauge', 'Worker process reporting these metrics')
+    lines.append(f'app_process_info{_labels(pid=pid)} 1')
+
+    family('app_log_records_dropped_total', 'counter', 'Log records dropped because the log queue was full')
+    lines.append(f'app_log_records_dropped_total {dropped_records()}')
+
+    for key, description in (('size', 'Configured pool size'), ('checked_out', 'Connections in use'),
+                             ('checked_in', 'Idle connections'), ('overflow', 'Connections above pool size')):
+        if key in pool:
+            family(f'app_db_pool_{key}', 'gauge', description)
+            lines.append(f'app_db_pool_{key} {pool[key]}')
+
+    family('app_db_pool_timeouts_total', 'counter', 'Checkouts that timed out waiting for a connection')
+    lines.append(f'app_db_pool_timeouts_total {pool["timeouts"]}')
+
+    family('app_db_pool_wait_seconds', 'histogram', 'Time spent waiting for a pooled connection')
+    for bound, count in pool['wait_buckets'].items():
+        lines.append(f'app_db_pool_wait_seconds_bucket{_labels(le=bound)} {count}')
+    lines.append(f'app_db_pool_wait_seconds_sum {pool["wait_seconds_total"]}')
+    lines.append(f'app_db_pool_wait_seconds_count {pool["wait_buckets"]["+Inf"]}')
+
+    return '\n'.join(lines) + '\n'
@@ -0,0 +1,175 @@
+from collections import Counter
+
+from sqlalchemy import case, func, select
+from sqlalchemy.exc import IntegrityError
+
+from extensions import db
+from models import Report, DailyReportSummary
+
+SUMMARY_COLUMNS = [
+    'report_count', 'paid', 'not_paid', 'refunds', 'total_attended',
+    'verified_count', 'verified_total_attended', 'iics_total', 'gia_total',
+    'iics_difference', 'gia_difference'
+]
+
+def summary_key(report):
+    """Summary row key (date, flight_name, supervisor, zone) for a report"""
+    return (report.date, report.flight_name, report.supervisor, report.zone)
+
+def report_contribution(report):
+    """
+    Summary column values contributed by a single report
+
+    Args:
+        report: Report object (or any object with the same attributes)
+
+    Returns:
+        Counter of summary column deltas
+    """
+    total_attended = report.total_attended or 0
+    contribution = Counter({
+        'report_count': 1,
+        'paid': report.paid or 0,
+        'not_paid': report.not_paid or 0,
+        'refunds': report.refunds or 0,
+        'total_attended': total_attended,
+    })
+
+    if report.verified:
+        contribution.update({
+            'verified_count': 1,
+            'verified_total_attended': total_attended,
+            'iics_total': report.iics_total or 0,
+            'gia_total': report.gia_total or 0,
+            'iics_difference': (report.iics_total or 0) - total_attended,
+            'gia_difference': (report.gia_total or 0) - total_attended,
+        })
+
+    return contribution
+
+def snapshot(report):
+    """Capture a report's summary key and contribution before it is modified"""
+    return summary_key(report), report_contribution(report)
+
+def _get_or_create_row(key):
+    date, flight_name, supervisor, zone = key
+    filters = dict(date=date, flight_name=flight_name, supervisor=supervisor, zone=zone)
+
+    row = DailyReportSummary.query.filter_by(**filters).first()
+    if row:
+        return row
+
+    # Another request may create the same row concurrently; the savepoint keeps
+    # the caller's transaction usable if our insert loses that race
+    try:
+        with db.session.begin_nested():
+            row = DailyReportSummary(**filters, **{column: 0 for column in SUMMARY_COLUMNS})
+            db.session.add(row)
+    except IntegrityError:
+        row = DailyReportSummary.query.filter_by(**filters).one()
+    return row
+
+def apply_deltas(deltas_by_key):
+    """
+    Add column deltas to summary rows in the current transaction
+
+    Increments are issued as "column = column + delta" so concurrent
+    transactions touching the same row do not overwrite each other. Every
+    key passed in has its revision bumped, even when no total changed.
+
+    Args:
+        deltas_by_key: Mapping of summary key to Counter of column deltas
+    """
+    for key, deltas in deltas_by_key.items():
+        row = _get_or_create_row(key)
+        row.revision = DailyReportSummary.revision + 1
+        for column, delta in deltas.items():
+            if delta:
+                setattr(row, column, getattr(DailyReportSummary, column) + delta)
+
+def record_new_reports(reports):
+    """Add newly submitted reports to the summary"""
+    deltas_by_key = {}
+    for report in reports:
+        deltas_by_key.setdefault(summary_key(report), Counter()).update(report_contribution(report))
+    apply_deltas(deltas_by_key)
+
+def record_report_change(before, report):
+    """
+    Move a modified report's contribution in the summary
+
+    Args:
+        before: Result of snapshot() taken before the report was modified
+        report: The modified Report object
+    """
+    old_key, old_contribution = before
+    deltas_by_key = {old_key: Counter()}
+    deltas_by_key[old_key].subtract(old_contribution)
+    deltas_by_key.setdefault(summary_key(report), Counter()).update(report_contribution(report))
+    apply_deltas(deltas_by_key)
+
+def rebuild_summary():
+    """
+    Regenerate the summary table from the reports table
+
+    Revisions restart at zero; updated_at moves forward, so export data
+    versions still change.
+
+    Returns:
+        Number of summary rows written
+    """
+    def verified_only(column):
+        return func.coalesce(func.sum(case((Report.verified == True, column), else_=0)), 0)
+
+    total_attended = func.coalesce(Report.total_attended, 0)
+
+    aggregate = select(
+        Report.date,
+        Report.flight_name,
+        Report.supervisor,
+        Report.zone,
+        func.count(Report.id),
+        func.coalesce(func.sum(Report.paid), 0),
+        func.coalesce(func.sum(Report.not_paid), 0),
+        func.coalesce(func.sum(Report.refunds), 0),
+        func.coalesce(func.sum(Report.total_attended), 0),
+        verified_only(1),
+        verified_only(total_attended),
+        verified_only(func.coalesce(Report.iics_total, 0)),
+        verified_only(func.coalesce(Report.gia_total, 0)),
+        verified_only(func.coalesce(Report.iics_total, 0) - total_attended),
+        verified_only(func.coalesce(Report.gia_total, 0) - total_attended),
+        func.now(),
+    ).group_by(Report.date, Report.flight_name, Report.supervisor, Report.zone)
+
+    db.session.execute(DailyReportSummary.__table__.delete())
+    db.session.execute(
+        DailyReportSummary.__table__.insert().from_select(
+            ['date', 'flight_name', 'supervisor', 'zone'] + SUMMARY_COLUMNS + ['updated_at'],
+            aggregate
+        )
+    )
+    db.session.commit()
+
+    return DailyReportSummary.query.count()
+
+def verified_totals():
+    """
+    Dashboard totals over verified reports, read from the summary table
+
+    Returns:
+        Dict with report_count, total_attended and flight_count
+    """
+    report_count, total_attended, flight_count = db.session.query(
+        func.coalesce(func.sum(DailyReportSummary.verified_count), 0),
+        func.coalesce(func.sum(DailyReportSummary.verified_total_attended), 0),
+        func.count(func.distinct(case(
+            (DailyReportSummary.verified_count > 0, DailyReportSummary.flight_name)
+        ))),
+    ).one()
+
+    return {
+        'report_count': report_count,
+        'total_attended': total_attended,
+        'flight_count': flight_count,
+    }
@@ -0,0 +1,46 @@
+from flask import current_app
+
+from extensions import db
+from models import User
+from utils.cache import TTLCache
+
+def init_app(app):
+    """Attach the per-process user cache to the app"""
+    app.extensions['user_cache'] = TTLCache(app.config['USER_CACHE_SIZE'], app.config['USER_CACHE_TTL'])
+
+def load_user(user_id):
+    """
+    Flask-Login user_loader backed by the per-process user cache
+
+    Users are cached detached from the session, so cache hits cost no
+    query. Admin changes call invalidate() in the worker that handled them;
+    other workers see them once the entry is older than USER_CACHE_TTL
+    seconds, which bounds how long a deactivated user stays logged in.
+
+    The cached instance is shared by every thread and never handed out.
+    Each request gets its own copy merged into its session without a
+    query, so lazy relationships such as current_user.reports load
+    normally.
+
+    Returns:
+        The active User, or None to log the session out
+    """
+    cache = current_app.extensions['user_cache']
+    user_id = int(user_id)
+
+    user = cache.get(user_id)
+    if user is None:
+        user = db.session.get(User, user_id)
+        if user is None:
+            return None
+        # Detach so the loaded columns stay readable after the session ends
+        db.session.expunge(user)
+        cache.set(user_id, user)
+
+    if not user.active:
+        return None
+    return db.session.merge(user, load=False)
+
+def invalidate(user_id):
+    """Drop a cached user; call after committing a change to that user"""
+    current_app.extensions['user_cache'].pop(user_id)